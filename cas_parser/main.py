@@ -6,7 +6,6 @@ process from PDF extraction through validation and JSON export.
 """
 
 import argparse
-import json
 import logging
 import re
 import sys
@@ -19,6 +18,7 @@ from cas_parser.extractor import PDFExtractor, extract_text_from_pdf
 from cas_parser.holdings_parser import parse_holdings
 from cas_parser.models import CASStatement, Investor, ValidationResult
 from cas_parser.section_detector import (
+    SectionIndex,
     SectionState,
     detect_sections,
     get_all_sections_by_type,
@@ -115,13 +115,15 @@ class CASParser:
             # Fallback to section-based parsing
             logger.info("Falling back to section-based parsing")
 
+            section_index = SectionIndex.from_sections(sections)
+
             # Parse investor information
-            investor_section = get_section_by_type(sections, SectionState.INVESTOR_INFO)
+            investor_section = get_section_by_type(section_index, SectionState.INVESTOR_INFO)
             investor_lines = investor_section.lines if investor_section else all_lines[:50]
             investor = self._parse_investor(investor_lines)
 
             # Parse holdings
-            holdings_sections = get_all_sections_by_type(sections, SectionState.HOLDINGS_SUMMARY)
+            holdings_sections = get_all_sections_by_type(section_index, SectionState.HOLDINGS_SUMMARY)
             holdings = []
             for section in holdings_sections:
                 section_holdings = parse_holdings(section.lines, nav_date=statement_date)
@@ -130,7 +132,7 @@ class CASParser:
 
             # Parse transactions
             transaction_sections = get_all_sections_by_type(
-                sections, SectionState.TRANSACTION_DETAILS
+                section_index, SectionState.TRANSACTION_DETAILS
             )
             transactions = []
             for section in transaction_sections:
@@ -300,8 +302,7 @@ def export_to_json(statement: CASStatement, output_path: Optional[str] = None) -
     Returns:
         JSON string representation.
     """
-    json_data = statement.to_dict()
-    json_str = json.dumps(json_data, indent=2, ensure_ascii=False)
+    json_str = statement.to_json_bytes(indent=True).decode("utf-8")
 
     if output_path:
         Path(output_path).write_text(json_str, encoding="utf-8")
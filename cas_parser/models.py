@@ -8,11 +8,32 @@ This module defines the core data structures using dataclasses for:
 - Validation results
 """
 
+import json
+import sys
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, List
+from typing import Any, Optional, List
+
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
+# Slotted dataclasses drop the per-instance __dict__ of the high-volume
+# record types. dataclass(slots=True) needs Python 3.10, so older
+# interpreters keep regular instances.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_default(value: Any) -> Any:
+    """Encode the non-JSON types that can appear in statement dicts."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class TransactionType(Enum):
@@ -66,12 +87,12 @@ class Investor:
     def __post_init__(self):
         """Normalize and validate investor data."""
         self.name = self.name.strip() if self.name else ""
-        self.pan = self.pan.strip().upper() if self.pan else ""
+        self.pan = sys.intern(self.pan.strip().upper()) if self.pan else ""
         if self.email:
             self.email = self.email.strip().lower()
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Holding:
     """
     Represents a mutual fund holding from the CAS statement.
@@ -102,8 +123,10 @@ class Holding:
     def __post_init__(self):
         """Normalize holding data."""
         self.scheme_name = " ".join(self.scheme_name.split()) if self.scheme_name else ""
-        self.isin = self.isin.strip().upper() if self.isin else ""
-        self.folio = self.folio.strip() if self.folio else ""
+        # Folio and ISIN repeat across a statement; intern them so equal
+        # values share one string object.
+        self.isin = sys.intern(self.isin.strip().upper()) if self.isin else ""
+        self.folio = sys.intern(self.folio.strip()) if self.folio else ""
 
         # Ensure Decimal types
         if not isinstance(self.units, Decimal):
@@ -114,7 +137,7 @@ class Holding:
             self.current_value = Decimal(str(self.current_value))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Transaction:
     """
     Represents a single transaction in the CAS statement.
@@ -145,9 +168,11 @@ class Transaction:
     def __post_init__(self):
         """Normalize transaction data."""
         self.description = " ".join(self.description.split()) if self.description else ""
-        self.folio = self.folio.strip() if self.folio else ""
-        self.scheme_name = " ".join(self.scheme_name.split()) if self.scheme_name else ""
-        self.isin = self.isin.strip().upper() if self.isin else ""
+        self.folio = sys.intern(self.folio.strip()) if self.folio else ""
+        self.scheme_name = (
+            sys.intern(" ".join(self.scheme_name.split())) if self.scheme_name else ""
+        )
+        self.isin = sys.intern(self.isin.strip().upper()) if self.isin else ""
 
         # Ensure Decimal types
         if not isinstance(self.units, Decimal):
@@ -283,3 +308,28 @@ class CASStatement:
             "source_file": self.source_file,
             "quarantine": self.quarantine_items,
         }
+
+    def to_json_bytes(self, indent: bool = False) -> bytes:
+        """
+        Serialize the CAS statement to UTF-8 encoded JSON.
+
+        Uses orjson when it is installed and falls back to the standard
+        library otherwise; both produce equivalent JSON, though whitespace
+        may differ.
+
+        Args:
+            indent: Pretty-print with two-space indentation.
+
+        Returns:
+            JSON document as bytes.
+        """
+        data = self.to_dict()
+        if orjson is not None:
+            option = orjson.OPT_INDENT_2 if indent else 0
+            return orjson.dumps(data, default=_json_default, option=option)
+        return json.dumps(
+            data,
+            indent=2 if indent else None,
+            ensure_ascii=False,
+            default=_json_default,
+        ).encode("utf-8")
@@ -8,12 +8,21 @@ This module defines the core data structures for:
 - Validation results
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from enum import Enum
 from typing import Optional, List
 
+# Scheme and transaction rows are the bulk of a statement; give them
+# __slots__ where dataclasses support it (Python 3.10+).
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Characters dropped from inside PRANs, which are printed in spaced digit
+# groups; leading/trailing whitespace of any kind is stripped first
+_PRAN_WHITESPACE = str.maketrans("", "", " \t\r\n")
+
 
 class ContributionType(Enum):
     """
@@ -61,15 +70,17 @@ class NPSSubscriber:
 
     def __post_init__(self):
         """Normalize and validate subscriber data."""
-        self.pran = self.pran.strip().replace(" ", "") if self.pran else ""
+        self.pran = (
+            sys.intern(self.pran.strip().translate(_PRAN_WHITESPACE)) if self.pran else ""
+        )
         self.name = self.name.strip() if self.name else ""
         if self.pan:
-            self.pan = self.pan.strip().upper()
+            self.pan = sys.intern(self.pan.strip().upper())
         if self.email:
             self.email = self.email.strip().lower()
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NPSScheme:
     """
     Represents an NPS scheme/fund holding.
@@ -108,7 +119,7 @@ class NPSScheme:
             self.current_value = Decimal(str(self.current_value))
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class NPSTransaction:
     """
     Represents a single NPS transaction/contribution.
@@ -16,8 +16,9 @@ import re
 from dataclasses import dataclass
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 from extractor import PDFExtractor, ExtractedDocument
 from nps_models import (
@@ -28,13 +29,110 @@ from nps_models import (
 logger = logging.getLogger(__name__)
 
 
+# Classification patterns, compiled once at import and tried in order.
+# All of them run against upper-cased text.
+_SCHEME_PATTERNS = [
+    (re.compile(r'\bE\b.*(?:TIER|EQUITY)|SCHEME[\s\-]*E\b'), NPSSchemeType.SCHEME_E),
+    (re.compile(r'\bC\b.*(?:TIER|CORP)|SCHEME[\s\-]*C\b'), NPSSchemeType.SCHEME_C),
+    (re.compile(r'\bG\b.*(?:TIER|GOV)|SCHEME[\s\-]*G\b'), NPSSchemeType.SCHEME_G),
+    (re.compile(r'\bA\b.*(?:TIER|ALT)|SCHEME[\s\-]*A\b'), NPSSchemeType.SCHEME_A),
+]
+_PFM_PATTERNS = [
+    (re.compile(r'\bSBI\b'), 'SBI'),
+    (re.compile(r'\bLIC\b'), 'LIC'),
+    (re.compile(r'\bHDFC\b'), 'HDFC'),
+    (re.compile(r'\bICICI\b'), 'ICICI'),
+    (re.compile(r'\bUTI\b'), 'UTI'),
+    (re.compile(r'\bKOTAK\b'), 'Kotak'),
+    (re.compile(r'\bADITYA\s*BIRLA\b|\bABSL\b'), 'Aditya Birla'),
+    (re.compile(r'\bTATA\b'), 'Tata'),
+    (re.compile(r'\bNPS\s*TRUST\b'), 'NPS Trust'),
+]
+
+# Transaction rows: leading DD-Mon-YY(YY) date, then amounts where
+# parenthesised values are negative, e.g. (0.5571) 48.7856 (27.18)
+_TX_DATE_RE = re.compile(r'^(\d{1,2}-[A-Za-z]{3}-\d{2,4})')
+_TX_AMOUNT_RE = re.compile(r'\((\d[\d,]*\.?\d*)\)|(\d[\d,]*\.?\d+)')
+
+# Date shapes handled without strptime: D-M-Y (numeric or named month) and ISO
+_NUMERIC_DATE_RE = re.compile(r'([0-9]{1,2})([-/.])([0-9]{1,2})\2([0-9]{4}|[0-9]{2})')
+_TEXT_DATE_RE = re.compile(r'([0-9]{1,2})([- ])([A-Za-z]{3,9})\2([0-9]{4}|[0-9]{2})')
+_ISO_DATE_RE = re.compile(r'([0-9]{4})-([0-9]{1,2})-([0-9]{1,2})')
+_MONTH_ABBR = {
+    name: i for i, name in enumerate(
+        ['jan', 'feb', 'mar', 'apr', 'may', 'jun',
+         'jul', 'aug', 'sep', 'oct', 'nov', 'dec'], start=1)
+}
+_MONTH_FULL = {
+    name: i for i, name in enumerate(
+        ['january', 'february', 'march', 'april', 'may', 'june', 'july',
+         'august', 'september', 'october', 'november', 'december'], start=1)
+}
+
+
+def _expand_year(year: str) -> int:
+    """Expand a year the way strptime does: %y maps 69-99 to 19xx, else 20xx."""
+    value = int(year)
+    if len(year) == 2:
+        value += 1900 if value >= 69 else 2000
+    return value
+
+
+def _parse_date_fast(date_str: str) -> Optional[date]:
+    """
+    Parse the common date shapes with one regex match and a table lookup.
+
+    Returns the same date the first matching strptime format in parse_date
+    would, or None when the string needs the full format cascade.
+    """
+    match = _NUMERIC_DATE_RE.fullmatch(date_str)
+    if match:
+        day, sep, month, year = match.groups()
+        # Only D-M-Y and D/M/Y have 2-digit year formats
+        if len(year) == 2 and sep == '.':
+            return None
+        try:
+            return date(_expand_year(year), int(month), int(day))
+        except ValueError:
+            return None  # may still be M-D-Y
+
+    match = _TEXT_DATE_RE.fullmatch(date_str)
+    if match:
+        day, _, month_name, year = match.groups()
+        month_name = month_name.lower()
+        month = _MONTH_ABBR.get(month_name)
+        if month is None and len(year) == 4:
+            month = _MONTH_FULL.get(month_name)
+        if month is None:
+            return None
+        try:
+            return date(_expand_year(year), month, int(day))
+        except ValueError:
+            return None
+
+    match = _ISO_DATE_RE.fullmatch(date_str)
+    if match:
+        year, month, day = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+
+    return None
+
+
+@lru_cache(maxsize=4096)
 def parse_date(date_str: str) -> Optional[date]:
-    """Parse a date string in various formats."""
+    """Parse a date string in various formats (memoized; dates repeat across rows)."""
     if not date_str:
         return None
 
     date_str = date_str.strip()
 
+    parsed = _parse_date_fast(date_str)
+    if parsed is not None:
+        return parsed
+
     # Try different formats (including 2-digit year formats)
     formats = [
         '%d-%m-%Y', '%d/%m/%Y', '%d-%b-%Y', '%d %b %Y',
@@ -54,18 +152,24 @@ def parse_date(date_str: str) -> Optional[date]:
     return None
 
 
+# Single-character cleanup applied by parse_decimal
+_DECIMAL_NOISE = str.maketrans({',': None, '₹': None, ' ': None, '(': '-', ')': None})
+
+
+@lru_cache(maxsize=4096)
 def parse_decimal(value_str: str) -> Optional[Decimal]:
-    """Parse a string to Decimal, handling Indian number format."""
+    """Parse a string to Decimal, handling Indian number format (memoized)."""
     if not value_str:
         return None
 
     try:
-        # Remove commas and currency symbols
-        cleaned = value_str.replace(',', '').replace('Rs.', '').replace('Rs', '')
-        cleaned = cleaned.replace('INR', '').replace('₹', '').strip()
-        cleaned = cleaned.replace('(', '-').replace(')', '')  # Handle negative in parens
-        # Remove any spaces
-        cleaned = cleaned.replace(' ', '')
+        cleaned = value_str
+        # Remove currency prefixes; commas go first, as "R,s" must still match
+        if 'R' in cleaned or 'I' in cleaned:
+            cleaned = cleaned.replace(',', '').replace('Rs.', '').replace('Rs', '')
+            cleaned = cleaned.replace('INR', '')
+        # Drop commas, rupee signs and spaces, and turn (x) into -x, in one pass
+        cleaned = cleaned.translate(_DECIMAL_NOISE).strip()
         if cleaned:
             return Decimal(cleaned)
         return None
@@ -74,19 +178,15 @@ def parse_decimal(value_str: str) -> Optional[Decimal]:
         return None
 
 
+@lru_cache(maxsize=512)
 def detect_scheme_type(text: str) -> NPSSchemeType:
-    """Detect NPS scheme type from text."""
+    """Detect NPS scheme type from text (memoized; rows repeat the same strings)."""
     text_upper = text.upper()
 
     # Check for scheme type indicators
-    if re.search(r'\bE\b.*(?:TIER|EQUITY)', text_upper) or re.search(r'SCHEME[\s\-]*E\b', text_upper):
-        return NPSSchemeType.SCHEME_E
-    if re.search(r'\bC\b.*(?:TIER|CORP)', text_upper) or re.search(r'SCHEME[\s\-]*C\b', text_upper):
-        return NPSSchemeType.SCHEME_C
-    if re.search(r'\bG\b.*(?:TIER|GOV)', text_upper) or re.search(r'SCHEME[\s\-]*G\b', text_upper):
-        return NPSSchemeType.SCHEME_G
-    if re.search(r'\bA\b.*(?:TIER|ALT)', text_upper) or re.search(r'SCHEME[\s\-]*A\b', text_upper):
-        return NPSSchemeType.SCHEME_A
+    for pattern, scheme_type in _SCHEME_PATTERNS:
+        if pattern.search(text_upper):
+            return scheme_type
 
     # Fallback to keyword matching
     if 'EQUITY' in text_upper:
@@ -101,6 +201,7 @@ def detect_scheme_type(text: str) -> NPSSchemeType:
     return NPSSchemeType.UNKNOWN
 
 
+@lru_cache(maxsize=512)
 def detect_contribution_type(text: str) -> ContributionType:
     """Detect contribution type from text."""
     text_upper = text.upper()
@@ -117,23 +218,12 @@ def detect_contribution_type(text: str) -> ContributionType:
     return ContributionType.UNKNOWN
 
 
+@lru_cache(maxsize=512)
 def detect_pfm(text: str) -> str:
     """Detect Pension Fund Manager from text."""
-    pfm_patterns = [
-        (r'\bSBI\b', 'SBI'),
-        (r'\bLIC\b', 'LIC'),
-        (r'\bHDFC\b', 'HDFC'),
-        (r'\bICICI\b', 'ICICI'),
-        (r'\bUTI\b', 'UTI'),
-        (r'\bKOTAK\b', 'Kotak'),
-        (r'\bADITYA\s*BIRLA\b|\bABSL\b', 'Aditya Birla'),
-        (r'\bTATA\b', 'Tata'),
-        (r'\bNPS\s*TRUST\b', 'NPS Trust'),
-    ]
-
     text_upper = text.upper()
-    for pattern, pfm in pfm_patterns:
-        if re.search(pattern, text_upper):
+    for pattern, pfm in _PFM_PATTERNS:
+        if pattern.search(text_upper):
             return pfm
 
     return ""
@@ -143,9 +233,14 @@ def generate_nps_tx_hash(pran: str, tx_date: str, scheme_type: str,
                           amount: float, units: float) -> str:
     """
     Generate a deterministic hash for NPS transaction deduplication.
+
+    Uses a 128-bit BLAKE2b digest, which is faster than MD5 and keeps the
+    32-character hex length. Hashes persisted by the web app come from
+    ``webapp.db.nps.generate_nps_tx_hash``, which stays on MD5 so existing
+    rows still deduplicate.
     """
     data = f"{pran}|{tx_date}|{scheme_type}|{amount:.2f}|{units:.4f}"
-    return hashlib.md5(data.encode()).hexdigest()
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
 
 
 class NPSParser:
@@ -161,6 +256,11 @@ class NPSParser:
     def __init__(self, password: Optional[str] = None):
         self.password = password
         self.extractor = PDFExtractor(password=password)
+        # Per-document classification caches. The scheme table and the
+        # transaction pass look at the same lines, and a statement can have
+        # more distinct lines than the module-level LRU caches hold.
+        self._scheme_cache: Dict[str, NPSSchemeType] = {}
+        self._pfm_cache: Dict[str, str] = {}
 
     def parse(self, pdf_path: Union[str, Path]) -> NPSStatement:
         """Parse an NPS statement PDF."""
@@ -185,11 +285,28 @@ class NPSParser:
         full_text = document.get_all_text()
         return self._parse_lines(all_lines, full_text)
 
+    def _scheme_type(self, text: str) -> NPSSchemeType:
+        """Cached detect_scheme_type for the document being parsed."""
+        scheme_type = self._scheme_cache.get(text)
+        if scheme_type is None:
+            scheme_type = self._scheme_cache[text] = detect_scheme_type(text)
+        return scheme_type
+
+    def _pfm(self, text: str) -> str:
+        """Cached detect_pfm for the document being parsed."""
+        pfm = self._pfm_cache.get(text)
+        if pfm is None:
+            pfm = self._pfm_cache[text] = detect_pfm(text)
+        return pfm
+
     def _parse_lines(self, lines: List[str], full_text: str = None) -> NPSStatement:
         """Parse NPS statement from lines of text."""
         if full_text is None:
             full_text = "\n".join(lines)
 
+        self._scheme_cache.clear()
+        self._pfm_cache.clear()
+
         # Extract subscriber info
         subscriber = self._extract_subscriber(lines, full_text)
 
@@ -411,7 +528,7 @@ class NPSParser:
         # Look for lines with PFM name followed by 3 numbers (units, nav, value)
         for i, line in enumerate(lines):
             # Check if line contains a PFM name and numbers
-            pfm = detect_pfm(line)
+            pfm = self._pfm(line)
             if not pfm:
                 continue
 
@@ -429,7 +546,7 @@ class NPSParser:
                         # Look for scheme type in next few lines
                         scheme_type = NPSSchemeType.UNKNOWN
                         for j in range(i + 1, min(i + 4, len(lines))):
-                            detected = detect_scheme_type(lines[j])
+                            detected = self._scheme_type(lines[j])
                             if detected != NPSSchemeType.UNKNOWN:
                                 scheme_type = detected
                                 break
@@ -530,9 +647,6 @@ class NPSParser:
         """
         transactions = []
 
-        # Date pattern: DD-Mon-YY or DD-Mon-YYYY
-        date_pattern = re.compile(r'^(\d{1,2}-[A-Za-z]{3}-\d{2,4})')
-
         current_section = None
         current_tx_type = ""
 
@@ -553,7 +667,7 @@ class NPSParser:
                 continue
 
             # Check for transaction row (starts with date like 01-Apr-25)
-            date_match = date_pattern.match(line_stripped)
+            date_match = _TX_DATE_RE.match(line_stripped)
             if date_match:
                 tx_date = parse_date(date_match.group(1))
                 if not tx_date:
@@ -587,10 +701,10 @@ class NPSParser:
                     contrib_type = ContributionType.EMPLOYER
 
                 # Detect scheme type
-                scheme_type = detect_scheme_type(line)
+                scheme_type = self._scheme_type(line)
 
                 # Detect PFM
-                pfm = detect_pfm(line) or ""
+                pfm = self._pfm(line) or ""
 
                 # Extract all numbers (including negative in parentheses)
                 # Handle format: (0.5571) 48.7856 (27.18)
@@ -598,7 +712,7 @@ class NPSParser:
 
                 # Parse numbers, handling negatives in parentheses
                 amounts = []
-                for match in re.finditer(r'\((\d[\d,]*\.?\d*)\)|(\d[\d,]*\.?\d+)', remaining):
+                for match in _TX_AMOUNT_RE.finditer(remaining):
                     if match.group(1):  # Negative (in parentheses)
                         val = parse_decimal(match.group(1))
                         if val:
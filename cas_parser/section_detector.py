@@ -7,12 +7,19 @@ of a CDSL CAS PDF using semantic markers rather than fixed positions.
 
 import logging
 import re
+import sys
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) is only available on Python 3.10+.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class SectionState(Enum):
     """
@@ -28,7 +35,49 @@ class SectionState(Enum):
     END = auto()
 
 
-@dataclass
+class LineView(SequenceABC):
+    """
+    Read-only view over a slice of the document lines.
+
+    Sections hold one of these instead of copying their lines out of the
+    document list. Slicing a view returns a plain list.
+    """
+
+    __slots__ = ("_lines", "_start", "_end")
+
+    def __init__(self, lines: Sequence[str], start: int, end: int):
+        self._lines = lines
+        self._start = start
+        self._end = end
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            return [self._lines[self._start + i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("LineView index out of range")
+        return self._lines[self._start + index]
+
+    def __iter__(self) -> Iterator[str]:
+        lines = self._lines
+        for i in range(self._start, self._end):
+            yield lines[i]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LineView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"LineView({list(self)!r})"
+
+
+@dataclass(**_SLOTS)
 class Section:
     """
     Represents a detected section in the CAS document.
@@ -37,12 +86,40 @@ class Section:
         section_type: Type of section (from SectionState)
         start_line: Index of the first line of this section
         end_line: Index of the last line of this section (exclusive)
-        lines: Actual text lines in this section
+        lines: Actual text lines in this section (a LineView when detected)
     """
     section_type: SectionState
     start_line: int
     end_line: int
-    lines: List[str] = field(default_factory=list)
+    lines: Sequence[str] = field(default_factory=list)
+
+
+@dataclass
+class SectionIndex:
+    """
+    Lookup of detected sections grouped by type.
+
+    Callers that query the same section list several times can build this
+    once instead of rescanning the list on every lookup.
+
+    Attributes:
+        by_type: Sections of each type, in document order
+    """
+    by_type: Dict[SectionState, List[Section]] = field(default_factory=dict)
+
+    @classmethod
+    def from_sections(cls, sections: List[Section]) -> "SectionIndex":
+        """Build an index from a list of detected sections."""
+        return cls(by_type=group_sections_by_type(sections))
+
+    def first(self, section_type: SectionState) -> Optional[Section]:
+        """Get the first section of a specific type, or None."""
+        matches = self.by_type.get(section_type)
+        return matches[0] if matches else None
+
+    def all(self, section_type: SectionState) -> List[Section]:
+        """Get all sections of a specific type."""
+        return list(self.by_type.get(section_type, []))
 
 
 class SectionPatterns:
@@ -106,6 +183,75 @@ class SectionPatterns:
         r"(?i)^\s*page\s*\d+\s*of\s*\d+\s*$",
     ]
 
+    # Compiled marker patterns, built once at import
+    INVESTOR_MARKERS_RE = tuple(re.compile(p) for p in INVESTOR_MARKERS)
+    HOLDINGS_MARKERS_RE = tuple(re.compile(p) for p in HOLDINGS_MARKERS)
+    TRANSACTION_MARKERS_RE = tuple(re.compile(p) for p in TRANSACTION_MARKERS)
+    END_MARKERS_RE = tuple(re.compile(p) for p in END_MARKERS)
+
+
+def _compile_document_alternation(patterns: List[str]) -> re.Pattern:
+    """
+    Fuse case-insensitive marker patterns for scanning a lowercased document.
+
+    The whole document is lowercased once, so the patterns are lowercased
+    and their (?i) flag dropped. ``\\s`` is kept from crossing line breaks
+    and ^/$ anchor at line boundaries, so every match stays within one line
+    exactly as it would in a per-line search.
+    """
+    branches = []
+    for pattern in patterns:
+        if not pattern.startswith("(?i)"):
+            raise ValueError(f"Marker pattern must be case-insensitive: {pattern!r}")
+        body = pattern[4:].lower().replace(r"\s", r"[^\S\n]")
+        branches.append(f"(?:{body})")
+    return re.compile("|".join(branches), re.MULTILINE)
+
+
+# Patterns are compiled once at import and shared by every SectionDetector,
+# since detect_sections() creates a fresh detector per call.
+_INVESTOR_RE = SectionPatterns.INVESTOR_MARKERS_RE
+_HOLDINGS_RE = SectionPatterns.HOLDINGS_MARKERS_RE
+_TRANSACTION_RE = SectionPatterns.TRANSACTION_MARKERS_RE
+_END_RE = SectionPatterns.END_MARKERS_RE
+_PAN_RE = re.compile(SectionPatterns.PAN_PATTERN)
+_ISIN_RE = re.compile(SectionPatterns.ISIN_PATTERN)
+_DATE_RE = re.compile(SectionPatterns.DATE_PATTERN)
+_FOLIO_RE = re.compile(SectionPatterns.FOLIO_PATTERN)
+_NAV_RE = re.compile(SectionPatterns.NAV_PATTERN)
+# ISIN and NAV in one scan; lastgroup reports which of the two matched
+_ISIN_NAV_RE = re.compile(
+    rf"(?P<isin>{SectionPatterns.ISIN_PATTERN})"
+    rf"|(?P<nav>(?i:{SectionPatterns.NAV_PATTERN[4:]}))"
+)
+_DECIMAL_NUMBER_RE = re.compile(r"\d+\.\d{2,4}")
+# Explicit headers that open a new holdings section after transactions
+_NEW_HOLDINGS_HEADERS = [
+    r"(?i)summary\s*of\s*holdings",
+    r"(?i)mutual\s*fund\s*summary",
+]
+_NEWLINE_RE = re.compile("\n")
+
+# Line tag bits set by SectionDetector._classify_lines
+_TAG_END = 1
+_TAG_INVESTOR = 2
+_TAG_HOLDINGS = 4
+_TAG_TRANSACTION = 8
+_TAG_PAN = 16
+_TAG_ISIN = 32
+_TAG_NAV = 64
+_TAG_TXN_LIKE = 128
+_TAG_NEW_HOLDINGS = 256
+
+# Document-wide marker scans, paired with the line tag each one sets
+_DOCUMENT_MARKER_SCANS = [
+    (_compile_document_alternation(SectionPatterns.END_MARKERS), _TAG_END),
+    (_compile_document_alternation(SectionPatterns.INVESTOR_MARKERS), _TAG_INVESTOR),
+    (_compile_document_alternation(SectionPatterns.HOLDINGS_MARKERS), _TAG_HOLDINGS),
+    (_compile_document_alternation(SectionPatterns.TRANSACTION_MARKERS), _TAG_TRANSACTION),
+    (_compile_document_alternation(_NEW_HOLDINGS_HEADERS), _TAG_NEW_HOLDINGS),
+]
+
 
 class SectionDetector:
     """
@@ -119,19 +265,20 @@ class SectionDetector:
         """Initialize the section detector with default state."""
         self.current_state = SectionState.INITIAL
         self.patterns = SectionPatterns()
+        self.section_index = SectionIndex()
         self._compile_patterns()
 
     def _compile_patterns(self) -> None:
-        """Pre-compile regex patterns for efficiency."""
-        self.investor_re = [re.compile(p) for p in self.patterns.INVESTOR_MARKERS]
-        self.holdings_re = [re.compile(p) for p in self.patterns.HOLDINGS_MARKERS]
-        self.transaction_re = [re.compile(p) for p in self.patterns.TRANSACTION_MARKERS]
-        self.end_re = [re.compile(p) for p in self.patterns.END_MARKERS]
-        self.pan_re = re.compile(self.patterns.PAN_PATTERN)
-        self.isin_re = re.compile(self.patterns.ISIN_PATTERN)
-        self.date_re = re.compile(self.patterns.DATE_PATTERN)
-        self.folio_re = re.compile(self.patterns.FOLIO_PATTERN)
-        self.nav_re = re.compile(self.patterns.NAV_PATTERN)
+        """Bind the module-level compiled patterns shared by all detectors."""
+        self.investor_re = _INVESTOR_RE
+        self.holdings_re = _HOLDINGS_RE
+        self.transaction_re = _TRANSACTION_RE
+        self.end_re = _END_RE
+        self.pan_re = _PAN_RE
+        self.isin_re = _ISIN_RE
+        self.date_re = _DATE_RE
+        self.folio_re = _FOLIO_RE
+        self.nav_re = _NAV_RE
 
     def detect_sections(self, lines: List[str]) -> List[Section]:
         """
@@ -143,36 +290,55 @@ class SectionDetector:
         Returns:
             List of Section objects with detected boundaries.
         """
+        sections = list(self.iter_sections(lines))
+        self.section_index = SectionIndex.from_sections(sections)
+        logger.info("Detected %d sections", len(sections))
+        return sections
+
+    def iter_sections(self, lines: List[str]) -> Iterator[Section]:
+        """
+        Yield sections as their boundaries are found.
+
+        Each section's lines are a LineView over ``lines``, so no per-section
+        copies are made. Callers that only need the first section of a type
+        can stop iterating early.
+
+        Args:
+            lines: List of text lines from the PDF.
+
+        Yields:
+            Section objects in document order.
+        """
         self.current_state = SectionState.INITIAL
-        sections: List[Section] = []
         current_section_start: Optional[int] = None
         current_section_type: Optional[SectionState] = None
 
-        logger.info(f"Detecting sections in {len(lines)} lines")
+        logger.info("Detecting sections in %d lines", len(lines))
 
-        for i, line in enumerate(lines):
-            new_state = self._check_transition(line, i, lines)
+        tags = self._classify_lines(lines)
+
+        for i in range(len(lines)):
+            new_state = self._check_transition(tags, i)
 
             if new_state != self.current_state:
                 # Close previous section
                 if current_section_type is not None and current_section_start is not None:
-                    section = Section(
+                    logger.debug(
+                        "Closed %s section: lines %d-%d",
+                        current_section_type.name, current_section_start, i,
+                    )
+                    yield Section(
                         section_type=current_section_type,
                         start_line=current_section_start,
                         end_line=i,
-                        lines=lines[current_section_start:i],
-                    )
-                    sections.append(section)
-                    logger.debug(
-                        f"Closed {current_section_type.name} section: "
-                        f"lines {current_section_start}-{i}"
+                        lines=LineView(lines, current_section_start, i),
                     )
 
                 # Start new section
                 if new_state != SectionState.END:
                     current_section_start = i
                     current_section_type = new_state
-                    logger.debug(f"Started {new_state.name} section at line {i}")
+                    logger.debug("Started %s section at line %d", new_state.name, i)
                 else:
                     current_section_start = None
                     current_section_type = None
@@ -181,129 +347,113 @@ class SectionDetector:
 
         # Close final section
         if current_section_type is not None and current_section_start is not None:
-            section = Section(
+            logger.debug(
+                "Closed final %s section: lines %d-%d",
+                current_section_type.name, current_section_start, len(lines),
+            )
+            yield Section(
                 section_type=current_section_type,
                 start_line=current_section_start,
                 end_line=len(lines),
-                lines=lines[current_section_start:],
-            )
-            sections.append(section)
-            logger.debug(
-                f"Closed final {current_section_type.name} section: "
-                f"lines {current_section_start}-{len(lines)}"
+                lines=LineView(lines, current_section_start, len(lines)),
             )
 
-        logger.info(f"Detected {len(sections)} sections")
-        return sections
+    def _classify_lines(self, lines: List[str]) -> array:
+        """
+        Tag every line with the semantic markers it contains.
 
-    def _check_transition(
-        self, line: str, line_index: int, all_lines: List[str]
-    ) -> SectionState:
+        This is the only phase that runs regexes; the FSM then walks the
+        resulting tag stream using integer masks alone.
+
+        Args:
+            lines: List of text lines from the PDF.
+
+        Returns:
+            Array of ``_TAG_*`` bit sets, one per line.
+        """
+        tags = array("H", bytes(2 * len(lines)))
+        if not lines:
+            return tags
+
+        # Section markers are case-insensitive: lowercase the document once
+        # and map each match back to its line through the newline offsets.
+        lowered = "\n".join(lines).lower()
+        newlines = [m.start() for m in _NEWLINE_RE.finditer(lowered)]
+        for pattern, tag in _DOCUMENT_MARKER_SCANS:
+            for match in pattern.finditer(lowered):
+                tags[bisect_right(newlines, match.start())] |= tag
+
+        pan_search = self.pan_re.search
+        isin_nav_finditer = _ISIN_NAV_RE.finditer
+        looks_like_transaction = self._looks_like_transaction
+        for i, line in enumerate(lines):
+            tag = tags[i]
+            if pan_search(line):
+                tag |= _TAG_PAN
+            for match in isin_nav_finditer(line):
+                tag |= _TAG_ISIN if match.lastgroup == "isin" else _TAG_NAV
+            if looks_like_transaction(line):
+                tag |= _TAG_TXN_LIKE
+            tags[i] = tag
+        return tags
+
+    def _check_transition(self, tags: array, line_index: int) -> SectionState:
         """
         Check if the current line triggers a state transition.
 
         Args:
-            line: Current text line.
+            tags: Line tags produced by ``_classify_lines``.
             line_index: Index of the current line.
-            all_lines: All lines for lookahead context.
 
         Returns:
             New state if transition occurs, otherwise current state.
         """
+        tag = tags[line_index]
+        state = self.current_state
+
         # Check for end markers first
-        if self._matches_any(line, self.end_re):
+        if tag & _TAG_END:
             return SectionState.END
 
-        # State-specific transitions
-        if self.current_state == SectionState.INITIAL:
-            return self._transition_from_initial(line, line_index, all_lines)
-
-        elif self.current_state == SectionState.INVESTOR_INFO:
-            return self._transition_from_investor(line, line_index, all_lines)
-
-        elif self.current_state == SectionState.HOLDINGS_SUMMARY:
-            return self._transition_from_holdings(line, line_index, all_lines)
-
-        elif self.current_state == SectionState.TRANSACTION_DETAILS:
-            return self._transition_from_transactions(line, line_index, all_lines)
-
-        return self.current_state
-
-    def _transition_from_initial(
-        self, line: str, line_index: int, all_lines: List[str]
-    ) -> SectionState:
-        """Handle transitions from INITIAL state."""
-        # Look for investor info markers
-        if self._matches_any(line, self.investor_re):
-            return SectionState.INVESTOR_INFO
-
-        # PAN often appears early in investor section
-        if self.pan_re.search(line):
-            return SectionState.INVESTOR_INFO
-
-        # Check for direct holdings section (some formats skip explicit investor header)
-        if self._matches_any(line, self.holdings_re):
-            return SectionState.HOLDINGS_SUMMARY
-
-        return SectionState.INITIAL
-
-    def _transition_from_investor(
-        self, line: str, line_index: int, all_lines: List[str]
-    ) -> SectionState:
-        """Handle transitions from INVESTOR_INFO state."""
-        # Look for holdings section markers
-        if self._matches_any(line, self.holdings_re):
-            return SectionState.HOLDINGS_SUMMARY
-
-        # ISIN with NAV patterns indicate holdings
-        if self.isin_re.search(line) and self._has_nearby_nav(line_index, all_lines):
-            return SectionState.HOLDINGS_SUMMARY
-
-        # Transaction section markers
-        if self._matches_any(line, self.transaction_re):
-            return SectionState.TRANSACTION_DETAILS
-
-        return SectionState.INVESTOR_INFO
-
-    def _transition_from_holdings(
-        self, line: str, line_index: int, all_lines: List[str]
-    ) -> SectionState:
-        """Handle transitions from HOLDINGS_SUMMARY state."""
-        # Transaction section markers
-        if self._matches_any(line, self.transaction_re):
-            return SectionState.TRANSACTION_DETAILS
-
-        # Date pattern with transaction-like structure
-        if self.date_re.search(line) and self._looks_like_transaction(line):
-            return SectionState.TRANSACTION_DETAILS
-
-        return SectionState.HOLDINGS_SUMMARY
-
-    def _transition_from_transactions(
-        self, line: str, line_index: int, all_lines: List[str]
-    ) -> SectionState:
-        """Handle transitions from TRANSACTION_DETAILS state."""
-        # Transaction section usually goes until end
-        # Could transition back to holdings for multi-fund statements
-        if self._matches_any(line, self.holdings_re):
-            # Check if this is a new holdings section or continuation
-            if self._is_new_holdings_section(line_index, all_lines):
+        if state == SectionState.INITIAL:
+            # Investor info markers, or a PAN which often appears early in
+            # the investor section
+            if tag & (_TAG_INVESTOR | _TAG_PAN):
+                return SectionState.INVESTOR_INFO
+            # Direct holdings section (some formats skip explicit investor header)
+            if tag & _TAG_HOLDINGS:
                 return SectionState.HOLDINGS_SUMMARY
 
-        return SectionState.TRANSACTION_DETAILS
+        elif state == SectionState.INVESTOR_INFO:
+            if tag & _TAG_HOLDINGS:
+                return SectionState.HOLDINGS_SUMMARY
+            # ISIN with NAV patterns indicate holdings
+            if tag & _TAG_ISIN and self._has_nearby_nav(line_index, tags):
+                return SectionState.HOLDINGS_SUMMARY
+            if tag & _TAG_TRANSACTION:
+                return SectionState.TRANSACTION_DETAILS
+
+        elif state == SectionState.HOLDINGS_SUMMARY:
+            # Transaction markers, or a date with transaction-like structure
+            if tag & (_TAG_TRANSACTION | _TAG_TXN_LIKE):
+                return SectionState.TRANSACTION_DETAILS
+
+        elif state == SectionState.TRANSACTION_DETAILS:
+            # Transaction section usually goes until end, but multi-fund
+            # statements can start a genuinely new holdings section
+            if tag & _TAG_HOLDINGS and tag & _TAG_NEW_HOLDINGS:
+                return SectionState.HOLDINGS_SUMMARY
 
-    def _matches_any(self, line: str, patterns: List[re.Pattern]) -> bool:
-        """Check if line matches any of the given patterns."""
-        return any(p.search(line) for p in patterns)
+        return state
 
     def _has_nearby_nav(
-        self, line_index: int, all_lines: List[str], window: int = 3
+        self, line_index: int, tags: array, window: int = 3
     ) -> bool:
         """Check if NAV pattern appears near the given line."""
         start = max(0, line_index - window)
-        end = min(len(all_lines), line_index + window + 1)
+        end = min(len(tags), line_index + window + 1)
         for i in range(start, end):
-            if self.nav_re.search(all_lines[i]):
+            if tags[i] & _TAG_NAV:
                 return True
         return False
 
@@ -311,27 +461,9 @@ class SectionDetector:
         """Check if line looks like a transaction entry."""
         # Transaction typically has: date, description, amount/units
         has_date = self.date_re.search(line) is not None
-        has_number = re.search(r"\d+\.\d{2,4}", line) is not None
+        has_number = _DECIMAL_NUMBER_RE.search(line) is not None
         return has_date and has_number
 
-    def _is_new_holdings_section(
-        self, line_index: int, all_lines: List[str]
-    ) -> bool:
-        """
-        Determine if this is a genuinely new holdings section.
-
-        Some CAS formats intersperse holdings and transactions.
-        """
-        # Look for clear section header patterns
-        if line_index < len(all_lines):
-            line = all_lines[line_index]
-            # Check for explicit section headers
-            if re.search(r"(?i)summary\s*of\s*holdings", line):
-                return True
-            if re.search(r"(?i)mutual\s*fund\s*summary", line):
-                return True
-        return False
-
 
 def detect_sections(lines: List[str]) -> List[Section]:
     """
@@ -347,36 +479,110 @@ def detect_sections(lines: List[str]) -> List[Section]:
     return detector.detect_sections(lines)
 
 
+def iter_sections(lines: List[str]) -> Iterator[Section]:
+    """
+    Convenience function to lazily detect sections in CAS text lines.
+
+    Args:
+        lines: List of text lines from the PDF.
+
+    Returns:
+        Iterator of Section objects in document order.
+    """
+    return SectionDetector().iter_sections(lines)
+
+
+def profile_pattern_hits(lines: List[str]) -> Dict[str, List[Tuple[str, int]]]:
+    """
+    Count how often each section marker pattern matches the given lines.
+
+    The fused marker alternations try their branches left to right, so
+    running this over a representative set of statements shows which
+    pattern should come first in each SectionPatterns bucket.
+
+    Args:
+        lines: List of text lines from one or more CAS documents.
+
+    Returns:
+        Mapping of bucket name to (pattern, hits) pairs, most frequent first.
+    """
+    buckets = {
+        "INVESTOR_MARKERS": _INVESTOR_RE,
+        "HOLDINGS_MARKERS": _HOLDINGS_RE,
+        "TRANSACTION_MARKERS": _TRANSACTION_RE,
+        "END_MARKERS": _END_RE,
+    }
+    profile: Dict[str, List[Tuple[str, int]]] = {}
+    for name, patterns in buckets.items():
+        hits = [
+            (p.pattern, sum(1 for line in lines if p.search(line)))
+            for p in patterns
+        ]
+        profile[name] = sorted(hits, key=lambda item: item[1], reverse=True)
+    return profile
+
+
 def get_section_by_type(
-    sections: List[Section], section_type: SectionState
+    sections: Union[Iterable[Section], SectionIndex], section_type: SectionState
 ) -> Optional[Section]:
     """
     Get the first section of a specific type.
 
+    Stops at the first match, so passing ``iter_sections(lines)`` avoids
+    detecting the rest of the document.
+
     Args:
-        sections: List of detected sections.
+        sections: Detected sections (a list or an iterator), or a
+            SectionIndex built from them.
         section_type: Type of section to find.
 
     Returns:
         First matching section or None.
     """
-    for section in sections:
-        if section.section_type == section_type:
-            return section
-    return None
+    if isinstance(sections, SectionIndex):
+        return sections.first(section_type)
+    return next((s for s in sections if s.section_type == section_type), None)
 
 
 def get_all_sections_by_type(
-    sections: List[Section], section_type: SectionState
+    sections: Union[List[Section], SectionIndex],
+    section_type: Union[SectionState, Iterable[SectionState]],
 ) -> List[Section]:
     """
-    Get all sections of a specific type.
+    Get all sections of a specific type, or of any of several types.
+
+    Args:
+        sections: List of detected sections, or a SectionIndex built from them.
+        section_type: Type of section to find, or an iterable of types.
+
+    Returns:
+        List of matching sections in document order.
+    """
+    if isinstance(section_type, SectionState):
+        if isinstance(sections, SectionIndex):
+            return sections.all(section_type)
+        return [s for s in sections if s.section_type == section_type]
+
+    wanted = frozenset(section_type)
+    if isinstance(sections, SectionIndex):
+        matches = [s for t in wanted for s in sections.by_type.get(t, [])]
+        return sorted(matches, key=lambda s: s.start_line)
+    return [s for s in sections if s.section_type in wanted]
+
+
+def group_sections_by_type(
+    sections: List[Section],
+) -> Dict[SectionState, List[Section]]:
+    """
+    Group sections by type in a single pass.
 
     Args:
         sections: List of detected sections.
-        section_type: Type of section to find.
 
     Returns:
-        List of matching sections.
+        Mapping of section type to its sections, in document order.
     """
-    return [s for s in sections if s.section_type == section_type]
+    grouped: Dict[SectionState, List[Section]] = {}
+    for section in sections:
+        grouped.setdefault(section.section_type, []).append(section)
+    return grouped
@@ -0,0 +1,42 @@
+"""
+Shared pytest fixtures for parser tests.
+"""
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nps_parser import NPSParser
+
+
+NPS_SAMPLE_TEXT = """
+        NPS Statement
+        PRAN: 123456789012
+        Subscriber Name: JOHN DOE
+        PAN: ABCDE1234F
+
+        Statement Period: 01-04-2023 to 31-03-2024
+
+        Portfolio Summary
+        Scheme E - Equity: Units 500.1234, NAV 45.67, Value 22840.54
+        Scheme C - Corporate Bonds: Units 300.5678, NAV 32.10, Value 9648.23
+        Scheme G - Government Securities: Units 200.9012, NAV 28.50, Value 5725.68
+
+        Transaction History
+        15-01-2024 Employee Contribution Scheme E 5000.00 109.5432 45.67
+        15-01-2024 Employer Contribution Scheme E 5000.00 109.5432 45.67
+        """
+
+
+@pytest.fixture(scope="session")
+def nps_sample_text():
+    """Raw text of a small NPS statement."""
+    return NPS_SAMPLE_TEXT
+
+
+@pytest.fixture(scope="session")
+def parsed_nps_statement(nps_sample_text):
+    """NPS statement parsed once and shared by every test in the session."""
+    return NPSParser().parse_from_text(nps_sample_text)
@@ -1,5 +1,6 @@
 """Tests for CAS Parser data models."""
 
+import sys
 from datetime import date
 from decimal import Decimal
 
@@ -14,6 +15,28 @@ from cas_parser.models import (
     ValidationResult,
 )
 
+# Shared test values, built once per module
+UNITS_100 = Decimal(100)
+NAV_50 = Decimal(50)
+VALUE_5000 = Decimal(5000)
+D_2024_01_01 = date(2024, 1, 1)
+D_2024_01_15 = date(2024, 1, 15)
+
+
+def _make_holding(**overrides) -> Holding:
+    """Build a Holding from the shared test values, overriding any field."""
+    fields = {
+        "scheme_name": "Test Fund",
+        "isin": "INF179K01234",
+        "folio": "12345",
+        "units": UNITS_100,
+        "nav": NAV_50,
+        "nav_date": D_2024_01_15,
+        "current_value": VALUE_5000,
+    }
+    fields.update(overrides)
+    return Holding(**fields)
+
 
 class TestInvestor:
     """Tests for Investor dataclass."""
@@ -69,7 +92,7 @@ class TestHolding:
             folio="12345678/90",
             units=Decimal("1000.5678"),
             nav=Decimal("45.67"),
-            nav_date=date(2024, 1, 15),
+            nav_date=D_2024_01_15,
             current_value=Decimal("45692.45"),
             registrar="CAMS",
             amc="HDFC Mutual Fund",
@@ -82,13 +105,9 @@ class TestHolding:
 
     def test_holding_decimal_conversion(self):
         """Test that numeric values are converted to Decimal."""
-        holding = Holding(
-            scheme_name="Test Fund",
-            isin="INF179K01234",
-            folio="12345",
+        holding = _make_holding(
             units=100.5,  # float
             nav=45.67,  # float
-            nav_date=date(2024, 1, 15),
             current_value=4590.12,  # float
         )
 
@@ -98,20 +117,33 @@ class TestHolding:
 
     def test_holding_normalization(self):
         """Test that holding data is normalized."""
-        holding = Holding(
+        holding = _make_holding(
             scheme_name="  HDFC   Equity  Fund  ",
             isin="  inf179k01234  ",
             folio="  12345  ",
-            units=Decimal("100"),
-            nav=Decimal("50"),
-            nav_date=date(2024, 1, 15),
-            current_value=Decimal("5000"),
         )
 
         assert holding.scheme_name == "HDFC Equity Fund"
         assert holding.isin == "INF179K01234"
         assert holding.folio == "12345"
 
+    def test_holding_identifiers_interned(self):
+        """Test that equal folio and ISIN values share one string object."""
+        first = _make_holding(folio="".join(["123", "45"]))
+        second = _make_holding(folio=" 12345 ")
+
+        assert first.folio is second.folio
+        assert first.isin is second.isin
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10")
+    def test_holding_uses_slots(self):
+        """Test that holdings carry no per-instance __dict__."""
+        holding = _make_holding()
+
+        assert not hasattr(holding, "__dict__")
+        with pytest.raises(AttributeError):
+            holding.unexpected = True
+
 
 class TestTransaction:
     """Tests for Transaction dataclass."""
@@ -119,7 +151,7 @@ class TestTransaction:
     def test_create_transaction(self):
         """Test creating a transaction."""
         tx = Transaction(
-            date=date(2024, 1, 15),
+            date=D_2024_01_15,
             description="Purchase",
             transaction_type=TransactionType.PURCHASE,
             units=Decimal("100.5678"),
@@ -131,20 +163,23 @@ class TestTransaction:
             nav=Decimal("45.67"),
         )
 
-        assert tx.date == date(2024, 1, 15)
+        assert tx.date == D_2024_01_15
         assert tx.transaction_type == TransactionType.PURCHASE
         assert tx.units == Decimal("100.5678")
 
-    def test_transaction_types(self):
-        """Test all transaction type values."""
-        assert TransactionType.PURCHASE.value == "purchase"
-        assert TransactionType.REDEMPTION.value == "redemption"
-        assert TransactionType.SIP.value == "sip"
-        assert TransactionType.SWITCH_IN.value == "switch_in"
-        assert TransactionType.SWITCH_OUT.value == "switch_out"
-        assert TransactionType.DIVIDEND_PAYOUT.value == "dividend_payout"
-        assert TransactionType.DIVIDEND_REINVESTMENT.value == "dividend_reinvestment"
-        assert TransactionType.STT.value == "stt"
+    @pytest.mark.parametrize("tx_type,value", [
+        (TransactionType.PURCHASE, "purchase"),
+        (TransactionType.REDEMPTION, "redemption"),
+        (TransactionType.SIP, "sip"),
+        (TransactionType.SWITCH_IN, "switch_in"),
+        (TransactionType.SWITCH_OUT, "switch_out"),
+        (TransactionType.DIVIDEND_PAYOUT, "dividend_payout"),
+        (TransactionType.DIVIDEND_REINVESTMENT, "dividend_reinvestment"),
+        (TransactionType.STT, "stt"),
+    ])
+    def test_transaction_types(self, tx_type, value):
+        """Test transaction type values."""
+        assert tx_type.value == value
 
 
 class TestValidationResult:
@@ -205,13 +240,9 @@ class TestCASStatement:
     def test_to_dict(self):
         """Test converting statement to dictionary."""
         investor = Investor(name="John Doe", pan="ABCDE1234F")
-        holding = Holding(
-            scheme_name="Test Fund",
-            isin="INF179K01234",
-            folio="12345",
+        holding = _make_holding(
             units=Decimal("100.567"),
             nav=Decimal("50.00"),
-            nav_date=date(2024, 1, 15),
             current_value=Decimal("5028.35"),
         )
         statement = CASStatement(
@@ -228,36 +259,45 @@ class TestCASStatement:
         assert result["holdings"][0]["units"] == "100.567"
         assert result["statement_date"] == "2024-01-31"
 
+    def test_to_json_bytes_round_trip(self):
+        """Test that JSON bytes decode back to the dictionary form."""
+        import json
+
+        investor = Investor(name="John Doe", pan="ABCDE1234F")
+        statement = CASStatement(
+            investor=investor,
+            holdings=[_make_holding(units=Decimal("100.567"))],
+            statement_date=date(2024, 1, 31),
+            quarantine_items=[{"units": Decimal("1.5"), "date": D_2024_01_15}],
+        )
+
+        result = json.loads(statement.to_json_bytes())
+        pretty = json.loads(statement.to_json_bytes(indent=True))
+
+        expected = statement.to_dict()
+        expected["quarantine"] = [{"units": "1.5", "date": "2024-01-15"}]
+        assert result == expected
+        assert pretty == expected
+
     def test_get_holdings_for_folio(self):
         """Test filtering holdings by folio."""
         investor = Investor(name="John", pan="ABCDE1234F")
         holdings = [
-            Holding(
-                scheme_name="Fund A",
-                isin="INF179K01234",
-                folio="12345",
-                units=Decimal("100"),
-                nav=Decimal("50"),
-                nav_date=date(2024, 1, 1),
-                current_value=Decimal("5000"),
-            ),
-            Holding(
+            _make_holding(scheme_name="Fund A", nav_date=D_2024_01_01),
+            _make_holding(
                 scheme_name="Fund B",
                 isin="INF179K05678",
-                folio="12345",
-                units=Decimal("200"),
-                nav=Decimal("25"),
-                nav_date=date(2024, 1, 1),
-                current_value=Decimal("5000"),
+                units=Decimal(200),
+                nav=Decimal(25),
+                nav_date=D_2024_01_01,
             ),
-            Holding(
+            _make_holding(
                 scheme_name="Fund C",
                 isin="INF179K09999",
                 folio="99999",
-                units=Decimal("50"),
-                nav=Decimal("100"),
-                nav_date=date(2024, 1, 1),
-                current_value=Decimal("5000"),
+                units=Decimal(50),
+                nav=Decimal(100),
+                nav_date=D_2024_01_01,
             ),
         ]
         statement = CASStatement(investor=investor, holdings=holdings)
@@ -19,6 +19,13 @@ from nps_parser import (
     detect_contribution_type, detect_pfm, generate_nps_tx_hash
 )
 
+# Shared test values, built once per module
+UNITS_100 = Decimal(100)
+NAV_50 = Decimal(50)
+VALUE_5000 = Decimal(5000)
+NAV_45_6789 = Decimal("45.6789")
+D_2024_01_15 = date(2024, 1, 15)
+
 
 class TestNPSModels:
     """Test NPS data models."""
@@ -47,6 +54,15 @@ class TestNPSModels:
         assert subscriber.pan == "ABCDE1234F"
         assert subscriber.email == "test@email.com"
 
+    @pytest.mark.parametrize("pran", [
+        "123456789012\xa0",
+        "\f1234 5678 9012\v",
+        "\xa0 1234\t5678\n9012 \u2009",
+    ])
+    def test_subscriber_pran_unicode_whitespace(self, pran):
+        """Test that PDF whitespace such as non-breaking spaces is removed."""
+        assert NPSSubscriber(pran=pran, name="John Doe").pran == "123456789012"
+
     def test_scheme_creation(self):
         """Test NPSScheme dataclass."""
         scheme = NPSScheme(
@@ -54,8 +70,8 @@ class TestNPSModels:
             pfm_name="SBI",
             scheme_type=NPSSchemeType.SCHEME_E,
             units=Decimal("1000.5432"),
-            nav=Decimal("45.6789"),
-            nav_date=date(2024, 1, 15),
+            nav=NAV_45_6789,
+            nav_date=D_2024_01_15,
             current_value=Decimal("45710.12"),
             tier="I"
         )
@@ -68,13 +84,13 @@ class TestNPSModels:
     def test_transaction_creation(self):
         """Test NPSTransaction dataclass."""
         tx = NPSTransaction(
-            date=date(2024, 1, 15),
+            date=D_2024_01_15,
             contribution_type=ContributionType.EMPLOYEE,
             scheme_type=NPSSchemeType.SCHEME_E,
             pfm_name="SBI",
             amount=Decimal("5000.00"),
             units=Decimal("109.5432"),
-            nav=Decimal("45.6789"),
+            nav=NAV_45_6789,
             description="Employee Contribution",
             tier="I"
         )
@@ -101,12 +117,12 @@ class TestParserHelpers:
 
     def test_parse_date_dmy(self):
         """Test date parsing with DD-MM-YYYY format."""
-        assert parse_date("15-01-2024") == date(2024, 1, 15)
+        assert parse_date("15-01-2024") == D_2024_01_15
         assert parse_date("01/12/2023") == date(2023, 12, 1)
 
     def test_parse_date_text(self):
         """Test date parsing with text month."""
-        assert parse_date("15-Jan-2024") == date(2024, 1, 15)
+        assert parse_date("15-Jan-2024") == D_2024_01_15
         assert parse_date("01 Dec 2023") == date(2023, 12, 1)
 
     def test_parse_date_invalid(self):
@@ -119,7 +135,7 @@ class TestParserHelpers:
         """Test decimal parsing."""
         assert parse_decimal("1000.50") == Decimal("1000.50")
         assert parse_decimal("1,00,000.50") == Decimal("100000.50")
-        assert parse_decimal("Rs. 5000") == Decimal("5000")
+        assert parse_decimal("Rs. 5000") == Decimal(5000)
         assert parse_decimal("INR 10,000.00") == Decimal("10000.00")
 
     def test_parse_decimal_invalid(self):
@@ -127,29 +143,46 @@ class TestParserHelpers:
         assert parse_decimal("") is None
         assert parse_decimal(None) is None
 
-    def test_detect_scheme_type(self):
+    def test_parse_helpers_cached(self):
+        """Test repeated inputs are served from the cache with equal results."""
+        assert parse_date("15-01-2024") == parse_date("15-01-2024") == D_2024_01_15
+        assert parse_date("not a date") is None
+        assert parse_date("not a date") is None
+        assert parse_decimal("1,00,000.50") is parse_decimal("1,00,000.50")
+        assert parse_decimal.cache_info().hits > 0
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Scheme E - Equity", NPSSchemeType.SCHEME_E),
+        ("SCHEME-C Corporate Bonds", NPSSchemeType.SCHEME_C),
+        ("Government Securities (G)", NPSSchemeType.SCHEME_G),
+        ("Alternate Assets", NPSSchemeType.SCHEME_A),
+        ("Unknown scheme", NPSSchemeType.UNKNOWN),
+    ])
+    def test_detect_scheme_type(self, text, expected):
         """Test scheme type detection."""
-        assert detect_scheme_type("Scheme E - Equity") == NPSSchemeType.SCHEME_E
-        assert detect_scheme_type("SCHEME-C Corporate Bonds") == NPSSchemeType.SCHEME_C
-        assert detect_scheme_type("Government Securities (G)") == NPSSchemeType.SCHEME_G
-        assert detect_scheme_type("Alternate Assets") == NPSSchemeType.SCHEME_A
-        assert detect_scheme_type("Unknown scheme") == NPSSchemeType.UNKNOWN
-
-    def test_detect_contribution_type(self):
+        assert detect_scheme_type(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("Employee Contribution", ContributionType.EMPLOYEE),
+        ("EMPLOYER CONT", ContributionType.EMPLOYER),
+        ("Voluntary contribution", ContributionType.VOLUNTARY),
+        ("Tier II", ContributionType.TIER_II),
+        ("Unknown", ContributionType.UNKNOWN),
+    ])
+    def test_detect_contribution_type(self, text, expected):
         """Test contribution type detection."""
-        assert detect_contribution_type("Employee Contribution") == ContributionType.EMPLOYEE
-        assert detect_contribution_type("EMPLOYER CONT") == ContributionType.EMPLOYER
-        assert detect_contribution_type("Voluntary contribution") == ContributionType.VOLUNTARY
-        assert detect_contribution_type("Tier II") == ContributionType.TIER_II
-        assert detect_contribution_type("Unknown") == ContributionType.UNKNOWN
-
-    def test_detect_pfm(self):
+        assert detect_contribution_type(text) == expected
+
+    @pytest.mark.parametrize("text,expected", [
+        ("SBI Pension Fund", "SBI"),
+        ("LIC Pension Fund Limited", "LIC"),
+        ("HDFC Pension Management", "HDFC"),
+        ("ICICI Prudential", "ICICI"),
+        ("Unknown Fund", ""),
+    ])
+    def test_detect_pfm(self, text, expected):
         """Test PFM detection."""
-        assert detect_pfm("SBI Pension Fund") == "SBI"
-        assert detect_pfm("LIC Pension Fund Limited") == "LIC"
-        assert detect_pfm("HDFC Pension Management") == "HDFC"
-        assert detect_pfm("ICICI Prudential") == "ICICI"
-        assert detect_pfm("Unknown Fund") == ""
+        assert detect_pfm(text) == expected
 
     def test_generate_tx_hash(self):
         """Test transaction hash generation."""
@@ -159,7 +192,7 @@ class TestParserHelpers:
 
         assert hash1 == hash2  # Same inputs, same hash
         assert hash1 != hash3  # Different date, different hash
-        assert len(hash1) == 32  # MD5 hash length
+        assert len(hash1) == 32  # 128-bit hex digest
 
 
 class TestNPSParser:
@@ -173,32 +206,32 @@ class TestNPSParser:
         parser_with_pwd = NPSParser(password="test123")
         assert parser_with_pwd.password == "test123"
 
-    def test_parse_from_text_basic(self):
+    def test_parse_from_text_basic(self, parsed_nps_statement):
         """Test parsing from raw text."""
-        sample_text = """
-        NPS Statement
-        PRAN: 123456789012
-        Subscriber Name: JOHN DOE
-        PAN: ABCDE1234F
+        statement = parsed_nps_statement
 
-        Statement Period: 01-04-2023 to 31-03-2024
+        assert statement.subscriber.pran == "123456789012"
+        assert statement.subscriber.name == "JOHN DOE"
+        assert statement.subscriber.pan == "ABCDE1234F"
 
-        Portfolio Summary
-        Scheme E - Equity: Units 500.1234, NAV 45.67, Value 22840.54
-        Scheme C - Corporate Bonds: Units 300.5678, NAV 32.10, Value 9648.23
-        Scheme G - Government Securities: Units 200.9012, NAV 28.50, Value 5725.68
+    def test_parse_from_text_period(self, parsed_nps_statement):
+        """Test statement period extraction from raw text."""
+        statement = parsed_nps_statement
 
-        Transaction History
-        15-01-2024 Employee Contribution Scheme E 5000.00 109.5432 45.67
-        15-01-2024 Employer Contribution Scheme E 5000.00 109.5432 45.67
-        """
+        assert statement.statement_from_date == date(2023, 4, 1)
+        assert statement.statement_to_date == date(2024, 3, 31)
+        assert statement.statement_date == date(2024, 3, 31)
 
+    def test_classification_cache_per_document(self, nps_sample_text):
+        """Test that scheme/PFM lookups are cached per parsed document."""
         parser = NPSParser()
-        statement = parser.parse_from_text(sample_text)
+        parser.parse_from_text(nps_sample_text)
 
-        assert statement.subscriber.pran == "123456789012"
-        assert statement.subscriber.name == "JOHN DOE"
-        assert statement.subscriber.pan == "ABCDE1234F"
+        assert parser._pfm_cache
+        assert all(parser._pfm_cache[text] == detect_pfm(text) for text in parser._pfm_cache)
+
+        parser.parse_from_text("PRAN: 123456789012")
+        assert set(parser._pfm_cache) <= {"PRAN: 123456789012"}
 
     def test_statement_to_dict(self):
         """Test statement serialization to dict."""
@@ -211,10 +244,10 @@ class TestNPSParser:
             scheme_name="Test Scheme",
             pfm_name="SBI",
             scheme_type=NPSSchemeType.SCHEME_E,
-            units=Decimal("100"),
-            nav=Decimal("50"),
-            nav_date=date(2024, 1, 15),
-            current_value=Decimal("5000"),
+            units=UNITS_100,
+            nav=NAV_50,
+            nav_date=D_2024_01_15,
+            current_value=VALUE_5000,
             tier="I"
         ))
 
@@ -3,24 +3,38 @@
 import pytest
 
 from cas_parser.section_detector import (
+    LineView,
     Section,
     SectionDetector,
+    SectionIndex,
     SectionPatterns,
     SectionState,
     detect_sections,
     get_all_sections_by_type,
     get_section_by_type,
+    group_sections_by_type,
+    iter_sections,
+    profile_pattern_hits,
 )
 
 
+@pytest.fixture
+def detector():
+    """
+    Provide a fresh SectionDetector.
+
+    Function scoped because the detector carries FSM state between calls;
+    construction is cheap since compiled patterns are shared module-wide.
+    """
+    return SectionDetector()
+
+
 class TestSectionPatterns:
     """Tests for section pattern matching."""
 
     def test_investor_patterns(self):
         """Test investor section marker patterns."""
-        import re
-
-        patterns = [re.compile(p) for p in SectionPatterns.INVESTOR_MARKERS]
+        patterns = SectionPatterns.INVESTOR_MARKERS_RE
 
         assert any(p.search("Personal Information") for p in patterns)
         assert any(p.search("Investor Details") for p in patterns)
@@ -28,9 +42,7 @@ class TestSectionPatterns:
 
     def test_holdings_patterns(self):
         """Test holdings section marker patterns."""
-        import re
-
-        patterns = [re.compile(p) for p in SectionPatterns.HOLDINGS_MARKERS]
+        patterns = SectionPatterns.HOLDINGS_MARKERS_RE
 
         assert any(p.search("Mutual Fund Summary") for p in patterns)
         assert any(p.search("Scheme Name ISIN Folio") for p in patterns)
@@ -38,9 +50,7 @@ class TestSectionPatterns:
 
     def test_transaction_patterns(self):
         """Test transaction section marker patterns."""
-        import re
-
-        patterns = [re.compile(p) for p in SectionPatterns.TRANSACTION_MARKERS]
+        patterns = SectionPatterns.TRANSACTION_MARKERS_RE
 
         assert any(p.search("Transaction Statement") for p in patterns)
         assert any(p.search("Statement of Transactions") for p in patterns)
@@ -50,13 +60,11 @@ class TestSectionPatterns:
 class TestSectionDetector:
     """Tests for SectionDetector FSM."""
 
-    def test_initial_state(self):
+    def test_initial_state(self, detector):
         """Test detector starts in INITIAL state."""
-        detector = SectionDetector()
-
         assert detector.current_state == SectionState.INITIAL
 
-    def test_detect_investor_section(self):
+    def test_detect_investor_section(self, detector):
         """Test detecting investor information section."""
         lines = [
             "Consolidated Account Statement",
@@ -66,13 +74,12 @@ class TestSectionDetector:
             "Email: john@example.com",
         ]
 
-        detector = SectionDetector()
         sections = detector.detect_sections(lines)
 
         investor_sections = [s for s in sections if s.section_type == SectionState.INVESTOR_INFO]
         assert len(investor_sections) >= 1
 
-    def test_detect_holdings_section(self):
+    def test_detect_holdings_section(self, detector):
         """Test detecting holdings summary section."""
         lines = [
             "Some header",
@@ -81,13 +88,12 @@ class TestSectionDetector:
             "HDFC Equity Fund    INF179K01234   12345     100.00    45.67    4567.00",
         ]
 
-        detector = SectionDetector()
         sections = detector.detect_sections(lines)
 
         holdings_sections = [s for s in sections if s.section_type == SectionState.HOLDINGS_SUMMARY]
         assert len(holdings_sections) >= 1
 
-    def test_detect_transaction_section(self):
+    def test_detect_transaction_section(self, detector):
         """Test detecting transaction details section."""
         lines = [
             "Personal Information",
@@ -98,7 +104,6 @@ class TestSectionDetector:
             "15-Jan-2024 Purchase       10000.00  219.123   45.67   1000.567",
         ]
 
-        detector = SectionDetector()
         sections = detector.detect_sections(lines)
 
         tx_sections = [s for s in sections if s.section_type == SectionState.TRANSACTION_DETAILS]
@@ -150,6 +155,40 @@ class TestSectionDetector:
             assert any("Personal Information" in line or "Name: John" in line
                       for line in investor_section.lines)
 
+    def test_iter_sections_matches_detect_sections(self):
+        """Test that the lazy iterator yields the same sections as the list API."""
+        lines = [
+            "Personal Information",
+            "PAN: ABCDE1234F",
+            "Mutual Fund Summary",
+            "HDFC Equity Fund INF179K01234 12345 100.567 45.67 4592.88",
+            "Transaction Statement",
+            "15-Jan-2024 Purchase 10000.00 219.123 45.67 1000.567",
+        ]
+
+        sections = detect_sections(lines)
+
+        assert list(iter_sections(lines)) == sections
+        for section in sections:
+            assert isinstance(section.lines, LineView)
+            assert section.lines == lines[section.start_line:section.end_line]
+
+    def test_get_section_by_type_stops_early(self):
+        """Test that a lazy lookup does not consume the remaining sections."""
+        lines = [
+            "Personal Information",
+            "PAN: ABCDE1234F",
+            "Mutual Fund Summary",
+            "Transaction Statement",
+        ]
+        sections = iter_sections(lines)
+
+        investor = get_section_by_type(sections, SectionState.INVESTOR_INFO)
+
+        assert investor is not None
+        assert investor.start_line == 0
+        assert next(sections).section_type == SectionState.HOLDINGS_SUMMARY
+
 
 class TestHelperFunctions:
     """Tests for section detector helper functions."""
@@ -190,6 +229,69 @@ class TestHelperFunctions:
         assert len(result) == 2
         assert all(s.section_type == SectionState.HOLDINGS_SUMMARY for s in result)
 
+    def test_get_all_sections_by_several_types(self):
+        """Test filtering sections by a set of types keeps document order."""
+        sections = [
+            Section(SectionState.INVESTOR_INFO, 0, 5, ["line1"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 5, 10, ["line2"]),
+            Section(SectionState.TRANSACTION_DETAILS, 10, 15, ["line3"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 15, 20, ["line4"]),
+        ]
+        wanted = [SectionState.HOLDINGS_SUMMARY, SectionState.TRANSACTION_DETAILS]
+
+        result = get_all_sections_by_type(sections, wanted)
+        indexed = get_all_sections_by_type(SectionIndex.from_sections(sections), wanted)
+
+        assert result == sections[1:]
+        assert indexed == sections[1:]
+
+    def test_group_sections_by_type(self):
+        """Test grouping sections by type in one pass."""
+        sections = [
+            Section(SectionState.INVESTOR_INFO, 0, 5, ["line1"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 5, 10, ["line2"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 15, 20, ["line4"]),
+        ]
+
+        grouped = group_sections_by_type(sections)
+
+        assert set(grouped) == {SectionState.INVESTOR_INFO, SectionState.HOLDINGS_SUMMARY}
+        assert grouped[SectionState.HOLDINGS_SUMMARY] == sections[1:]
+
+    def test_lookups_accept_section_index(self):
+        """Test that helpers answer from a SectionIndex without rescanning."""
+        sections = [
+            Section(SectionState.INVESTOR_INFO, 0, 5, ["line1"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 5, 10, ["line2"]),
+            Section(SectionState.HOLDINGS_SUMMARY, 15, 20, ["line4"]),
+        ]
+        index = SectionIndex.from_sections(sections)
+
+        assert get_section_by_type(index, SectionState.HOLDINGS_SUMMARY) is sections[1]
+        assert get_section_by_type(index, SectionState.TRANSACTION_DETAILS) is None
+        assert get_all_sections_by_type(index, SectionState.HOLDINGS_SUMMARY) == sections[1:]
+        assert get_all_sections_by_type(index, SectionState.TRANSACTION_DETAILS) == []
+
+
+class TestProfilePatternHits:
+    """Tests for marker pattern hit profiling."""
+
+    def test_patterns_sorted_by_hits(self):
+        """Test that the most frequently matched marker is listed first."""
+        lines = [
+            "Folio No: 1001",
+            "Folio No: 1002",
+            "Mutual Fund Summary",
+            "Page 1 of 2",
+        ]
+
+        profile = profile_pattern_hits(lines)
+
+        assert profile["HOLDINGS_MARKERS"][0] == (r"(?i)folio\s*no\s*:", 2)
+        assert len(profile["HOLDINGS_MARKERS"]) == len(SectionPatterns.HOLDINGS_MARKERS)
+        assert profile["END_MARKERS"][0][1] == 1
+        assert all(hits == 0 for _, hits in profile["TRANSACTION_MARKERS"])
+
 
 class TestSection:
     """Tests for Section dataclass."""
@@ -208,3 +310,59 @@ class TestSection:
         assert section.start_line == 0
         assert section.end_line == 3
         assert len(section.lines) == 3
+
+    def test_line_view(self):
+        """Test that LineView behaves like the slice it stands in for."""
+        lines = ["a", "b", "c", "d", "e"]
+        view = LineView(lines, 1, 4)
+
+        assert len(view) == 3
+        assert list(view) == ["b", "c", "d"]
+        assert view[0] == "b"
+        assert view[-1] == "d"
+        assert view[1:] == ["c", "d"]
+        assert "c" in view
+        assert view == ["b", "c", "d"]
+        with pytest.raises(IndexError):
+            view[3]
+
+
+class TestPatternCache:
+    """Tests for the module-level compiled pattern cache."""
+
+    def test_detectors_share_compiled_patterns(self):
+        """Test that detectors reuse patterns instead of recompiling them."""
+        first = SectionDetector()
+        second = SectionDetector()
+
+        assert first.investor_re is second.investor_re
+        assert first.end_re is second.end_re
+        assert first.isin_re is second.isin_re
+
+    def test_line_tags_match_individual_patterns(self, detector):
+        """Test that document-wide marker scans agree with the per-pattern lists."""
+        import re
+
+        from cas_parser import section_detector as sd
+
+        samples = [
+            "PERSONAL INFORMATION",
+            "Mutual Fund Summary",
+            "Folio No: 12345",
+            "Statement of Transactions",
+            "Page 2 of 5",
+            "Header Page 2 of 5",
+            "Name: John Doe",
+        ]
+        buckets = [
+            (sd._TAG_INVESTOR, SectionPatterns.INVESTOR_MARKERS),
+            (sd._TAG_HOLDINGS, SectionPatterns.HOLDINGS_MARKERS),
+            (sd._TAG_TRANSACTION, SectionPatterns.TRANSACTION_MARKERS),
+            (sd._TAG_END, SectionPatterns.END_MARKERS),
+        ]
+        tags = detector._classify_lines(samples)
+
+        for bit, markers in buckets:
+            for line, tag in zip(samples, tags):
+                expected = any(re.search(p, line) for p in markers)
+                assert bool(tag & bit) == expected
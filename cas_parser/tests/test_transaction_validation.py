@@ -6,202 +6,205 @@ import pytest
 
 from cas_parser.transactions_parser import TransactionsParser
 from cas_parser.unified_parser import UnifiedCASParser
+from cas_parser.webapp.data import (
+    _validate_transaction_for_insert as validate_for_insert,
+)
 
+# Recurring scenario values, built once at import
+AMOUNT_5000 = Decimal("5000.00")
+UNITS_100 = Decimal("100.000")
+NAV_50 = Decimal("50.0000")
+AMOUNT_600000 = Decimal("600000.00")
+UNITS_NEG_54972 = Decimal("-54972.000")
+NAV_NEG_5000 = Decimal("-5000.0000")
+AMOUNT_949M = Decimal("949000000.00")
+NAV_11 = Decimal("11.0000")
+AMOUNT_1961 = Decimal("1961.00")
+UNITS_10000 = Decimal("10000.000")
+NAV_19_61 = Decimal("19.6100")
+AMOUNT_5050 = Decimal("5050.00")
+ZERO = Decimal(0)
+# Bounds for the NAV recomputed from 600000 / 54972 ≈ 10.914
+NAV_FIXED_LOW = Decimal(10)
+NAV_FIXED_HIGH = Decimal(12)
+REL_1PCT = Decimal("0.01")
+
+
+def _approx_dec(actual, expected, rel: Decimal = REL_1PCT) -> bool:
+    """True when actual is within rel of expected, compared in expected's type."""
+    return abs(actual - expected) <= abs(expected) * type(expected)(rel)
+
+
+# Stateless staticmethod, so no parser instance is needed
+validate_unified = UnifiedCASParser._validate_and_fix_transaction_values
+
+
+def _identity(value):
+    """Pass Decimal inputs through unchanged."""
+    return value
 
-class TestUnifiedParserValidation:
-    """Tests for _validate_and_fix_transaction_values in UnifiedCASParser."""
 
-    def setup_method(self):
-        self.parser = UnifiedCASParser.__new__(UnifiedCASParser)
+# (id, validator factory, input converter). The parsers work in Decimal;
+# the persistence layer receives floats.
+VALIDATORS = [
+    ("unified", lambda: validate_unified, _identity),
+    ("tx", lambda: TransactionsParser()._validate_and_fix_transaction_values, _identity),
+    ("persist", lambda: validate_for_insert, float),
+]
 
-    def test_all_values_consistent_no_change(self):
+
+@pytest.fixture(params=VALIDATORS, ids=[v[0] for v in VALIDATORS])
+def validate_values(request):
+    """Each cross-validation implementation with its input converter."""
+    _, factory, num = request.param
+    return factory(), num
+
+
+class TestCrossValidation:
+    """Scenarios every amount/units/NAV cross-validator must handle alike."""
+
+    def test_all_values_consistent_no_change(self, validate_values):
         """When amount ≈ |units| × nav, no corrections should be made."""
-        amount = Decimal("5000.00")
-        units = Decimal("100.000")
-        nav = Decimal("50.0000")
-        result = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        assert result == (amount, units, nav)
+        validate, num = validate_values
+        amount, units, nav = num(AMOUNT_5000), num(UNITS_100), num(NAV_50)
+        assert validate(amount, units, nav) == (amount, units, nav)
 
-    def test_corrupt_nav_negative(self):
+    def test_corrupt_nav_negative(self, validate_values):
         """Folio 6 pattern: nav < 0, amount and units are correct."""
-        amount = Decimal("600000.00")
-        units = Decimal("-54972.000")
-        nav = Decimal("-5000.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        validate, num = validate_values
+        amount, units, nav = num(AMOUNT_600000), num(UNITS_NEG_54972), num(NAV_NEG_5000)
+        a, u, n = validate(amount, units, nav)
         # NAV should be recomputed: 600000 / 54972 ≈ 10.914
-        assert n > 0
-        assert Decimal("10") < n < Decimal("12")
+        assert num(NAV_FIXED_LOW) < n < num(NAV_FIXED_HIGH)
         # Amount and units should be unchanged
         assert a == amount
         assert u == units
 
-    def test_corrupt_amount_wildly_large(self):
+    def test_corrupt_amount_wildly_large(self, validate_values):
         """Folio 17 pattern: amount=949M when it should be ~6L."""
-        amount = Decimal("949000000.00")
-        units = Decimal("-54972.000")
-        nav = Decimal("11.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        validate, num = validate_values
+        amount, units, nav = num(AMOUNT_949M), num(UNITS_NEG_54972), num(NAV_11)
+        a, u, n = validate(amount, units, nav)
         # Amount should be corrected to |units| × nav ≈ 604692
-        expected_amount = abs(units) * nav
-        assert abs(a) == pytest.approx(float(expected_amount), rel=0.01)
+        assert _approx_dec(abs(a), abs(units) * nav)
         # Units and NAV unchanged
         assert u == units
         assert n == nav
 
-    def test_corrupt_units_too_large(self):
+    def test_corrupt_units_too_large(self, validate_values):
         """Folio 20 pattern: units=10000 garbage when it should be ~100."""
-        amount = Decimal("1961.00")
-        units = Decimal("10000.000")
-        nav = Decimal("19.6100")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        validate, num = validate_values
+        amount, units, nav = num(AMOUNT_1961), num(UNITS_10000), num(NAV_19_61)
+        a, u, n = validate(amount, units, nav)
         # Units should be corrected to amount / nav ≈ 100
-        expected_units = amount / nav
-        assert float(u) == pytest.approx(float(expected_units), rel=0.01)
+        assert _approx_dec(u, amount / nav)
         # Amount and NAV unchanged
         assert a == amount
         assert n == nav
 
+    def test_nav_zero_units_zero(self, validate_values):
+        """When nav=0 and units=0, nothing can be recomputed."""
+        validate, num = validate_values
+        amount, units, nav = num(AMOUNT_5000), num(ZERO), num(ZERO)
+        assert validate(amount, units, nav) == (amount, units, nav)
+
+
+# (id, amount, units, nav, corrected (amount, units, nav)). Ratios on or just
+# inside the 100x / 1% bounds, where a float screen must defer to Decimal.
+UNIFIED_BOUNDARY_CASES = [
+    ("ratio_exactly_100", Decimal("5000.00"), Decimal("1.000"), Decimal("50.0000"),
+     (Decimal("50.0000000"), Decimal("1.000"), Decimal("50.0000"))),
+    ("ratio_just_under_100", Decimal("4999.99"), Decimal("1.000"), Decimal("50.0000"),
+     None),
+    ("ratio_exactly_1_percent", Decimal("50.00"), Decimal("100.000"), Decimal("50.0000"),
+     (Decimal("50.00"), Decimal("1"), Decimal("50.0000"))),
+    ("ratio_just_over_1_percent", Decimal("50.01"), Decimal("100.000"), Decimal("50.0000"),
+     None),
+]
+
+
+class TestUnifiedParserValidation:
+    """Tests for _validate_and_fix_transaction_values in UnifiedCASParser."""
+
+    @pytest.mark.parametrize(
+        "name,amount,units,nav,corrected", UNIFIED_BOUNDARY_CASES,
+        ids=[case[0] for case in UNIFIED_BOUNDARY_CASES],
+    )
+    def test_ratio_bounds_are_exact(self, name, amount, units, nav, corrected):
+        """Rows exactly on a bound are corrected; rows just inside are kept."""
+        expected = corrected or (amount, units, nav)
+        assert validate_unified(amount, units, nav) == expected
+
     def test_nav_zero_no_cross_check(self):
         """When nav=0, cross-check is not possible, values unchanged."""
-        amount = Decimal("5000.00")
-        units = Decimal("100.000")
-        nav = Decimal("0")
+        amount = AMOUNT_5000
+        units = UNITS_100
+        nav = ZERO
         # nav=0 triggers range check, but if amount/units can't produce valid nav...
         # recomputed = 5000/100 = 50 which is valid, so nav gets fixed
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        assert n == Decimal("50")
+        a, u, n = validate_unified(amount, units, nav)
+        assert n == NAV_50
         assert a == amount
         assert u == units
 
-    def test_nav_zero_units_zero(self):
-        """When nav=0 and units=0, nothing can be recomputed."""
-        amount = Decimal("5000.00")
-        units = Decimal("0")
-        nav = Decimal("0")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        # Can't recompute — values unchanged
-        assert a == amount
-        assert u == units
-        assert n == nav
-
     def test_negative_amount_sign_preserved(self):
         """When amount is corrected, original sign should be preserved."""
-        amount = Decimal("-949000000.00")  # negative corrupt amount
-        units = Decimal("-54972.000")
-        nav = Decimal("11.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        amount = -AMOUNT_949M  # negative corrupt amount
+        units = UNITS_NEG_54972
+        nav = NAV_11
+        a, u, n = validate_unified(amount, units, nav)
         # Corrected amount should be negative (preserving sign)
         assert a < 0
 
     def test_negative_units_sign_preserved(self):
         """When units are corrected, original sign should be preserved."""
-        amount = Decimal("1961.00")
-        units = Decimal("-10000.000")  # negative corrupt units
-        nav = Decimal("19.6100")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        amount = AMOUNT_1961
+        units = -UNITS_10000  # negative corrupt units
+        nav = NAV_19_61
+        a, u, n = validate_unified(amount, units, nav)
         # Corrected units should be negative (preserving sign)
         assert u < 0
 
     def test_small_discrepancy_no_correction(self):
         """Small discrepancies (within normal range) should not trigger correction."""
         # amount = 5050, units × nav = 5000 — ratio = 1.01, within tolerance
-        amount = Decimal("5050.00")
-        units = Decimal("100.000")
-        nav = Decimal("50.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
+        amount = AMOUNT_5050
+        units = UNITS_100
+        nav = NAV_50
+        a, u, n = validate_unified(amount, units, nav)
         assert a == amount
         assert u == units
         assert n == nav
 
 
+@pytest.fixture(scope="class")
+def tx_parser():
+    """TransactionsParser shared by a test class; validation reads no parser state."""
+    return TransactionsParser()
+
+
 class TestTransactionsParserValidation:
     """Tests for _validate_and_fix_transaction_values in TransactionsParser."""
 
-    def setup_method(self):
-        self.parser = TransactionsParser()
-
-    def test_all_values_consistent_no_change(self):
-        amount = Decimal("5000.00")
-        units = Decimal("100.000")
-        nav = Decimal("50.0000")
-        result = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        assert result == (amount, units, nav)
-
-    def test_corrupt_nav_negative(self):
-        amount = Decimal("600000.00")
-        units = Decimal("-54972.000")
-        nav = Decimal("-5000.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        assert n > 0
-        assert Decimal("10") < n < Decimal("12")
-
-    def test_corrupt_amount_wildly_large(self):
-        amount = Decimal("949000000.00")
-        units = Decimal("-54972.000")
-        nav = Decimal("11.0000")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        expected_amount = abs(units) * nav
-        assert abs(a) == pytest.approx(float(expected_amount), rel=0.01)
-
-    def test_corrupt_units_too_large(self):
-        amount = Decimal("1961.00")
-        units = Decimal("10000.000")
-        nav = Decimal("19.6100")
-        a, u, n = self.parser._validate_and_fix_transaction_values(amount, units, nav)
-        expected_units = amount / nav
-        assert float(u) == pytest.approx(float(expected_units), rel=0.01)
-
-    def test_none_values_pass_through(self):
+    def test_none_values_pass_through(self, tx_parser):
         """When any value is None, validation should pass through unchanged."""
-        result = self.parser._validate_and_fix_transaction_values(
-            None, Decimal("100"), Decimal("50")
+        result = tx_parser._validate_and_fix_transaction_values(
+            None, UNITS_100, NAV_50
         )
-        assert result == (None, Decimal("100"), Decimal("50"))
+        assert result == (None, UNITS_100, NAV_50)
 
-        result = self.parser._validate_and_fix_transaction_values(
-            Decimal("5000"), None, Decimal("50")
+        result = tx_parser._validate_and_fix_transaction_values(
+            AMOUNT_5000, None, NAV_50
         )
-        assert result == (Decimal("5000"), None, Decimal("50"))
+        assert result == (AMOUNT_5000, None, NAV_50)
 
 
 class TestPersistenceLayerValidation:
     """Tests for _validate_transaction_for_insert in data.py."""
 
-    def setup_method(self):
-        from cas_parser.webapp.data import _validate_transaction_for_insert
-        self.validate = _validate_transaction_for_insert
-
-    def test_all_values_consistent_no_change(self):
-        a, u, n = self.validate(5000.0, 100.0, 50.0)
-        assert a == pytest.approx(5000.0)
-        assert u == pytest.approx(100.0)
-        assert n == pytest.approx(50.0)
-
-    def test_corrupt_nav_negative(self):
-        a, u, n = self.validate(600000.0, -54972.0, -5000.0)
-        assert n > 0
-        assert 10 < n < 12
-
-    def test_corrupt_amount_wildly_large(self):
-        a, u, n = self.validate(949000000.0, -54972.0, 11.0)
-        expected = abs(-54972.0) * 11.0
-        assert abs(a) == pytest.approx(expected, rel=0.01)
-
-    def test_corrupt_units_too_large(self):
-        a, u, n = self.validate(1961.0, 10000.0, 19.61)
-        expected_units = 1961.0 / 19.61
-        assert u == pytest.approx(expected_units, rel=0.01)
-
-    def test_nav_zero_units_zero_no_crash(self):
-        """Should not crash on zero values."""
-        a, u, n = self.validate(5000.0, 0.0, 0.0)
-        assert a == 5000.0
-        assert u == 0.0
-        assert n == 0.0
-
     def test_all_zeros(self):
         """All zeros should pass through without error."""
-        a, u, n = self.validate(0.0, 0.0, 0.0)
+        a, u, n = validate_for_insert(0.0, 0.0, 0.0)
         assert a == 0.0
         assert u == 0.0
         assert n == 0.0
@@ -9,123 +9,119 @@ from cas_parser.models import TransactionType
 from cas_parser.transactions_parser import (
     TransactionTypeDetector,
     TransactionsParser,
+    _leading_keyword,
+    _lookahead_windows,
     classify_transaction,
     parse_transactions,
 )
 
 
-class TestTransactionTypeDetector:
-    """Tests for transaction type detection."""
-
-    def test_detect_purchase(self):
-        """Test detecting purchase transactions."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Purchase - Direct", Decimal("100"))
-        assert result == TransactionType.PURCHASE
-
-        result = detector.detect("New Investment", Decimal("50"))
-        assert result == TransactionType.PURCHASE
-
-    def test_detect_redemption(self):
-        """Test detecting redemption transactions."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Redemption", Decimal("-100"))
-        assert result == TransactionType.REDEMPTION
-
-        result = detector.detect("Partial Withdrawal", Decimal("-50"))
-        assert result == TransactionType.REDEMPTION
-
-    def test_detect_sip(self):
-        """Test detecting SIP transactions."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Systematic Investment Plan", Decimal("100"))
-        assert result == TransactionType.SIP
-
-        result = detector.detect("SIP - Monthly", Decimal("50"))
-        assert result == TransactionType.SIP
-
-    def test_detect_switch_in(self):
-        """Test detecting switch-in transactions."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Switch In from HDFC Equity", Decimal("100"))
-        assert result == TransactionType.SWITCH_IN
-
-        result = detector.detect("Switched In", Decimal("50"))
-        assert result == TransactionType.SWITCH_IN
-
-    def test_detect_switch_out(self):
-        """Test detecting switch-out transactions."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Switch Out to HDFC Bond", Decimal("-100"))
-        assert result == TransactionType.SWITCH_OUT
-
-        result = detector.detect("Switched Out", Decimal("-50"))
-        assert result == TransactionType.SWITCH_OUT
-
-    def test_detect_dividend_reinvestment(self):
-        """Test detecting dividend reinvestment."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Dividend Reinvested", Decimal("10"))
-        assert result == TransactionType.DIVIDEND_REINVESTMENT
-
-        result = detector.detect("Div. Reinv.", Decimal("5"))
-        assert result == TransactionType.DIVIDEND_REINVESTMENT
-
-    def test_detect_dividend_payout(self):
-        """Test detecting dividend payout."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Dividend Payout", Decimal("0"))
-        assert result == TransactionType.DIVIDEND_PAYOUT
-
-    def test_detect_stt(self):
-        """Test detecting STT charges."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("STT Paid", Decimal("-0.01"))
-        assert result == TransactionType.STT
-
-        result = detector.detect("Securities Transaction Tax", Decimal("0"))
-        assert result == TransactionType.STT
-
-    def test_detect_stamp_duty(self):
-        """Test detecting stamp duty."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Stamp Duty", Decimal("-0.05"))
-        assert result == TransactionType.STAMP_DUTY
-
-    def test_detect_charges(self):
-        """Test detecting charges."""
-        detector = TransactionTypeDetector()
-
-        result = detector.detect("Exit Load Charges", Decimal("-10"))
-        assert result == TransactionType.CHARGES
+# (description, units, expected type); Decimal values are built once at import
+DETECTOR_CASES = [
+    ("Purchase - Direct", Decimal(100), TransactionType.PURCHASE),
+    ("New Investment", Decimal(50), TransactionType.PURCHASE),
+    ("Redemption", Decimal(-100), TransactionType.REDEMPTION),
+    ("Partial Withdrawal", Decimal(-50), TransactionType.REDEMPTION),
+    ("Systematic Investment Plan", Decimal(100), TransactionType.SIP),
+    ("SIP - Monthly", Decimal(50), TransactionType.SIP),
+    ("Switch In from HDFC Equity", Decimal(100), TransactionType.SWITCH_IN),
+    ("Switched In", Decimal(50), TransactionType.SWITCH_IN),
+    ("Switch Out to HDFC Bond", Decimal(-100), TransactionType.SWITCH_OUT),
+    ("Switched Out", Decimal(-50), TransactionType.SWITCH_OUT),
+    ("Dividend Reinvested", Decimal(10), TransactionType.DIVIDEND_REINVESTMENT),
+    ("Div. Reinv.", Decimal(5), TransactionType.DIVIDEND_REINVESTMENT),
+    ("Dividend Payout", Decimal(0), TransactionType.DIVIDEND_PAYOUT),
+    ("STT Paid", Decimal("-0.01"), TransactionType.STT),
+    ("Securities Transaction Tax", Decimal(0), TransactionType.STT),
+    ("Stamp Duty", Decimal("-0.05"), TransactionType.STAMP_DUTY),
+    ("Exit Load Charges", Decimal(-10), TransactionType.CHARGES),
+    ("Segregated Portfolio Allotment", Decimal(50), TransactionType.SEGREGATED_PORTFOLIO),
+    # The keyword guard must not reject text the pattern accepts
+    ("Charge", Decimal(-1), TransactionType.CHARGES),
+    ("Seg. Portfolio", Decimal(50), TransactionType.SEGREGATED_PORTFOLIO),
+    # Unknown descriptions fall back to the sign of the units
+    ("Unknown Transaction Type", Decimal(100), TransactionType.PURCHASE),
+    ("Unknown Transaction Type", Decimal(-100), TransactionType.REDEMPTION),
+]
+
+# (line, expected date); shapes rank by pattern order, not position
+EXTRACT_DATE_CASES = [
+    ("15-Jan-2024 Purchase", date(2024, 1, 15)),
+    ("31/12/2023 Purchase", date(2023, 12, 31)),
+    ("2023-06-30 Purchase", date(2023, 6, 30)),
+    ("31/12/2023 switched on 15-Jan-2024", date(2024, 1, 15)),
+    ("32-Jan-2024 31/12/2023", date(2023, 12, 31)),
+    ("1999-02-01 Purchase", None),
+    ("No date here", None),
+]
+
+CLASSIFY_CASES = [
+    ("Purchase - Regular", Decimal(100), TransactionType.PURCHASE),
+    ("Redemption", Decimal(-100), TransactionType.REDEMPTION),
+    ("SIP", Decimal(50), TransactionType.SIP),
+    ("Switch In", Decimal(75), TransactionType.SWITCH_IN),
+    ("Switch Out", Decimal(-75), TransactionType.SWITCH_OUT),
+]
+
+
+class _CountingPattern:
+    """Compiled-pattern stand-in that records each search() call."""
+
+    def __init__(self, pattern, name, calls):
+        self._pattern = pattern
+        self._name = name
+        self._calls = calls
+
+    def search(self, line):
+        self._calls.append((self._name, line))
+        return self._pattern.search(line)
+
+    def __getattr__(self, attr):
+        return getattr(self._pattern, attr)
+
+
+@pytest.fixture(scope="class")
+def detector():
+    """TransactionTypeDetector shared by a test class; it keeps no state."""
+    return TransactionTypeDetector()
 
-    def test_detect_segregated_portfolio(self):
-        """Test detecting segregated portfolio entries."""
-        detector = TransactionTypeDetector()
 
-        result = detector.detect("Segregated Portfolio Allotment", Decimal("50"))
-        assert result == TransactionType.SEGREGATED_PORTFOLIO
-
-    def test_fallback_to_units_sign(self):
-        """Test fallback detection based on units sign."""
-        detector = TransactionTypeDetector()
-
-        # Unknown description with positive units
-        result = detector.detect("Unknown Transaction Type", Decimal("100"))
-        assert result == TransactionType.PURCHASE
+class TestTransactionTypeDetector:
+    """Tests for transaction type detection."""
 
-        # Unknown description with negative units
-        result = detector.detect("Unknown Transaction Type", Decimal("-100"))
-        assert result == TransactionType.REDEMPTION
+    @pytest.mark.parametrize("description,units,expected", DETECTOR_CASES)
+    def test_detect(self, detector, description, units, expected):
+        """Test detecting the transaction type from description and units."""
+        assert detector.detect(description, units) == expected
+
+    def test_trigger_keywords_cover_every_pattern(self):
+        """Each pattern's keyword contains a trigger, so no match is rejected."""
+        for _, patterns in TransactionTypeDetector.TYPE_PATTERNS:
+            for pattern in patterns:
+                keyword = _leading_keyword(pattern)
+                assert any(
+                    trigger in keyword
+                    for trigger in TransactionTypeDetector.TRIGGER_KEYWORDS
+                ), pattern
+
+    def test_memoized_match_keeps_units_fallback(self, detector):
+        """A cached no-match still falls back on each call's units sign."""
+        description = "Opening Balance Carried Forward"
+        assert detector.detect(description, Decimal(5)) == TransactionType.PURCHASE
+        hits = TransactionTypeDetector._match_description.cache_info().hits
+        assert detector.detect(description, Decimal(-5)) == TransactionType.REDEMPTION
+        assert TransactionTypeDetector._match_description.cache_info().hits == hits + 1
+
+
+    @pytest.mark.parametrize("pattern,keyword", [
+        (r"\bsip\b", "sip"),
+        (r"charges?", "charge"),
+        (r"div\.\s*reinv", "div."),
+        (r"systematic\s*transfer.*in", "systematic"),
+    ])
+    def test_leading_keyword(self, pattern, keyword):
+        """The guard keyword is the literal text every match starts with."""
+        assert _leading_keyword(pattern) == keyword
 
 
 class TestTransactionsParser:
@@ -152,6 +148,19 @@ class TestTransactionsParser:
         d = parser._extract_date("15-Jan-2024 Purchase")
         assert d == date(2024, 1, 15)
 
+    @pytest.mark.parametrize("line,expected", EXTRACT_DATE_CASES)
+    def test_extract_date(self, line, expected):
+        """Dates in any supported shape are found, preferring DD-Mon-YYYY."""
+        assert TransactionsParser()._extract_date(line) == expected
+
+    def test_extract_date_caches_by_token(self):
+        """Different lines carrying the same date share one cache entry."""
+        parser = TransactionsParser()
+        assert parser._extract_date("15-Mar-2031 Purchase") == date(2031, 3, 15)
+        hits = TransactionsParser._parse_date_token.cache_info().hits
+        assert parser._extract_date("15-Mar-2031 Redemption") == date(2031, 3, 15)
+        assert TransactionsParser._parse_date_token.cache_info().hits == hits + 1
+
     def test_parse_multiple_transactions(self):
         """Test parsing multiple transactions."""
         lines = [
@@ -184,6 +193,57 @@ class TestTransactionsParser:
             assert transactions[0].isin == "INF179K01234" or transactions[0].folio == "12345678"
 
 
+    def test_parse_accepts_line_iterator(self):
+        """Lines can be streamed; results match parsing the same list."""
+        lines = [
+            "Fund Name INF179K01234",
+            "Folio: 12345",
+            "15-Jan-2024 Purchase 10000.00 219.123 45.67 219.123",
+            "20-Jan-2024 SIP 5000.00 109.321 45.76 328.444",
+            "25-Jan-2024 Redemption -5000.00 -109.000 45.87 219.444",
+        ]
+        assert parse_transactions(iter(lines)) == parse_transactions(lines)
+
+    @pytest.mark.parametrize("count", [0, 1, 2, 3, 5])
+    def test_lookahead_windows(self, count):
+        """Every line is yielded once, with up to two following lines."""
+        lines = [str(n) for n in range(count)]
+        assert list(_lookahead_windows(iter(lines), 3)) == [
+            tuple(lines[n:n + 3]) for n in range(count)
+        ]
+
+    def test_each_line_scanned_once_for_folio_and_isin(self, monkeypatch):
+        """parse() searches each line for a folio and an ISIN at most once."""
+        lines = [
+            "HDFC Equity Fund - Growth INF179K01234",
+            "Folio No: 12345678",
+            "15-Jan-2024 Purchase 10,000.00 219.123 45.67 219.123",
+            "Page 1 of 2",
+        ]
+        parser = TransactionsParser()
+        searched = []
+        for name in ("FOLIO_PATTERN", "ISIN_PATTERN"):
+            pattern = getattr(TransactionsParser, name)
+            monkeypatch.setattr(parser, name, _CountingPattern(pattern, name, searched))
+        parser.parse(lines)
+        assert len(searched) == len(set(searched))
+        assert {line for name, line in searched if name == "FOLIO_PATTERN"} == set(lines)
+
+    def test_context_strings_shared_across_parses(self):
+        """Folio, ISIN and scheme strings are interned, not copied per parse."""
+        lines = [
+            "HDFC Equity Fund - Growth INF179K01234",
+            "Folio No: 12345678",
+            "15-Jan-2024 Purchase 10,000.00 219.123 45.67 219.123",
+        ]
+        # Fresh copies of the lines, so nothing is shared by construction
+        first = parse_transactions(lines)[0]
+        second = parse_transactions(["".join(list(line)) for line in lines])[0]
+        assert first.folio is second.folio
+        assert first.isin is second.isin
+        assert first.scheme_name is second.scheme_name
+
+
 class TestEdgeCases:
     """Test edge cases in transaction parsing."""
 
@@ -268,16 +328,7 @@ class TestEdgeCases:
 class TestClassifyTransaction:
     """Tests for classify_transaction helper function."""
 
-    def test_classify_various_types(self):
+    @pytest.mark.parametrize("description,units,expected", CLASSIFY_CASES)
+    def test_classify_various_types(self, description, units, expected):
         """Test classifying various transaction descriptions."""
-        test_cases = [
-            ("Purchase - Regular", Decimal("100"), TransactionType.PURCHASE),
-            ("Redemption", Decimal("-100"), TransactionType.REDEMPTION),
-            ("SIP", Decimal("50"), TransactionType.SIP),
-            ("Switch In", Decimal("75"), TransactionType.SWITCH_IN),
-            ("Switch Out", Decimal("-75"), TransactionType.SWITCH_OUT),
-        ]
-
-        for description, units, expected_type in test_cases:
-            result = classify_transaction(description, units)
-            assert result == expected_type, f"Failed for: {description}"
+        assert classify_transaction(description, units) == expected
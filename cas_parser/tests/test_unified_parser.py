@@ -0,0 +1,215 @@
+"""Tests for the unified (interleaved holdings/transactions) CAS parser."""
+
+import logging
+from decimal import Decimal
+
+import pytest
+
+from cas_parser.models import TransactionType
+from cas_parser import unified_parser
+from cas_parser.unified_parser import UnifiedCASParser
+
+# One scheme section in the interleaved CAMS/KFintech layout
+SAMPLE_LINES = [
+    "Consolidated Account Statement",
+    "Email Id: investor@example.com",
+    "Mobile: +919876543210",
+    "Axis Mutual Fund",
+    "Folio No: 12345 / 67 PAN: ABCDE1234F",
+    "B205RG-Axis Bluechip Fund - Direct Plan - Growth - ISIN: INF846K01DP8 Registrar : CAMS",
+    "15-Jan-2024 Purchase 9,999.50 198.442 50.3900 198.442",
+    "15-Jan-2024 *** Stamp Duty *** 0.50",
+    "Closing Unit Balance: 198.442 NAV on 31-Jan-2024: INR 51.2000 "
+    "Total Cost Value: 9,999.50 Market Value on 31-Jan-2024: INR 10,160.23",
+]
+
+# (line, expected kind from LINE_START_PATTERN)
+LINE_START_CASES = [
+    ("Axis Mutual Fund", "amc"),
+    ("HDFC MF", "amc"),
+    ("icici prudential mutual fund", "amc"),
+    ("SBI MUTUAL FUND", "amc"),
+    ("Quant mf", "amc"),
+    ("15-Jan-2024 Purchase 100.00", "date"),
+    ("15-jan-2024 Purchase 100.00", "date"),
+    ("Some Mutual Fund Ltd", None),
+    ("5-Jan-2024 Purchase", None),
+    ("Folio No: 12345", None),
+]
+
+# (line, folio as parse() stores it, or None when the line is not a folio line)
+FOLIO_CASES = [
+    ("Folio No: 12345 / 67 PAN: ABCDE1234F", "12345/67"),
+    ("Folio No : 999 888", "999888"),
+    ("folio no:ABC1 KYC : OK", "ABC1"),
+    ("Folio No: 123KYC", "123KYC"),
+    ("Folio No:  PAN: ABCDE1234F", ""),
+    ("Folio No: PAN: ABCDE1234F", None),
+    ("Folio No: 123-45 PAN", None),
+    # Long blank runs used to backtrack cubically; now rejected in linear time
+    ("Folio No:" + " " * 2000 + "-", None),
+    ("Folio No: 1" + " " * 2000 + "-", None),
+]
+
+
+@pytest.fixture
+def parsed():
+    """Investor, holdings, transactions and parser for SAMPLE_LINES."""
+    parser = UnifiedCASParser()
+    investor, holdings, transactions = parser.parse(SAMPLE_LINES)
+    return investor, holdings, transactions, parser
+
+
+class TestUnifiedParse:
+    """Tests for UnifiedCASParser.parse()."""
+
+    @pytest.mark.parametrize("line,kind", LINE_START_CASES)
+    def test_line_start_kind(self, line, kind):
+        """Anchored dispatch tells AMC headers from transaction dates."""
+        match = UnifiedCASParser.LINE_START_PATTERN.match(line)
+        assert (match.lastgroup if match else None) == kind
+
+    @pytest.mark.parametrize("line,folio", FOLIO_CASES)
+    def test_folio_pattern(self, line, folio):
+        """Folio numbers are read up to KYC/PAN or the end of the line."""
+        match = UnifiedCASParser.FOLIO_PATTERN.search(line)
+        found = match.group(1).strip().replace(" ", "") if match else None
+        assert found == folio
+
+    def test_scheme_section(self, parsed):
+        """Context from AMC/folio/ISIN lines is stamped on every row."""
+        investor, holdings, transactions, parser = parsed
+        assert investor.pan == "ABCDE1234F"
+        assert investor.email == "investor@example.com"
+        assert parser.context.amc == "Axis Mutual Fund"
+
+        assert len(holdings) == 1
+        holding = holdings[0]
+        assert holding.isin == "INF846K01DP8"
+        assert holding.folio == "12345/67"
+        assert holding.scheme_name == "Axis Bluechip Fund - Direct Plan - Growth"
+        assert holding.units == Decimal("198.442")
+        assert holding.current_value == Decimal("10160.23")
+
+        assert [t.transaction_type for t in transactions] == [
+            TransactionType.PURCHASE,
+            TransactionType.STAMP_DUTY,
+        ]
+        assert all(t.isin == "INF846K01DP8" for t in transactions)
+        assert transactions[0].amount == Decimal("9999.50")
+
+    @pytest.mark.parametrize("folio_line", ["FOLIO NO: 777", "FOLİO No: 777", "folıo no: 777"])
+    def test_folio_gate_keeps_case_folding(self, folio_line):
+        """The literal pre-check accepts every spelling FOLIO_PATTERN does."""
+        parser = UnifiedCASParser()
+        parser.parse([folio_line])
+        assert parser.context.folio == "777"
+
+    def test_investor_fields_wrapped_across_lines(self):
+        """Labels and values split over two header lines are still read."""
+        investor = UnifiedCASParser()._parse_investor([
+            "PAN:",
+            "ABCDE1234F Email Id:",
+            "Investor@Example.com Mobile:",
+            "+919876543210",
+            "RAHUL KUMAR",
+            "SHARMA",
+        ])
+        assert investor.email == "investor@example.com"
+        assert investor.mobile == "919876543210"
+        assert investor.pan == "ABCDE1234F"
+        assert investor.name == "RAHUL KUMAR SHARMA"
+
+    def test_debug_log_written_through_one_handle(self, tmp_path, monkeypatch, capsys):
+        """Debug mode logs every scheme to one file, closed when parse ends."""
+        log_path = tmp_path / "debug.log"
+        monkeypatch.setattr(unified_parser, "_DEBUG_LOG_PATH", str(log_path))
+        parser = UnifiedCASParser()
+        parser.DEBUG_EXTRACTION = True
+        parser.parse(SAMPLE_LINES)
+
+        assert parser._debug_log is None
+        log = log_path.read_text()
+        assert log.startswith("=== CAS Parser Debug Log ===")
+        assert "ISIN EXTRACTION DEBUG for: INF846K01DP8" in log
+        assert "ISIN EXTRACTION DEBUG" in capsys.readouterr().out
+
+    def test_debug_log_closed_when_parse_raises(self, tmp_path, monkeypatch):
+        """A line that raises mid-parse still closes and resets the debug log."""
+        monkeypatch.setattr(unified_parser, "_DEBUG_LOG_PATH", str(tmp_path / "debug.log"))
+        parser = UnifiedCASParser()
+        parser.DEBUG_EXTRACTION = True
+        opened = []
+        real_open = open
+
+        def tracking_open(*args, **kwargs):
+            handle = real_open(*args, **kwargs)
+            opened.append(handle)
+            return handle
+
+        def broken_line(line):
+            raise ValueError(line)
+
+        monkeypatch.setattr(unified_parser, "open", tracking_open, raising=False)
+        monkeypatch.setattr(parser, "_parse_transaction_line", broken_line)
+        with pytest.raises(ValueError):
+            parser.parse(SAMPLE_LINES)
+
+        assert parser._debug_log is None
+        assert [handle.closed for handle in opened] == [True]
+
+    def test_truncated_isin_recovered_from_later_line(self, parsed):
+        """A partial ISIN is completed by the first later line carrying it."""
+        parser = parsed[3]
+        _, holdings, transactions = parser.parse(SAMPLE_LINES[:5] + [
+            "Axis Bluechip Fund - Direct Plan - Growth - ISIN: INF846K",
+            "Opening Unit Balance: 0.000",
+            "INF846K01DP8",
+        ] + SAMPLE_LINES[6:])
+        assert parser.get_quarantine_items() == []
+        assert holdings[0].isin == "INF846K01DP8"
+        assert {t.isin for t in transactions} == {"INF846K01DP8"}
+
+    @pytest.mark.parametrize("level,summaries", [(logging.INFO, 1), (logging.WARNING, 0)])
+    def test_isin_summary_logged_once_per_isin(self, caplog, level, summaries):
+        """Holdings sharing an ISIN give one PARSED line and one conflict warning."""
+        renamed = SAMPLE_LINES[5].replace("Bluechip", "Large Cap")
+        closing = SAMPLE_LINES[-1]
+        lines = SAMPLE_LINES + [closing, renamed, closing, renamed, closing]
+        with caplog.at_level(level, logger="cas_parser.unified_parser"):
+            _, holdings, _ = UnifiedCASParser().parse(lines)
+
+        assert len(holdings) == 4
+        messages = [r.getMessage() for r in caplog.records]
+        assert sum(m.startswith("PARSED: ISIN=INF846K01DP8") for m in messages) == summaries
+        conflicts = [m for m in messages if m.startswith("ISIN CONFLICT")]
+        assert conflicts == [
+            "ISIN CONFLICT: INF846K01DP8 has 2 scheme names! "
+            "'Axis Bluechip Fund - Direct Plan - Growt' "
+            "vs 'Axis Large Cap Fund - Direct Plan - Grow'"
+        ]
+
+    def test_truncated_isin_quarantined(self, parsed):
+        """Rows under an ISIN that cannot be recovered go to quarantine."""
+        parser = parsed[3]
+        parser.parse(SAMPLE_LINES[:5] + [
+            "Unknown Scheme Direct Growth ISIN: INF84",
+            "15-Jan-2024 Purchase 9,999.50 198.442 50.3900 198.442",
+        ])
+        assert parser.transactions == []
+        [item] = parser.get_quarantine_items()
+        assert item["data_type"] == "transaction"
+        assert item["partial_isin"] == "INF84"
+        assert item["amc"] == "Axis Mutual Fund"
+        assert item["data"] == {
+            "scheme_name": "Unknown Scheme Direct Growth",
+            "folio": "12345/67",
+            "isin": "UNKNOWN_INF84",
+            "date": "2024-01-15",
+            "description": "Purchase",
+            "transaction_type": "purchase",
+            "amount": "9999.50",
+            "units": "198.442",
+            "nav": "50.3900",
+            "balance_units": "198.442",
+        }
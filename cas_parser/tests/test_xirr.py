@@ -1,68 +1,118 @@
 """Tests for XIRR calculation engine."""
 
+import ast
+import sys
 from datetime import date
+from pathlib import Path
 
 import pytest
 
-from cas_parser.webapp.xirr import _validate_amount, build_cashflows_for_folio, xirr
+from cas_parser.webapp import xirr as xirr_module
+from cas_parser.webapp.xirr import (
+    _bracket,
+    _brent,
+    _discount_terms,
+    _npv_and_deriv,
+    _npv_and_deriv_whole_years,
+    _solve_xirr,
+    _validate_amount,
+    build_cashflows_batch,
+    build_cashflows_for_folio,
+    xirr,
+    xirr_batch,
+)
+
+
+# (id, cashflows, expected rate, absolute tolerance)
+XIRR_VALUE_CASES = [
+    # Invest 10000, get back 11000 after 1 year => ~10% return
+    ("simple_positive_return",
+     [(date(2023, 1, 1), -10000), (date(2024, 1, 1), 11000)], 0.10, 0.01),
+    # Invest 10000, get back 9000 after 1 year => ~-10% return
+    ("simple_negative_return",
+     [(date(2023, 1, 1), -10000), (date(2024, 1, 1), 9000)], -0.10, 0.01),
+    # Invest 10000, doubles in 2 years => ~41.4% annualized
+    ("doubled_in_two_years",
+     [(date(2022, 1, 1), -10000), (date(2024, 1, 1), 20000)], 0.414, 0.02),
+    # 50% loss in 1 year => ~-50% return
+    ("significant_loss",
+     [(date(2023, 1, 1), -10000), (date(2024, 1, 1), 5000)], -0.50, 0.01),
+    # Very high return should still converge (~400%)
+    ("high_return",
+     [(date(2023, 1, 1), -1000), (date(2024, 1, 1), 5000)], 4.0, 0.1),
+]
+
+# (id, cashflows) that must solve to a positive return
+XIRR_POSITIVE_CASES = [
+    # Monthly SIP of 1000 for 12 months, terminal value 13000
+    ("sip_pattern",
+     [(date(2023, month, 1), -1000) for month in range(1, 13)]
+     + [(date(2024, 1, 1), 13000)]),
+    # Mix of investments and partial redemptions: net ~12000 in, 17000 back
+    ("multiple_investments_and_redemptions",
+     [(date(2023, 1, 1), -10000), (date(2023, 6, 1), -5000),
+      (date(2023, 9, 1), 3000), (date(2024, 1, 1), 14000)]),
+]
+
+# (id, cashflows) with no solution
+XIRR_NONE_CASES = [
+    ("empty", []),
+    ("single_cashflow", [(date(2023, 1, 1), -10000)]),
+    ("all_negative", [(date(2023, 1, 1), -1000), (date(2024, 1, 1), -2000)]),
+    ("all_positive", [(date(2023, 1, 1), 1000), (date(2024, 1, 1), 2000)]),
+]
+
+# (id, transaction, expected validated magnitude)
+VALIDATE_AMOUNT_CASES = [
+    # Amount >100x units*nav (54972 * 11 = 604692): use expected instead
+    ("corrupt_amount_overridden_by_units_nav",
+     {'amount': 949_000_000, 'units': 54972, 'nav': 11.0}, 604692),
+    # units*nav = 500000, ratio 1961/500000 < 0.01: units/NAV garbled
+    ("garbled_units_keeps_amount",
+     {'amount': 1961, 'units': 10000, 'nav': 50.0}, 1961),
+    ("negative_nav_keeps_amount",
+     {'amount': 5000, 'units': 100, 'nav': -5000}, 5000),
+    ("zero_units_keeps_amount", {'amount': 5000, 'units': 0, 'nav': 50.0}, 5000),
+    ("no_nav_keeps_amount", {'amount': 5000, 'units': 100}, 5000),
+    # units*nav = 5000, ratio 1.0
+    ("agreeing_amount_kept", {'amount': 5000, 'units': 100, 'nav': 50.0}, 5000),
+    ("returns_positive_magnitude",
+     {'amount': -5000, 'units': -100, 'nav': 50.0}, 5000),
+]
+
+
+def _ids(cases):
+    """Use each case's leading name as its pytest id."""
+    return [case[0] for case in cases]
 
 
 class TestXirr:
     """Tests for the xirr() function."""
 
-    def test_simple_positive_return(self):
-        """Invest 10000, get back 11000 after 1 year => ~10% return."""
-        cashflows = [
-            (date(2023, 1, 1), -10000),
-            (date(2024, 1, 1), 11000),
-        ]
-        result = xirr(cashflows)
-        assert result is not None
-        assert abs(result - 0.10) < 0.01
-
-    def test_simple_negative_return(self):
-        """Invest 10000, get back 9000 after 1 year => ~-10% return."""
-        cashflows = [
-            (date(2023, 1, 1), -10000),
-            (date(2024, 1, 1), 9000),
-        ]
+    @pytest.mark.parametrize(
+        "name,cashflows,expected,tol", XIRR_VALUE_CASES, ids=_ids(XIRR_VALUE_CASES)
+    )
+    def test_known_rate(self, name, cashflows, expected, tol):
+        """Simple cashflow patterns solve to their known annualized rate."""
         result = xirr(cashflows)
         assert result is not None
-        assert abs(result - (-0.10)) < 0.01
+        assert abs(result - expected) < tol
 
-    def test_sip_pattern(self):
-        """Monthly SIP of 1000 for 12 months, terminal value 13000."""
-        cashflows = []
-        for month in range(1, 13):
-            cashflows.append((date(2023, month, 1), -1000))
-        cashflows.append((date(2024, 1, 1), 13000))
+    @pytest.mark.parametrize(
+        "name,cashflows", XIRR_POSITIVE_CASES, ids=_ids(XIRR_POSITIVE_CASES)
+    )
+    def test_positive_return(self, name, cashflows):
+        """Getting back more than was invested gives a positive return."""
         result = xirr(cashflows)
         assert result is not None
-        # SIP of 12000 growing to 13000 in ~1 year should give positive return
         assert result > 0
 
-    def test_doubled_in_two_years(self):
-        """Invest 10000, doubles in 2 years => ~41.4% annualized."""
-        cashflows = [
-            (date(2022, 1, 1), -10000),
-            (date(2024, 1, 1), 20000),
-        ]
-        result = xirr(cashflows)
-        assert result is not None
-        assert abs(result - 0.414) < 0.02
-
-    def test_empty_cashflows(self):
-        """Empty list returns None."""
-        assert xirr([]) is None
-
-    def test_single_cashflow(self):
-        """Single cashflow returns None."""
-        assert xirr([(date(2023, 1, 1), -10000)]) is None
-
-    def test_same_sign_cashflows(self):
-        """All negative or all positive returns None."""
-        assert xirr([(date(2023, 1, 1), -1000), (date(2024, 1, 1), -2000)]) is None
-        assert xirr([(date(2023, 1, 1), 1000), (date(2024, 1, 1), 2000)]) is None
+    @pytest.mark.parametrize(
+        "name,cashflows", XIRR_NONE_CASES, ids=_ids(XIRR_NONE_CASES)
+    )
+    def test_no_solution(self, name, cashflows):
+        """Fewer than two flows, or flows all of one sign, return None."""
+        assert xirr(cashflows) is None
 
     def test_zero_terminal_value(self):
         """Near-total loss: XIRR is None (NPV never crosses zero) or very negative."""
@@ -74,38 +124,103 @@ class TestXirr:
         # With near-zero terminal value, NPV ~ -10000 for all rates, no solution
         assert result is None or result < -0.9
 
-    def test_significant_loss(self):
-        """50% loss in 1 year => ~-50% return."""
-        cashflows = [
+    def test_same_date_cashflows_merged(self):
+        """Flows on the same date give the same XIRR as their sum."""
+        split = [
+            (date(2023, 1, 1), -6000),
+            (date(2023, 1, 1), -4000),
+            (date(2024, 1, 1), 11000),
+        ]
+        combined = [
             (date(2023, 1, 1), -10000),
-            (date(2024, 1, 1), 5000),
+            (date(2024, 1, 1), 11000),
         ]
-        result = xirr(cashflows)
-        assert result is not None
-        assert abs(result - (-0.50)) < 0.01
+        assert xirr(split) == pytest.approx(xirr(combined))
 
-    def test_high_return(self):
-        """Very high return should still converge."""
+    def test_offsetting_same_date_cashflows(self):
+        """Flows that net to zero on every date leave no solution."""
         cashflows = [
-            (date(2023, 1, 1), -1000),
-            (date(2024, 1, 1), 5000),
+            (date(2023, 1, 1), -10000),
+            (date(2023, 1, 1), 10000),
         ]
-        result = xirr(cashflows)
-        assert result is not None
-        assert abs(result - 4.0) < 0.1  # ~400% return
+        assert xirr(cashflows) is None
 
-    def test_multiple_investments_and_redemptions(self):
-        """Mix of investments and partial redemptions."""
+    def test_two_flows_solved_exactly(self):
+        """A single investment and return has a closed-form exact rate."""
         cashflows = [
             (date(2023, 1, 1), -10000),
-            (date(2023, 6, 1), -5000),
-            (date(2023, 9, 1), 3000),
-            (date(2024, 1, 1), 14000),
+            (date(2024, 1, 1), 11000),
         ]
-        result = xirr(cashflows)
-        assert result is not None
-        # Net invested ~12000, got back 17000
-        assert result > 0
+        assert xirr(cashflows) == pytest.approx(0.10, abs=1e-12)
+
+    def test_two_flows_after_zero_net_first_date(self):
+        """A first date whose flows net to zero does not shift the closed form."""
+        txns = [
+            {'tx_date': '2022-01-03', 'tx_type': 'purchase', 'amount': 5000},
+            {'tx_date': '2022-01-03', 'tx_type': 'redemption', 'amount': -5000},
+            {'tx_date': '2023-01-03', 'tx_type': 'purchase', 'amount': 10000},
+        ]
+        cfs = build_cashflows_for_folio(txns, 11000.0, as_of_date=date(2024, 1, 3))
+        assert xirr(cfs) == pytest.approx(0.10, abs=1e-12)
+
+    def test_repeated_cashflows_hit_cache(self):
+        """Re-solving identical cashflows is served from the memo cache."""
+        cashflows = [
+            (date(2021, 3, 1), -7000),
+            (date(2023, 3, 1), 8000.001),
+        ]
+        first = xirr(cashflows)
+        hits = _solve_xirr.cache_info().hits
+        # Sub-paisa noise rounds to the same cache key
+        assert xirr([cashflows[0], (date(2023, 3, 1), 8000.0)]) == first
+        assert _solve_xirr.cache_info().hits == hits + 1
+
+    def test_batch_matches_individual_solves(self):
+        """xirr_batch returns one result per set, in input order."""
+        sets = [case[1] for case in XIRR_VALUE_CASES] + [[]]
+        assert xirr_batch(sets) == [xirr(cfs) for cfs in sets]
+
+    @pytest.mark.skipif(
+        sys.version_info < (3, 10), reason="sys.stdlib_module_names is 3.10+"
+    )
+    def test_engine_imports_stdlib_only(self):
+        """The engine stays free of scipy/numpy: only stdlib imports."""
+        tree = ast.parse(Path(xirr_module.__file__).read_text(encoding="utf-8"))
+        roots = set()
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                roots.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                roots.add(node.module.split(".")[0])
+        assert roots <= sys.stdlib_module_names
+
+
+class TestNpvKernels:
+    """Tests for the NPV + derivative kernels driving Newton-Raphson."""
+
+    @pytest.mark.parametrize("rate", [-0.5, 0.0, 0.1, 4.0])
+    def test_whole_year_kernel_matches_general(self, rate):
+        """The Horner kernel agrees with the exp/log1p kernel on whole years."""
+        year_fracs = [(-10000.0, 0.0), (-5000.0, 1.0), (3000.0, 2.0), (14000.0, 4.0)]
+        coeffs = [-10000.0, -5000.0, 3000.0, 0.0, 14000.0]
+        expected = _npv_and_deriv(_discount_terms(year_fracs), rate)
+        assert _npv_and_deriv_whole_years(coeffs, rate) == pytest.approx(expected)
+
+
+class TestBracketedFallback:
+    """Tests for the grid bracket + Brent fallback used when Newton fails."""
+
+    def test_brent_finds_root_in_bracket(self):
+        """Brent converges to the root inside a sign-change bracket."""
+        def f(r):
+            return r * r - 2.0
+        a, b, fa, fb = _bracket(f)
+        root = _brent(f, a, b, fa, fb, 1e-12, 100)
+        assert root == pytest.approx(2.0 ** 0.5, abs=1e-9)
+
+    def test_no_sign_change_gives_no_bracket(self):
+        """A function that never crosses zero is rejected up front."""
+        assert _bracket(lambda r: -10000.0) is None
 
 
 class TestBuildCashflows:
@@ -119,15 +234,10 @@ class TestBuildCashflows:
         assert cfs[0] == (date(2023, 1, 1), -10000)
         assert cfs[1] == (date(2024, 1, 1), 11000)
 
-    def test_sip_becomes_outflow(self):
-        """SIP with positive DB amount becomes negative cashflow."""
-        txns = [{'tx_date': '2023-01-01', 'tx_type': 'sip', 'amount': 5000}]
-        cfs = build_cashflows_for_folio(txns, 5500, as_of_date=date(2024, 1, 1))
-        assert cfs[0][1] == -5000
-
-    def test_switch_in_becomes_outflow(self):
-        """Switch-in treated as investment outflow."""
-        txns = [{'tx_date': '2023-01-01', 'tx_type': 'switch_in', 'amount': 5000}]
+    @pytest.mark.parametrize("tx_type", ["sip", "switch_in"])
+    def test_investment_becomes_outflow(self, tx_type):
+        """SIPs and switch-ins are investment outflows like purchases."""
+        txns = [{'tx_date': '2023-01-01', 'tx_type': tx_type, 'amount': 5000}]
         cfs = build_cashflows_for_folio(txns, 5500, as_of_date=date(2024, 1, 1))
         assert cfs[0][1] == -5000
 
@@ -163,47 +273,26 @@ class TestBuildCashflows:
         cfs = build_cashflows_for_folio(txns, 10000, as_of_date=date(2024, 1, 1))
         assert cfs[1] == (date(2023, 6, 1), 500)
 
-    def test_dividend_reinvestment_skipped(self):
-        """Dividend reinvestment is not an external cashflow."""
+    @pytest.mark.parametrize("tx_type,amount", [
+        ("dividend_reinvestment", 500),
+        ("stamp_duty", -1.5),
+        ("stt", -10),
+    ])
+    def test_non_external_types_skipped(self, tx_type, amount):
+        """Reinvestments and statutory charges are not external cashflows."""
         txns = [
             {'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000},
-            {'tx_date': '2023-06-01', 'tx_type': 'dividend_reinvestment', 'amount': 500},
+            {'tx_date': '2023-01-01', 'tx_type': tx_type, 'amount': amount},
         ]
         cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
         assert len(cfs) == 2  # Only purchase + terminal
 
-    def test_stamp_duty_skipped(self):
-        """Stamp duty is not an external cashflow."""
-        txns = [
-            {'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000},
-            {'tx_date': '2023-01-01', 'tx_type': 'stamp_duty', 'amount': -1.5},
-        ]
-        cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
-        assert len(cfs) == 2
-
-    def test_stt_skipped(self):
-        """STT is not an external cashflow."""
-        txns = [
-            {'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000},
-            {'tx_date': '2023-01-01', 'tx_type': 'stt', 'amount': -10},
-        ]
-        cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
-        assert len(cfs) == 2
-
-    def test_zero_amount_skipped(self):
-        """Transactions with zero amount are skipped."""
-        txns = [
-            {'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000},
-            {'tx_date': '2023-06-01', 'tx_type': 'purchase', 'amount': 0},
-        ]
-        cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
-        assert len(cfs) == 2
-
-    def test_none_amount_skipped(self):
-        """Transactions with None amount are skipped."""
+    @pytest.mark.parametrize("amount", [0, None])
+    def test_missing_amount_skipped(self, amount):
+        """Transactions with zero or None amount are skipped."""
         txns = [
             {'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000},
-            {'tx_date': '2023-06-01', 'tx_type': 'purchase', 'amount': None},
+            {'tx_date': '2023-06-01', 'tx_type': 'purchase', 'amount': amount},
         ]
         cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
         assert len(cfs) == 2
@@ -223,6 +312,15 @@ class TestBuildCashflows:
         cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
         assert cfs[0][0] == date(2023, 1, 15)
 
+    @pytest.mark.parametrize("tx_date", [
+        "2023-01-15", "15-01-2023", "15/01/2023", "15-Jan-2023",
+    ])
+    def test_date_string_formats(self, tx_date):
+        """ISO dates take the fast path; the other DB formats still parse."""
+        txns = [{'tx_date': tx_date, 'tx_type': 'purchase', 'amount': 10000}]
+        cfs = build_cashflows_for_folio(txns, 11000, as_of_date=date(2024, 1, 1))
+        assert cfs[0][0] == date(2023, 1, 15)
+
     def test_date_object_passthrough(self):
         """Handles date objects directly."""
         txns = [{'tx_date': date(2023, 1, 15), 'tx_type': 'purchase', 'amount': 10000}]
@@ -249,56 +347,30 @@ class TestBuildCashflows:
         assert result is not None
         assert result > 0  # 60000 invested, 65000 terminal
 
+    def test_batch_matches_per_folio_builds(self):
+        """build_cashflows_batch builds each folio as the single-folio call does."""
+        as_of = date(2024, 1, 1)
+        folios = [
+            ([{'tx_date': '2023-01-01', 'tx_type': 'purchase', 'amount': 10000}], 11000),
+            ([{'tx_date': '2023-06-01', 'tx_type': 'sip', 'amount': 5000}], 0),
+            ([], 10000),
+        ]
+        expected = [
+            build_cashflows_for_folio(txns, value, as_of_date=as_of)
+            for txns, value in folios
+        ]
+        assert build_cashflows_batch(folios, as_of_date=as_of) == expected
+
 
 class TestValidateAmount:
     """Tests for Tier 1: per-transaction cross-validation (_validate_amount)."""
 
-    def test_corrupt_amount_overridden_by_units_nav(self):
-        """When amount is >100x expected (units*nav), use expected instead."""
-        tx = {'amount': 949_000_000, 'units': 54972, 'nav': 11.0}
-        # expected = 54972 * 11 = 604692
-        # ratio = 949M / 604692 >> 100
-        result = _validate_amount(tx)
-        assert abs(result - 604692) < 1
-
-    def test_garbled_units_keeps_amount(self):
-        """When units/nav are garbled (ratio < 0.01), keep original amount."""
-        tx = {'amount': 1961, 'units': 10000, 'nav': 50.0}
-        # expected = 10000 * 50 = 500000
-        # ratio = 1961 / 500000 = 0.0039 < 0.01
-        result = _validate_amount(tx)
-        assert result == 1961
-
-    def test_negative_nav_keeps_amount(self):
-        """When NAV is negative, skip cross-check, keep amount."""
-        tx = {'amount': 5000, 'units': 100, 'nav': -5000}
-        result = _validate_amount(tx)
-        assert result == 5000
-
-    def test_zero_units_keeps_amount(self):
-        """When units are zero, skip cross-check, keep amount."""
-        tx = {'amount': 5000, 'units': 0, 'nav': 50.0}
-        result = _validate_amount(tx)
-        assert result == 5000
-
-    def test_no_nav_keeps_amount(self):
-        """When NAV is missing, skip cross-check, keep amount."""
-        tx = {'amount': 5000, 'units': 100}
-        result = _validate_amount(tx)
-        assert result == 5000
-
-    def test_agreeing_amount_kept(self):
-        """When amount and units*nav agree (ratio ~1), keep amount."""
-        tx = {'amount': 5000, 'units': 100, 'nav': 50.0}
-        # expected = 5000, ratio = 1.0
-        result = _validate_amount(tx)
-        assert result == 5000
-
-    def test_returns_positive_magnitude(self):
-        """Always returns positive magnitude regardless of sign."""
-        tx = {'amount': -5000, 'units': -100, 'nav': 50.0}
-        result = _validate_amount(tx)
-        assert result == 5000
+    @pytest.mark.parametrize(
+        "name,tx,expected", VALIDATE_AMOUNT_CASES, ids=_ids(VALIDATE_AMOUNT_CASES)
+    )
+    def test_validate_amount(self, name, tx, expected):
+        """Amount is kept as a magnitude unless units × NAV overrule it."""
+        assert _validate_amount(tx) == expected
 
 
 class TestTier2OutlierRemoval:
@@ -8,21 +8,94 @@ dividends, STT, and segregated portfolio entries.
 
 import logging
 import re
+import sys
+from collections import deque
 from dataclasses import dataclass, field
-from datetime import date, datetime
+from datetime import date
 from decimal import Decimal, InvalidOperation
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from cas_parser.models import Transaction, TransactionType
 
 logger = logging.getLogger(__name__)
 
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Clean-up patterns for scheme names and descriptions, compiled once
+_DECIMAL_NUMBER = re.compile(r"\d{1,3}(?:,\d{3})*\.\d+")
+_WORD_DECIMAL_NUMBER = re.compile(r"\b\d{1,3}(?:,\d{3})*\.\d+\b")
+_WORD_GROUPED_NUMBER = re.compile(r"\b\d{1,3}(?:,\d{3})+\b")
+_REGISTRAR_SUFFIX = re.compile(r"(?i)registrar\s*:.*")
+_CURRENCY = re.compile(r"(?:Rs\.?|INR|₹)")
+_WHITESPACE = re.compile(r"\s+")
+_LEADING_SEPARATOR = re.compile(r"^[-:]+\s*")
+_LEADING_DASH = re.compile(r"^[-–—:]+\s*")
+_TRAILING_DASH = re.compile(r"\s*[-–—:]+$")
+
+# Decimal number with optional minus, or parenthesized for negatives; the
+# second group is the 2-4 decimal places that the value heuristics key on
+_SIGNED_NUMBER = re.compile(r"(\(?\-?\d{1,3}(?:,\d{3})*\.(\d{2,4})\)?)")
+_NO_COMMA = str.maketrans("", "", ",")
+
+# Decimal thresholds used per transaction, built once
+_ZERO = Decimal(0)
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
+_NAV_MAX = Decimal(100000)
+_ONE_PERCENT = Decimal("0.01")
+
+
+_MONTHS = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12,
+}
+
+
+def _date_from_dmy_mon(text: str) -> date:
+    """Build a date from DD-Mon-YYYY without strptime; invalid days raise ValueError."""
+    day, month, year = text.split("-")
+    return date(int(year), _MONTHS[month], int(day))
+
+
+def _date_from_dmy_num(text: str) -> date:
+    """Build a date from DD/MM/YYYY without strptime; invalid dates raise ValueError."""
+    day, month, year = text.split("/")
+    return date(int(year), int(month), int(day))
+
+
+def _lookahead_windows(lines: Iterable[str], size: int) -> Iterator[Tuple[str, ...]]:
+    """
+    Yield each line together with up to size - 1 lines that follow it.
+
+    Lines are read once, holding at most size of them at a time.
+    """
+    window: Deque[str] = deque(maxlen=size)
+    for line in lines:
+        window.append(line)
+        if len(window) == size:
+            yield tuple(window)
+    # Lines not yet yielded first: all of them if fewer than size were read
+    remaining = tuple(window)
+    for start in range(0 if len(remaining) < size else 1, len(remaining)):
+        yield remaining[start:]
+
+
+def _signed_decimal(text: str, negate: bool) -> Decimal:
+    """Decimal for a comma-free number, negated when it was parenthesized."""
+    value = Decimal(text)
+    return -value if negate else value
+
+
+@dataclass(**_SLOTS)
 class TransactionContext:
     """
     Context maintained during transaction parsing.
 
+    Scheme, folio and ISIN strings are interned as they are set, so every
+    Transaction of a scheme shares one copy of each.
+
     Attributes:
         current_scheme: Current scheme name being parsed
         current_folio: Current folio number
@@ -35,6 +108,38 @@ class TransactionContext:
     current_amc: Optional[str] = None
 
 
+_KEYWORD_PREFIX = re.compile(r"(?:\\b)?((?:[a-z]|\\\.)+)([?*{]?)")
+
+
+def _leading_keyword(pattern: str) -> str:
+    """
+    Return the literal text every match of a type pattern starts with.
+
+    Used as a cheap substring guard before running the regex, so it must
+    never reject text the pattern would match: a character made optional
+    by a following quantifier is left out.
+    """
+    match = _KEYWORD_PREFIX.match(pattern)
+    if not match:
+        return ""
+    keyword = match.group(1).replace("\\", "")
+    return keyword[:-1] if match.group(2) else keyword
+
+
+def _shortest_keywords(keywords: List[str]) -> Tuple[str, ...]:
+    """
+    Drop keywords that contain another keyword.
+
+    Any text containing the longer keyword also contains the shorter one,
+    so the shorter one alone decides whether some keyword is present.
+    """
+    unique = list(dict.fromkeys(keywords))
+    return tuple(
+        keyword for keyword in unique
+        if not any(other != keyword and other in keyword for other in unique)
+    )
+
+
 class TransactionTypeDetector:
     """
     Detects transaction type from description text.
@@ -43,87 +148,100 @@ class TransactionTypeDetector:
     transactions into appropriate types.
     """
 
-    # Transaction type patterns (order matters - more specific first)
+    # Transaction type patterns (order matters - more specific first).
+    # Written in lowercase: detect() lowercases the description once, so
+    # no pattern needs case-insensitive matching.
     TYPE_PATTERNS: List[Tuple[TransactionType, List[str]]] = [
         (TransactionType.SIP, [
-            r"(?i)systematic\s*investment",
-            r"(?i)\bSIP\b",
-            r"(?i)auto\s*debit",
+            r"systematic\s*investment",
+            r"\bsip\b",
+            r"auto\s*debit",
         ]),
         (TransactionType.STP_IN, [
-            r"(?i)STP\s*-?\s*in",
-            r"(?i)systematic\s*transfer.*in",
+            r"stp\s*-?\s*in",
+            r"systematic\s*transfer.*in",
         ]),
         (TransactionType.STP_OUT, [
-            r"(?i)STP\s*-?\s*out",
-            r"(?i)systematic\s*transfer.*out",
+            r"stp\s*-?\s*out",
+            r"systematic\s*transfer.*out",
         ]),
         (TransactionType.SWITCH_IN, [
-            r"(?i)switch\s*-?\s*in",
-            r"(?i)switched\s*in",
-            r"(?i)switch\s*from",
+            r"switch\s*-?\s*in",
+            r"switched\s*in",
+            r"switch\s*from",
         ]),
         (TransactionType.SWITCH_OUT, [
-            r"(?i)switch\s*-?\s*out",
-            r"(?i)switched\s*out",
-            r"(?i)switch\s*to",
+            r"switch\s*-?\s*out",
+            r"switched\s*out",
+            r"switch\s*to",
         ]),
         (TransactionType.DIVIDEND_REINVESTMENT, [
-            r"(?i)dividend\s*reinvest",
-            r"(?i)reinvest.*dividend",
-            r"(?i)div\.\s*reinv",
+            r"dividend\s*reinvest",
+            r"reinvest.*dividend",
+            r"div\.\s*reinv",
         ]),
         (TransactionType.DIVIDEND_PAYOUT, [
-            r"(?i)dividend\s*payout",
-            r"(?i)dividend\s*pay",
-            r"(?i)div\.\s*payout",
+            r"dividend\s*payout",
+            r"dividend\s*pay",
+            r"div\.\s*payout",
         ]),
         (TransactionType.STT, [
-            r"(?i)\bSTT\b",
-            r"(?i)securities\s*transaction\s*tax",
+            r"\bstt\b",
+            r"securities\s*transaction\s*tax",
         ]),
         (TransactionType.STAMP_DUTY, [
-            r"(?i)stamp\s*duty",
+            r"stamp\s*duty",
         ]),
         (TransactionType.CHARGES, [
-            r"(?i)exit\s*load",
-            r"(?i)expense\s*ratio",
-            r"(?i)management\s*fee",
-            r"(?i)charges?",
+            r"exit\s*load",
+            r"expense\s*ratio",
+            r"management\s*fee",
+            r"charges?",
         ]),
         (TransactionType.SEGREGATED_PORTFOLIO, [
-            r"(?i)segregat",
-            r"(?i)seg\.\s*portfolio",
+            r"segregat",
+            r"seg\.\s*portfolio",
         ]),
         (TransactionType.BONUS, [
-            r"(?i)bonus",
+            r"bonus",
         ]),
         (TransactionType.TRANSFER_IN, [
-            r"(?i)transfer\s*-?\s*in",
-            r"(?i)transmission",
+            r"transfer\s*-?\s*in",
+            r"transmission",
         ]),
         (TransactionType.TRANSFER_OUT, [
-            r"(?i)transfer\s*-?\s*out",
+            r"transfer\s*-?\s*out",
         ]),
         (TransactionType.REDEMPTION, [
-            r"(?i)redemption",
-            r"(?i)redeem",
-            r"(?i)withdrawal",
+            r"redemption",
+            r"redeem",
+            r"withdrawal",
         ]),
         (TransactionType.PURCHASE, [
-            r"(?i)purchase",
-            r"(?i)subscription",
-            r"(?i)new\s*investment",
-            r"(?i)additional\s*purchase",
+            r"purchase",
+            r"subscription",
+            r"new\s*investment",
+            r"additional\s*purchase",
         ]),
     ]
 
-    def __init__(self):
-        """Initialize the type detector with compiled patterns."""
-        self.compiled_patterns: List[Tuple[TransactionType, List[re.Pattern]]] = [
-            (tx_type, [re.compile(p) for p in patterns])
-            for tx_type, patterns in self.TYPE_PATTERNS
-        ]
+    # Compiled once at import and shared by every detector, since
+    # classify_transaction() creates a fresh detector per call. One
+    # alternation per type, so each type costs a single search, guarded by
+    # the literal words at least one of its patterns needs.
+    COMPILED_PATTERNS: List[Tuple[TransactionType, re.Pattern, Tuple[str, ...]]] = [
+        (
+            tx_type,
+            re.compile("|".join(patterns)),
+            tuple(dict.fromkeys(_leading_keyword(p) for p in patterns)),
+        )
+        for tx_type, patterns in TYPE_PATTERNS
+    ]
+    # Descriptions without any of these (mostly scheme names and headers)
+    # match no type, so they skip the per-type checks entirely
+    TRIGGER_KEYWORDS: Tuple[str, ...] = _shortest_keywords(
+        [keyword for _, _, keywords in COMPILED_PATTERNS for keyword in keywords]
+    )
 
     def detect(self, description: str, units: Decimal) -> TransactionType:
         """
@@ -136,13 +254,9 @@ class TransactionTypeDetector:
         Returns:
             Detected TransactionType.
         """
-        description = description.strip()
-
-        # Check pattern matches
-        for tx_type, patterns in self.compiled_patterns:
-            for pattern in patterns:
-                if pattern.search(description):
-                    return tx_type
+        tx_type = self._match_description(description)
+        if tx_type is not None:
+            return tx_type
 
         # Fallback based on units sign
         if units < 0:
@@ -152,6 +266,27 @@ class TransactionTypeDetector:
 
         return TransactionType.UNKNOWN
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _match_description(description: str) -> Optional[TransactionType]:
+        """First type whose patterns match the description (memoized; rows repeat)."""
+        description = description.strip().lower()
+        for keyword in TransactionTypeDetector.TRIGGER_KEYWORDS:
+            if keyword in description:
+                break
+        else:
+            return None
+
+        # Check pattern matches, skipping the regex for any type none of
+        # whose keywords occur (a plain substring test is far cheaper)
+        for tx_type, pattern, keywords in TransactionTypeDetector.COMPILED_PATTERNS:
+            for keyword in keywords:
+                if keyword in description:
+                    if pattern.search(description):
+                        return tx_type
+                    break
+        return None
+
 
 class TransactionsParser:
     """
@@ -171,15 +306,22 @@ class TransactionsParser:
         re.compile(r"(\d{2}/\d{2}/\d{4})"),
         re.compile(r"(\d{4}-\d{2}-\d{2})"),
     ]
+    # Date builder for each DATE_PATTERNS entry, by DATE_ANY_PATTERN group
+    DATE_PARSERS = {
+        "dmy_mon": _date_from_dmy_mon,
+        "dmy_num": _date_from_dmy_num,
+        "ymd": date.fromisoformat,
+    }
+    # All of DATE_PATTERNS in one scan; lastgroup names the shape found
+    DATE_ANY_PATTERN = re.compile(
+        r"(?P<dmy_mon>\d{2}-(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)-\d{4})"
+        r"|(?P<dmy_num>\d{2}/\d{2}/\d{4})"
+        r"|(?P<ymd>\d{4}-\d{2}-\d{2})"
+    )
     ISIN_PATTERN = re.compile(r"\b(INF[A-Z0-9]{9})\b")
     FOLIO_PATTERN = re.compile(
         r"(?i)folio\s*(?:no\.?|number)?\s*:?\s*([A-Z0-9/]+(?:\s*/\s*[A-Z0-9]+)?)"
     )
-    AMOUNT_PATTERN = re.compile(
-        r"(?:Rs\.?|INR|₹)?\s*(-?\d{1,3}(?:,\d{3})*(?:\.\d{2})?)"
-    )
-    UNITS_PATTERN = re.compile(r"(-?\d{1,3}(?:,\d{3})*\.\d{3,4})")
-    NAV_PATTERN = re.compile(r"(\d{1,3}(?:,\d{3})*\.\d{2,4})")
     BALANCE_PATTERN = re.compile(r"(?:balance|bal\.?)\s*:?\s*(\d+\.\d{3,4})", re.IGNORECASE)
 
     def __init__(self):
@@ -187,10 +329,17 @@ class TransactionsParser:
         self.context = TransactionContext()
         self.type_detector = TransactionTypeDetector()
 
-    def parse(self, lines: List[str]) -> List[Transaction]:
+    def parse(self, lines: Iterable[str]) -> List[Transaction]:
         """
         Parse transactions from the transaction section lines.
 
+        Lines are read once, in order, so any iterable works. Only the
+        current line and the two after it are held, which is all a
+        transaction's values can span.
+
+        Runs in a single process: a whole statement parses in milliseconds,
+        less than starting a worker pool and pickling Transactions back.
+
         Args:
             lines: Text lines from the transaction section.
 
@@ -200,72 +349,91 @@ class TransactionsParser:
         self.context = TransactionContext()
         transactions: List[Transaction] = []
 
-        logger.info(f"Parsing transactions from {len(lines)} lines")
+        line_count = 0
+        skip = 0
+        for window in _lookahead_windows(lines, 3):
+            line_count += 1
+            if skip:
+                # Already consumed by the previous transaction block
+                skip -= 1
+                continue
 
-        i = 0
-        while i < len(lines):
-            line = lines[i]
+            line = window[0]
+            folio, isin, tx_date = self._classify_line(line)
 
             # Update context from header lines
-            self._update_context(line)
+            self._update_context(folio, isin)
 
-            # Check for ISIN (new scheme section)
-            isin_match = self.ISIN_PATTERN.search(line)
-            if isin_match:
-                self.context.current_isin = isin_match.group(1)
-                # Extract scheme name from this line
+            if isin is not None:
+                # New scheme section: extract scheme name from this line
                 scheme_name = self._extract_scheme_name(line)
                 if scheme_name:
-                    self.context.current_scheme = scheme_name
-                i += 1
+                    self.context.current_scheme = sys.intern(scheme_name)
                 continue
 
-            # Check for folio
-            folio_match = self.FOLIO_PATTERN.search(line)
-            if folio_match:
-                self.context.current_folio = folio_match.group(1).strip()
-
-            # Try to parse a transaction line
-            tx_date = self._extract_date(line)
             if tx_date:
                 # This might be a transaction line
                 transaction, lines_consumed = self._parse_transaction_block(
-                    lines[i:], tx_date
+                    window, tx_date
                 )
                 if transaction:
                     transactions.append(transaction)
                     logger.debug(
                         f"Parsed transaction: {tx_date} {transaction.transaction_type.value}"
                     )
-                i += max(1, lines_consumed)
-            else:
-                i += 1
+                skip = max(1, lines_consumed) - 1
 
-        logger.info(f"Parsed {len(transactions)} transactions")
+        logger.info(f"Parsed {len(transactions)} transactions from {line_count} lines")
         return transactions
 
-    def _update_context(self, line: str) -> None:
+    def _classify_line(
+        self, line: str
+    ) -> Tuple[Optional[str], Optional[str], Optional[date]]:
         """
-        Update parsing context from header/section lines.
+        Scan a line once for the folio, ISIN and date that parse() acts on.
+
+        A line can carry both a folio and an ISIN, so it gets a record of
+        all three rather than a single kind. ISIN lines start a scheme
+        section and are never transactions, so their date is skipped.
+        Each regex runs only on lines holding a literal it cannot match
+        without: "INF" for an ISIN, "-" or "/" for a date.
 
         Args:
-            line: Line to check for context updates.
+            line: Text line from the transaction section.
+
+        Returns:
+            (folio, isin, date) tuple, None where absent.
         """
-        # Check for folio
         folio_match = self.FOLIO_PATTERN.search(line)
-        if folio_match:
-            new_folio = folio_match.group(1).strip()
+        if "INF" in line:
+            isin_match = self.ISIN_PATTERN.search(line)
+            if isin_match:
+                folio = folio_match.group(1).strip() if folio_match else None
+                return folio, isin_match.group(1), None
+        tx_date = (
+            self._extract_date(line) if "-" in line or "/" in line else None
+        )
+        return folio_match.group(1).strip() if folio_match else None, None, tx_date
+
+    def _update_context(self, folio: Optional[str], isin: Optional[str]) -> None:
+        """
+        Update parsing context from a header line's folio and ISIN.
+
+        Args:
+            folio: Folio number found on the line, if any.
+            isin: ISIN found on the line, if any.
+        """
+        context = self.context
+        if folio is not None:
             # Reset ISIN and scheme context if folio changes
-            if self.context.current_folio and self.context.current_folio != new_folio:
-                logger.debug(f"Folio changed from {self.context.current_folio} to {new_folio}, resetting context")
-                self.context.current_isin = None
-                self.context.current_scheme = None
-            self.context.current_folio = new_folio
+            if context.current_folio and context.current_folio != folio:
+                logger.debug(f"Folio changed from {context.current_folio} to {folio}, resetting context")
+                context.current_isin = None
+                context.current_scheme = None
+            context.current_folio = sys.intern(folio)
 
-        # Check for ISIN
-        isin_match = self.ISIN_PATTERN.search(line)
-        if isin_match:
-            self.context.current_isin = isin_match.group(1)
+        if isin is not None:
+            context.current_isin = sys.intern(isin)
 
     def _extract_date(self, line: str) -> Optional[date]:
         """
@@ -277,26 +445,37 @@ class TransactionsParser:
         Returns:
             Parsed date or None.
         """
-        for pattern in self.DATE_PATTERNS:
+        match = self.DATE_ANY_PATTERN.search(line)
+        if match is None:
+            return None
+        if match.lastgroup == "dmy_mon":
+            tx_date = self._parse_date_token("dmy_mon", match.group("dmy_mon"))
+            if tx_date is not None:
+                return tx_date
+
+        # Shapes rank by DATE_PATTERNS order, not position: a DD-Mon-YYYY
+        # date later in the line wins over a numeric one before it
+        for pattern, shape in zip(self.DATE_PATTERNS, self.DATE_PARSERS):
             match = pattern.search(line)
             if match:
                 date_str = match.group(1)
-                try:
-                    if "-" in date_str and not date_str[0].isdigit() or len(date_str.split("-")[0]) == 2:
-                        # DD-Mon-YYYY or DD-MM-YYYY
-                        if any(m in date_str for m in ["Jan", "Feb", "Mar", "Apr", "May", "Jun",
-                                                        "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]):
-                            return datetime.strptime(date_str, "%d-%b-%Y").date()
-                    if "/" in date_str:
-                        # DD/MM/YYYY
-                        return datetime.strptime(date_str, "%d/%m/%Y").date()
-                    if date_str.startswith("20") and "-" in date_str:
-                        # YYYY-MM-DD
-                        return datetime.strptime(date_str, "%Y-%m-%d").date()
-                except ValueError:
+                if shape == "ymd" and not date_str.startswith("20"):
+                    # Only 20xx ISO dates are taken as transaction dates
                     continue
+                tx_date = self._parse_date_token(shape, date_str)
+                if tx_date is not None:
+                    return tx_date
         return None
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _parse_date_token(shape: str, date_str: str) -> Optional[date]:
+        """Date for one matched token, None if invalid (memoized; dates repeat)."""
+        try:
+            return TransactionsParser.DATE_PARSERS[shape](date_str)
+        except ValueError:
+            return None
+
     def _extract_scheme_name(self, line: str) -> Optional[str]:
         """
         Extract scheme name from a line containing ISIN.
@@ -311,23 +490,23 @@ class TransactionsParser:
         cleaned = line
         cleaned = self.ISIN_PATTERN.sub("", cleaned)
         cleaned = self.FOLIO_PATTERN.sub("", cleaned)
-        cleaned = re.sub(r"\d{1,3}(?:,\d{3})*\.\d+", "", cleaned)
-        cleaned = re.sub(r"(?i)registrar\s*:.*", "", cleaned)
-        cleaned = re.sub(r"\s+", " ", cleaned).strip()
-        cleaned = re.sub(r"^[-:]+\s*", "", cleaned)
+        cleaned = _DECIMAL_NUMBER.sub("", cleaned)
+        cleaned = _REGISTRAR_SUFFIX.sub("", cleaned)
+        cleaned = _WHITESPACE.sub(" ", cleaned).strip()
+        cleaned = _LEADING_SEPARATOR.sub("", cleaned)
 
         if cleaned and len(cleaned) > 3:
             return cleaned
         return None
 
     def _parse_transaction_block(
-        self, lines: List[str], tx_date: date
+        self, lines: Sequence[str], tx_date: date
     ) -> Tuple[Optional[Transaction], int]:
         """
         Parse a transaction block starting with a date line.
 
         Args:
-            lines: Lines starting from the transaction date line.
+            lines: The transaction date line and up to two lines after it.
             tx_date: Extracted transaction date.
 
         Returns:
@@ -342,9 +521,7 @@ class TransactionsParser:
         description = self._extract_description(first_line)
 
         # Look for numeric values in this line and potentially next few lines
-        amount, units, nav, balance = self._extract_transaction_values(
-            lines[:min(3, len(lines))]
-        )
+        amount, units, nav, balance = self._extract_transaction_values(lines)
 
         # If no units found, this might not be a transaction line
         if units is None:
@@ -357,18 +534,19 @@ class TransactionsParser:
         if tx_type in (TransactionType.STT, TransactionType.STAMP_DUTY, TransactionType.CHARGES):
             # These don't affect unit balance significantly
             if balance is None:
-                balance = Decimal("0")
+                balance = _ZERO
 
         # Create transaction
+        context = self.context
         transaction = Transaction(
             date=tx_date,
             description=description,
             transaction_type=tx_type,
             units=units,
-            balance_units=balance or Decimal("0"),
-            folio=self.context.current_folio or "",
-            scheme_name=self.context.current_scheme or "",
-            isin=self.context.current_isin or "",
+            balance_units=balance or _ZERO,
+            folio=context.current_folio or "",
+            scheme_name=context.current_scheme or "",
+            isin=context.current_isin or "",
             amount=amount,
             nav=nav,
         )
@@ -391,16 +569,16 @@ class TransactionsParser:
             description = pattern.sub("", description)
 
         # Remove numeric values (keep words)
-        description = re.sub(r"\b\d{1,3}(?:,\d{3})*\.\d+\b", "", description)
-        description = re.sub(r"\b\d{1,3}(?:,\d{3})+\b", "", description)
+        description = _WORD_DECIMAL_NUMBER.sub("", description)
+        description = _WORD_GROUPED_NUMBER.sub("", description)
 
         # Remove currency symbols
-        description = re.sub(r"(?:Rs\.?|INR|₹)", "", description)
+        description = _CURRENCY.sub("", description)
 
         # Clean up
-        description = re.sub(r"\s+", " ", description).strip()
-        description = re.sub(r"^[-–—:]+\s*", "", description)
-        description = re.sub(r"\s*[-–—:]+$", "", description)
+        description = _WHITESPACE.sub(" ", description).strip()
+        description = _LEADING_DASH.sub("", description)
+        description = _TRAILING_DASH.sub("", description)
 
         return description
 
@@ -423,10 +601,10 @@ class TransactionsParser:
         abs_amount = abs(amount)
 
         # Step 1: NAV range check
-        if nav <= 0 or nav > Decimal("100000"):
+        if nav <= 0 or nav > _NAV_MAX:
             if abs_amount > 0 and abs_units > 0:
                 recomputed_nav = abs_amount / abs_units
-                if Decimal("1") <= recomputed_nav <= Decimal("100000"):
+                if _ONE <= recomputed_nav <= _NAV_MAX:
                     logger.warning(
                         f"Correcting NAV from {nav} to {recomputed_nav} "
                         f"(amount={amount}, units={units})"
@@ -443,7 +621,7 @@ class TransactionsParser:
             expected = abs_units * nav
             if expected > 0:
                 ratio = abs_amount / expected
-                if ratio >= Decimal("100"):
+                if ratio >= _HUNDRED:
                     corrected_amount = expected
                     if amount < 0:
                         corrected_amount = -corrected_amount
@@ -452,7 +630,7 @@ class TransactionsParser:
                         f"(units={units}, nav={nav}, ratio={ratio})"
                     )
                     amount = corrected_amount
-                elif ratio <= Decimal("0.01"):
+                elif ratio <= _ONE_PERCENT:
                     corrected_units = abs_amount / nav
                     if units < 0:
                         corrected_units = -corrected_units
@@ -465,11 +643,15 @@ class TransactionsParser:
         return amount, units, nav
 
     def _extract_transaction_values(
-        self, lines: List[str]
+        self, lines: Sequence[str]
     ) -> Tuple[Optional[Decimal], Optional[Decimal], Optional[Decimal], Optional[Decimal]]:
         """
         Extract amount, units, NAV, and balance from transaction lines.
 
+        Numbers are bucketed on cheap float values and only the (at most
+        four) winners are materialized as Decimal, so the exact type is
+        never built for numbers that are discarded.
+
         Args:
             lines: Lines to search for values.
 
@@ -487,62 +669,65 @@ class TransactionsParser:
         balance_match = self.BALANCE_PATTERN.search(all_text)
         if balance_match:
             try:
-                balance = Decimal(balance_match.group(1).replace(",", ""))
+                balance = Decimal(balance_match.group(1))
             except InvalidOperation:
                 pass
 
-        # Collect all decimal numbers from lines
-        numbers: List[Tuple[Decimal, str, int]] = []  # (value, raw_string, decimal_places)
-
-        for line in lines:
-            # Match numbers: optional minus OR parenthesized for negatives
-            # Examples: 54,972.00  -5,000.000  (54,972.00)  (5,000.000)
-            for match in re.finditer(
-                r"(\(?\-?\d{1,3}(?:,\d{3})*\.\d{2,4}\)?)", line
-            ):
-                raw = match.group(1)
-                # Convert parenthesized notation to negative
-                is_paren_negative = raw.startswith("(") and raw.endswith(")")
-                if is_paren_negative:
-                    raw = raw[1:-1]  # strip parens
-                decimal_places = len(raw.split(".")[-1])
-                try:
-                    num = Decimal(raw.replace(",", ""))
-                    if is_paren_negative:
-                        num = -num
-                    numbers.append((num, raw, decimal_places))
-                except InvalidOperation:
-                    pass
-
-        # Heuristic assignment based on decimal places and values
+        # Heuristic assignment based on decimal places and values, made as
+        # each number is read (_SIGNED_NUMBER only matches 2-4 places):
         # Units: 3-4 decimal places
         # NAV: 2-4 decimal places, typically 10-1000
         # Amount: 2 decimal places, larger values
         # Balance: 3-4 decimal places
+        # Zero until units are found, so no NAV is kept before them
+        units_magnitude = 0.0
+
+        # One scan of the joined text: numbers never span the joining space,
+        # so this sees the same numbers, in order, as a scan per line.
+        # Examples: 54,972.00  -5,000.000  (54,972.00)  (5,000.000)
+        for match in _SIGNED_NUMBER.finditer(all_text):
+            raw = match.group(1)
+            # Convert parenthesized notation to negative
+            is_paren_negative = raw.startswith("(") and raw.endswith(")")
+            if is_paren_negative:
+                raw = raw[1:-1]  # strip parens
+            text = raw.translate(_NO_COMMA) if "," in raw else raw
+            # Classify on a float; only the values kept become Decimal
+            try:
+                value = float(text)
+            except ValueError:
+                continue
+            if is_paren_negative:
+                value = -value
+            magnitude = abs(value)
+
+            # Candidate fields in order of preference, by decimal places:
+            #   2 places:   NAV, then amount
+            #   3-4 places: units, then NAV, then balance
+            # A NAV-sized number is claimed as NAV even when it is not below
+            # units and so not kept.
+            if len(match.group(2)) == 2:
+                if nav is None and 1.0 <= magnitude <= 10000.0:
+                    if magnitude < units_magnitude:
+                        nav = _signed_decimal(text, is_paren_negative)
+                elif amount is None and magnitude > 100.0:
+                    amount = abs(Decimal(text))  # Amount is typically positive
+                else:
+                    continue
+            elif units is None:
+                units = _signed_decimal(text, is_paren_negative)
+                units_magnitude = magnitude
+            elif nav is None and 1.0 <= magnitude <= 10000.0:
+                if magnitude < units_magnitude:
+                    nav = _signed_decimal(text, is_paren_negative)
+            elif balance is None and value >= 0:
+                balance = _signed_decimal(text, is_paren_negative)
+            else:
+                continue
 
-        for num, raw, decimal_places in numbers:
-            abs_num = abs(num)
-
-            if units is None and decimal_places >= 3:
-                units = num
-            elif nav is None and decimal_places in (2, 3, 4) and Decimal("1") <= abs_num <= Decimal("10000"):
-                # Could be NAV
-                if units is not None and abs_num < abs(units):
-                    nav = num
-            elif amount is None and decimal_places == 2 and abs_num > Decimal("100"):
-                amount = abs_num  # Amount is typically positive
-            elif balance is None and decimal_places >= 3 and num >= 0:
-                balance = num
-
-        # If we only have one 3+ decimal number and no clear units, use it as units
-        three_plus_decimals = [n for n in numbers if n[2] >= 3]
-        if units is None and len(three_plus_decimals) >= 1:
-            # Take the one that's more likely units based on position/context
-            for num, _, _ in three_plus_decimals:
-                if units is None:
-                    units = num
-                elif balance is None and num >= 0:
-                    balance = num
+            if not (amount is None or units is None or nav is None or balance is None):
+                # Every value is assigned; later numbers cannot change them
+                break
 
         # Cross-validate and fix corrupt values
         amount, units, nav = self._validate_and_fix_transaction_values(amount, units, nav)
@@ -550,7 +735,7 @@ class TransactionsParser:
         return amount, units, nav, balance
 
 
-def parse_transactions(lines: List[str]) -> List[Transaction]:
+def parse_transactions(lines: Iterable[str]) -> List[Transaction]:
     """
     Convenience function to parse transactions from text lines.
 
@@ -6,17 +6,87 @@ interleaved per scheme, rather than in separate sections.
 """
 
 import logging
+import os
 import re
+from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from cas_parser.models import Holding, Investor, Transaction, TransactionType
 from cas_parser.isin_resolver import get_isin_resolver
 
 logger = logging.getLogger(__name__)
 
+_DEBUG_LOG_PATH = "/tmp/cas_parser_debug.log"
+
+# Transaction cross-validation bounds
+_ONE = Decimal(1)
+_HUNDRED = Decimal(100)
+_NAV_MAX = Decimal(100000)
+_ONE_PERCENT = Decimal("0.01")
+
+# Float screen for consistent rows: strictly inside the Decimal bounds, with
+# margins far wider than double rounding error, so a row passed here would
+# pass the exact checks too. Tiny products are left to the exact path.
+_SCREEN_NAV_MAX = 99999.0
+_SCREEN_MIN_EXPECTED = 1e-9
+_SCREEN_RATIO_LOW = 0.0100001
+_SCREEN_RATIO_HIGH = 99.9999
+
+# Helper patterns for ISIN recovery, scheme names and investor details
+_PARTIAL_ISIN = re.compile(r"ISIN\s*:\s*(INF[A-Z0-9]{1,8})(?:\s|$|\()")
+_ISIN_PREFIX = re.compile(r"ISIN\s*:\s*(INF[A-Z0-9]*)")
+_STANDALONE_ISIN = re.compile(r"\b(INF[A-Z0-9]{9})\b")
+_SCHEME_CODE_PREFIX = re.compile(r"^([A-Z0-9]{2,10})-(.+)$")
+_ISIN_LABEL = re.compile(r"ISIN\s*:\s*INF[A-Z0-9]{9}")
+_REGISTRAR_LABEL = re.compile(r"Registrar\s*:\s*\w+", re.IGNORECASE)
+_MIXED_CASE = re.compile(r"[A-Z].*[a-z]")
+_SPECIAL_ENTRY = re.compile(r"\*\*\*\s*(.+?)\s*\*\*\*\s*([\d,.]+)?")
+_CAPS_NAME = re.compile(r"\b([A-Z]{2,}(?:\s+[A-Z]{2,})+)\b")
+_DIGIT_RUN = re.compile(r"\d{3,}")
+_LETTERS_ONLY = re.compile(r"^[A-Za-z\s]+$")
+
+# Investor name: caps runs that are statement headings, not a holder's name
+_NAME_SKIP_PHRASES = (
+    "PORTFOLIO SUMMARY", "MUTUAL FUND", "CONSOLIDATED ACCOUNT",
+    "COST VALUE", "MARKET VALUE", "PAN", "KYC", "ISIN", "NAV",
+    "DIRECT PLAN", "GROWTH", "INR", "STT", "SIP", "DEMAT",
+)
+
+# Investor name fallback: header and address lines below the email line
+_HEADER_WORDS = ("consolidated", "statement", "portfolio", "mutual fund", "investor")
+_ADDRESS_WORDS = (
+    "west bengal", "india", "maharashtra", "karnataka", "delhi",
+    "tamil nadu", "gujarat", "kerala", "road", "street", "lane",
+    "nagar", "colony", "sector", "block", "floor", "flat",
+    "cost value", "market value", "portfolio", "summary",
+)
+
+# Scheme-name lookback: lines that end the current scheme section. Only
+# "any marker present" matters, so the markers share one alternation.
+_LOOKBACK_STOP = re.compile(
+    r"Closing\s*Unit\s*Balance"     # End of previous scheme
+    r"|Market\s*Value"              # End of previous scheme summary
+    r"|ISIN\s*:\s*INF"              # Another ISIN = different scheme
+    r"|\bINF[A-Z0-9]{9}\b",         # Standalone ISIN
+    re.IGNORECASE,
+)
+
+# Scheme-name lookback: lines that are clearly not scheme names but don't
+# indicate section end
+_LOOKBACK_SKIP = re.compile(
+    r"^\s*(?:Folio\s*No"            # Folio line
+    r"|PAN\s*:"                     # PAN line
+    r"|KYC\s*:"                     # KYC line
+    r"|Registrar"                   # Registrar line
+    r"|\d{2}-\w{3}-\d{4}"           # Date line (transaction)
+    r"|Advisor\s*:)"                # Advisor line
+    r"|Mutual\s*Fund$",             # AMC header
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class SchemeContext:
@@ -39,13 +109,20 @@ class UnifiedCASParser:
     has its own section with transactions followed by closing balance.
     """
 
-    # Debug mode - set to True to dump extraction details
-    DEBUG_EXTRACTION = True
+    # Debug mode - set FAMFOLIOZ_PARSER_DEBUG=1 to dump extraction details
+    DEBUG_EXTRACTION = bool(os.environ.get("FAMFOLIOZ_PARSER_DEBUG"))
 
     # Patterns
-    AMC_PATTERN = re.compile(r"^([A-Za-z\s]+(?:Mutual Fund|MF))\s*$", re.IGNORECASE)
+    # The name class already lists both cases, so only the suffix is
+    # case-insensitive; the pattern runs on every line via LINE_START_PATTERN.
+    AMC_PATTERN = re.compile(r"^([A-Za-z\s]+(?i:Mutual Fund|MF))\s*$")
+    # Folio number: whitespace-separated tokens up to KYC/PAN or end of line.
+    # Tokens can't start with whitespace, so a run of spaces is only crossed
+    # once; a blank folio is still accepted when only spaces precede KYC/PAN.
     FOLIO_PATTERN = re.compile(
-        r"Folio\s*No\s*:\s*([A-Z0-9/\s]+?)(?:\s+(?:KYC|PAN)|$)", re.IGNORECASE
+        r"Folio\s*No\s*:(?:\s*(?=[A-Z0-9/])|(?=\s\s+(?:KYC|PAN)|\s+$))"
+        r"([A-Z0-9/]+(?:\s+[A-Z0-9/]+)*?|)(?:\s+(?:KYC|PAN)|\s*$)",
+        re.IGNORECASE,
     )
     PAN_EXTRACT_PATTERN = re.compile(r"PAN\s*:\s*([A-Z]{5}[0-9]{4}[A-Z])", re.IGNORECASE)
     ISIN_PATTERN = re.compile(r"ISIN\s*:\s*(INF[A-Z0-9]{9})")
@@ -54,11 +131,13 @@ class UnifiedCASParser:
 
     # Transaction line pattern: Date Transaction Amount Units Price Balance
     DATE_PATTERN = re.compile(r"^(\d{2}-[A-Za-z]{3}-\d{4})")
+    # The filler gaps are bounded so a malformed line can't make the two lazy
+    # scans retry each other across the whole line.
     CLOSING_PATTERN = re.compile(
         r"Closing\s*Unit\s*Balance\s*:\s*([\d,]+\.\d+)\s*"
         r"NAV\s*on\s*(\d{2}-[A-Za-z]{3}-\d{4})\s*:\s*INR\s*([\d,]+\.\d+)\s*"
-        r".*?(?:Cost\s*Value|Total\s*Cost)\s*:\s*([\d,]+\.\d+)\s*"
-        r"Market\s*Value.*?:\s*INR\s*([\d,]+\.\d+)",
+        r".{0,200}?(?:Cost\s*Value|Total\s*Cost)\s*:\s*([\d,]+\.\d+)\s*"
+        r"Market\s*Value.{0,200}?:\s*INR\s*([\d,]+\.\d+)",
         re.IGNORECASE
     )
 
@@ -67,6 +146,13 @@ class UnifiedCASParser:
     MOBILE_PATTERN = re.compile(r"Mobile\s*:\s*\+?(\d+)", re.IGNORECASE)
     STATEMENT_PERIOD_PATTERN = re.compile(r"(\d{2}-[A-Za-z]{3}-\d{4})\s*To\s*(\d{2}-[A-Za-z]{3}-\d{4})")
 
+    # Anchored line kinds fused into one match: a transaction date or an AMC
+    # header. The two can never both match (digit vs letter first), so the
+    # alternation order is free; date goes first as the far commoner kind.
+    LINE_START_PATTERN = re.compile(
+        rf"(?P<date>{DATE_PATTERN.pattern[1:]})|(?P<amc>{AMC_PATTERN.pattern})"
+    )
+
     def __init__(self):
         """Initialize the unified parser."""
         self.context = SchemeContext()
@@ -74,11 +160,17 @@ class UnifiedCASParser:
         self.transactions: List[Transaction] = []
         self.investor: Optional[Investor] = None
         self.quarantine_items: List[dict] = []  # Items with broken ISINs
+        self._debug_log = None  # Open for the duration of a debug parse
 
-    def parse(self, lines: List[str]) -> Tuple[Investor, List[Holding], List[Transaction]]:
+    def parse(self, lines: Sequence[str]) -> Tuple[Investor, List[Holding], List[Transaction]]:
         """
         Parse all data from CAS lines.
 
+        The parse needs random access: the first 50 lines for the investor,
+        up to 20 lines ahead to complete a truncated ISIN, and up to 5 lines
+        back for scheme names and the debug dump. It reads the caller's
+        sequence in place and copies nothing beyond the investor header.
+
         Args:
             lines: All text lines from the PDF.
 
@@ -89,38 +181,82 @@ class UnifiedCASParser:
         self.transactions = []
         self.context = SchemeContext()
 
-        # Clear debug log at start of parse
+        # Start a fresh debug log, kept open until the parse finishes
         if self.DEBUG_EXTRACTION:
             try:
-                with open("/tmp/cas_parser_debug.log", "w") as f:
-                    f.write(f"=== CAS Parser Debug Log ===\n")
-                    f.write(f"Total lines to parse: {len(lines)}\n\n")
-            except:
-                pass
+                self._debug_log = open(_DEBUG_LOG_PATH, "w")
+                self._debug_log.write("=== CAS Parser Debug Log ===\n")
+                self._debug_log.write(f"Total lines to parse: {len(lines)}\n\n")
+            except OSError:
+                self._debug_log = None
+
+        try:
+            # First pass: extract investor info
+            self.investor = self._parse_investor(lines[:50])
+            # Second pass: parse scheme data
+            self._parse_scheme_lines(lines)
+        finally:
+            if self._debug_log:
+                self._debug_log.close()
+                self._debug_log = None
+
+        logger.info(f"Parsed {len(self.holdings)} holdings, {len(self.transactions)} transactions")
+        if self.quarantine_items:
+            logger.warning(f"Quarantined {len(self.quarantine_items)} items with broken ISINs")
+
+        # ISIN -> {scheme_name: folio}, in first-seen order. Conflicts are
+        # always reported; the per-ISIN summary only when INFO is enabled.
+        schemes_by_isin = defaultdict(dict)
+        for h in self.holdings:
+            if h.isin:
+                schemes_by_isin[h.isin].setdefault(h.scheme_name, h.folio)
+
+        log_summary = logger.isEnabledFor(logging.INFO)
+        for isin, schemes in schemes_by_isin.items():
+            (scheme_name, folio), *conflicts = schemes.items()
+            if log_summary:
+                logger.info("PARSED: ISIN=%s -> Scheme='%.60s...' (folio=%s)", isin, scheme_name, folio)
+            if conflicts:
+                logger.warning(
+                    "ISIN CONFLICT: %s has %d scheme names! '%.40s' vs %s",
+                    isin, len(schemes), scheme_name,
+                    ", ".join(f"'{name[:40]}'" for name, _ in conflicts),
+                )
+
+        return self.investor, self.holdings, self.transactions
 
-        # First pass: extract investor info
-        self.investor = self._parse_investor(lines[:50])
+    def _parse_scheme_lines(self, lines: Sequence[str]) -> None:
+        """
+        Walk the statement once, collecting holdings and transactions.
 
-        # Second pass: parse scheme data
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        Args:
+            lines: All text lines from the PDF.
+        """
+        for i, raw_line in enumerate(lines):
+            line = raw_line.strip()
+            line_start = self.LINE_START_PATTERN.match(line)
+            kind = line_start.lastgroup if line_start else None
 
             # Check for AMC header
-            amc_match = self.AMC_PATTERN.match(line)
-            if amc_match:
-                self.context.amc = amc_match.group(1).strip()
-                logger.debug(f"Found AMC: {self.context.amc}")
-                i += 1
+            if kind == "amc":
+                self.context.amc = line_start.group("amc").strip()
+                logger.debug("Found AMC: %s", self.context.amc)
                 continue
 
+            # Literal gates skip searches that cannot match. The stems avoid
+            # "i" and "s", which re's IGNORECASE also folds from İ/ı and ſ.
+            lowered = line.lower()
+
             # Check for Folio line
-            folio_match = self.FOLIO_PATTERN.search(line)
+            folio_match = self.FOLIO_PATTERN.search(line) if "fol" in lowered else None
             if folio_match:
                 new_folio = folio_match.group(1).strip().replace(" ", "")
                 # If folio changes, reset scheme context (new scheme section)
                 if self.context.folio and self.context.folio != new_folio:
-                    logger.debug(f"Folio changed from {self.context.folio} to {new_folio}, resetting scheme context")
+                    logger.debug(
+                        "Folio changed from %s to %s, resetting scheme context",
+                        self.context.folio, new_folio,
+                    )
                     self.context.scheme_name = None
                     self.context.isin = None
                     self.context.registrar = None
@@ -132,8 +268,7 @@ class UnifiedCASParser:
                     # Update investor PAN if not set
                     if self.investor and not self.investor.pan:
                         self.investor.pan = pan_match.group(1)
-                logger.debug(f"Found Folio: {self.context.folio}")
-                i += 1
+                logger.debug("Found Folio: %s", self.context.folio)
                 continue
 
             # Check for scheme line with ISIN
@@ -144,22 +279,25 @@ class UnifiedCASParser:
                 # If no valid ISIN found, try to recover from truncated ISIN
                 if not new_isin_match:
                     # Look for partial ISIN (INF followed by some chars but not full 12)
-                    partial_match = re.search(r"ISIN\s*:\s*(INF[A-Z0-9]{1,8})(?:\s|$|\()", line)
+                    partial_match = _PARTIAL_ISIN.search(line)
                     if partial_match:
                         partial_isin = partial_match.group(1)
-                        logger.debug(f"Found partial ISIN: {partial_isin}, searching ahead for full ISIN")
+                        logger.debug("Found partial ISIN: %s, searching ahead for full ISIN", partial_isin)
 
                         # Search ahead up to 20 lines for full ISIN starting with same prefix
+                        full_isin_pattern = re.compile(
+                            rf"\b({re.escape(partial_isin)}[A-Z0-9]{{{12 - len(partial_isin)}}})\b"
+                        )
                         for lookahead in range(1, min(21, len(lines) - i)):
                             future_line = lines[i + lookahead].strip()
                             # Look for standalone full ISIN that starts with our partial
-                            full_isin_match = re.search(r"\b(" + re.escape(partial_isin) + r"[A-Z0-9]{" + str(12 - len(partial_isin)) + r"})\b", future_line)
+                            full_isin_match = full_isin_pattern.search(future_line)
                             if full_isin_match:
                                 logger.info(f"Found full ISIN {full_isin_match.group(1)} ahead at line {i + lookahead}")
                                 new_isin_match = full_isin_match
                                 break
                             # Also check for any ISIN pattern (might be the one we're looking for)
-                            any_isin_match = re.search(r"\b(INF[A-Z0-9]{9})\b", future_line)
+                            any_isin_match = _STANDALONE_ISIN.search(future_line)
                             if any_isin_match:
                                 # Found a different ISIN - stop searching, we've hit next scheme
                                 break
@@ -172,7 +310,10 @@ class UnifiedCASParser:
                     # CRITICAL: Reset scheme context when we encounter a NEW ISIN
                     # This prevents scheme_name from previous scheme carrying over
                     if self.context.isin and self.context.isin != new_isin:
-                        logger.debug(f"New ISIN detected ({new_isin}), resetting scheme context from {self.context.isin}")
+                        logger.debug(
+                            "New ISIN detected (%s), resetting scheme context from %s",
+                            new_isin, self.context.isin,
+                        )
                         self.context.scheme_name = None
                         self.context.registrar = None
 
@@ -191,7 +332,7 @@ class UnifiedCASParser:
 
                     # Extract partial ISIN if any
                     partial_isin = ""
-                    partial_match = re.search(r"ISIN\s*:\s*(INF[A-Z0-9]*)", line)
+                    partial_match = _ISIN_PREFIX.search(line)
                     if partial_match:
                         partial_isin = partial_match.group(1)
 
@@ -201,7 +342,7 @@ class UnifiedCASParser:
                     if isin_pos > 0:
                         temp_scheme = line[:isin_pos].strip()
                         # Remove scheme code prefix
-                        code_match = re.match(r"^([A-Z0-9]{2,10})-(.+)$", temp_scheme)
+                        code_match = _SCHEME_CODE_PREFIX.match(temp_scheme)
                         if code_match:
                             temp_scheme = code_match.group(2).strip()
 
@@ -216,7 +357,7 @@ class UnifiedCASParser:
                             if self.DEBUG_EXTRACTION:
                                 print(f"MANUAL MAPPING FOUND: {resolved_isin} for '{temp_scheme[:50]}'")
                     except Exception as e:
-                        logger.debug(f"Could not check manual mappings: {e}")
+                        logger.debug("Could not check manual mappings: %s", e)
 
                     if resolved_isin:
                         # Use the manually mapped ISIN
@@ -235,75 +376,54 @@ class UnifiedCASParser:
                         self.context.isin = f"UNKNOWN_{partial_isin}" if partial_isin else "UNKNOWN_"
                         self._parse_scheme_line(line, lines, i)
 
-                i += 1
                 continue
 
             # Also check for standalone ISIN pattern (INF followed by 9 alphanumeric)
             # This catches cases where ISIN appears without "ISIN:" prefix
-            isin_standalone = re.search(r"\b(INF[A-Z0-9]{9})\b", line)
-            if isin_standalone and not self.context.isin:
+            isin_standalone = (
+                _STANDALONE_ISIN.search(line)
+                if not self.context.isin and "INF" in line
+                else None
+            )
+            if isin_standalone:
                 # Only update if we don't have an ISIN yet for this scheme
                 potential_isin = isin_standalone.group(1)
                 # Validate it looks like a real ISIN (not part of other text)
                 if line.strip().endswith(potential_isin) or "ISIN" in line.upper():
                     self.context.isin = potential_isin
-                    logger.debug(f"Found standalone ISIN: {self.context.isin}")
+                    logger.debug("Found standalone ISIN: %s", self.context.isin)
 
             # Check for transaction line (starts with date)
-            date_match = self.DATE_PATTERN.match(line)
-            if date_match:
+            if kind == "date":
                 tx = self._parse_transaction_line(line)
                 if tx:
                     # Check if ISIN is broken/quarantined
                     if self._is_broken_isin(tx.isin):
                         # Add to quarantine instead of main list
-                        self._add_to_quarantine('transaction', tx)
+                        self._quarantine_transaction(tx)
                         logger.info(
                             f"Quarantined transaction: {tx.scheme_name[:30]}... "
                             f"(folio={tx.folio}, date={tx.date}, partial_isin={tx.isin})"
                         )
                     else:
                         self.transactions.append(tx)
-                i += 1
                 continue
 
             # Check for closing balance line (holding info)
-            closing_match = self.CLOSING_PATTERN.search(line)
+            closing_match = self.CLOSING_PATTERN.search(line) if "clo" in lowered else None
             if closing_match:
                 holding = self._parse_closing_line(closing_match)
                 if holding:
                     # Check if ISIN is broken/quarantined
                     if self._is_broken_isin(holding.isin):
                         # Add to quarantine instead of main list
-                        self._add_to_quarantine('holding', holding)
+                        self._quarantine_holding(holding)
                         logger.info(
                             f"Quarantined holding: {holding.scheme_name[:50]}... "
                             f"(folio={holding.folio}, partial_isin={holding.isin})"
                         )
                     else:
                         self.holdings.append(holding)
-                i += 1
-                continue
-
-            i += 1
-
-        logger.info(f"Parsed {len(self.holdings)} holdings, {len(self.transactions)} transactions")
-        if self.quarantine_items:
-            logger.warning(f"Quarantined {len(self.quarantine_items)} items with broken ISINs")
-
-        # Log all unique scheme-ISIN pairs for verification
-        seen_isins = {}
-        for h in self.holdings:
-            if h.isin and h.isin not in seen_isins:
-                seen_isins[h.isin] = h.scheme_name
-                logger.info(f"PARSED: ISIN={h.isin} -> Scheme='{h.scheme_name[:60]}...' (folio={h.folio})")
-            elif h.isin and seen_isins.get(h.isin) != h.scheme_name:
-                logger.warning(
-                    f"ISIN CONFLICT: {h.isin} has multiple scheme names! "
-                    f"'{seen_isins[h.isin][:40]}' vs '{h.scheme_name[:40]}'"
-                )
-
-        return self.investor, self.holdings, self.transactions
 
     def _is_broken_isin(self, isin: str) -> bool:
         """Check if ISIN is broken/truncated (not a valid 12-char INF ISIN)."""
@@ -317,45 +437,45 @@ class UnifiedCASParser:
             return True
         return False
 
-    def _add_to_quarantine(self, data_type: str, item) -> None:
-        """Add a holding or transaction to quarantine."""
+    def _quarantine_holding(self, holding: Holding) -> None:
+        """Add a holding with a broken ISIN to quarantine."""
+        self._add_to_quarantine('holding', holding, {
+            'scheme_name': holding.scheme_name,
+            'folio': holding.folio,
+            'isin': holding.isin,
+            'units': str(holding.units),
+            'nav': str(holding.nav),
+            'nav_date': str(holding.nav_date),
+            'current_value': str(holding.current_value),
+            'registrar': holding.registrar,
+        })
+
+    def _quarantine_transaction(self, tx: Transaction) -> None:
+        """Add a transaction with a broken ISIN to quarantine."""
+        self._add_to_quarantine('transaction', tx, {
+            'scheme_name': tx.scheme_name,
+            'folio': tx.folio,
+            'isin': tx.isin,
+            'date': str(tx.date),
+            'description': tx.description,
+            'transaction_type': tx.transaction_type.value,
+            'amount': str(tx.amount),
+            'units': str(tx.units),
+            'nav': str(tx.nav),
+            'balance_units': str(tx.balance_units),
+        })
+
+    def _add_to_quarantine(self, data_type: str, item, data: dict) -> None:
+        """Record a quarantined holding or transaction with its serialized data."""
         # Extract partial ISIN
-        isin = getattr(item, 'isin', None) or ''
+        isin = item.isin
         partial_isin = isin.replace('UNKNOWN_', '') if isin.startswith('UNKNOWN_') else isin
 
-        # Convert item to dict
-        if hasattr(item, 'to_dict'):
-            data = item.to_dict()
-        else:
-            data = {
-                'scheme_name': getattr(item, 'scheme_name', ''),
-                'folio': getattr(item, 'folio', ''),
-                'isin': isin,
-            }
-            if data_type == 'holding':
-                data.update({
-                    'units': str(getattr(item, 'units', 0)),
-                    'nav': str(getattr(item, 'nav', 0)),
-                    'nav_date': str(getattr(item, 'nav_date', '')),
-                    'current_value': str(getattr(item, 'current_value', 0)),
-                    'registrar': getattr(item, 'registrar', ''),
-                })
-            elif data_type == 'transaction':
-                data.update({
-                    'date': str(getattr(item, 'date', '')),
-                    'description': getattr(item, 'description', ''),
-                    'transaction_type': getattr(item, 'transaction_type', '').value if hasattr(getattr(item, 'transaction_type', ''), 'value') else str(getattr(item, 'transaction_type', '')),
-                    'amount': str(getattr(item, 'amount', 0)),
-                    'units': str(getattr(item, 'units', 0)),
-                    'nav': str(getattr(item, 'nav', 0)),
-                    'balance_units': str(getattr(item, 'balance_units', 0)),
-                })
-
         self.quarantine_items.append({
             'partial_isin': partial_isin,
-            'scheme_name': getattr(item, 'scheme_name', ''),
+            'scheme_name': item.scheme_name,
             'amc': self.context.amc or '',
-            'folio_number': getattr(item, 'folio', ''),
+            'folio_number': item.folio,
             'data_type': data_type,
             'data': data,
         })
@@ -365,7 +485,13 @@ class UnifiedCASParser:
         return self.quarantine_items
 
     def _parse_investor(self, lines: List[str]) -> Investor:
-        """Parse investor information from header lines."""
+        """
+        Parse investor information from header lines.
+
+        The fields are searched in the joined header text, not line by line,
+        because PDF extraction often wraps a label and its value (or a long
+        name) onto consecutive lines.
+        """
         text = " ".join(lines)
 
         # Extract email
@@ -390,26 +516,19 @@ class UnifiedCASParser:
         name = ""
 
         # First try: Look for an ALL CAPS name pattern (common in CAS)
-        name_match = re.search(r"\b([A-Z]{2,}(?:\s+[A-Z]{2,})+)\b", text)
+        name_match = _CAPS_NAME.search(text)
         if name_match:
             candidate = name_match.group(1)
             # Verify it's not a header or abbreviation
-            skip_patterns = ["PORTFOLIO SUMMARY", "MUTUAL FUND", "CONSOLIDATED ACCOUNT",
-                           "COST VALUE", "MARKET VALUE", "PAN", "KYC", "ISIN", "NAV",
-                           "DIRECT PLAN", "GROWTH", "INR", "STT", "SIP", "DEMAT"]
-            if not any(skip in candidate for skip in skip_patterns):
+            if not any(skip in candidate for skip in _NAME_SKIP_PHRASES):
                 if len(candidate) >= 5 and len(candidate) <= 50:
                     name = candidate
 
         # Fallback: Look for name after email line
         if not name:
             found_email_line = False
-            skip_words = ["west bengal", "india", "maharashtra", "karnataka", "delhi",
-                          "tamil nadu", "gujarat", "kerala", "road", "street", "lane",
-                          "nagar", "colony", "sector", "block", "floor", "flat",
-                          "cost value", "market value", "portfolio", "summary"]
 
-            for i, line in enumerate(lines):
+            for line in lines:
                 line_clean = line.strip()
                 line_lower = line_clean.lower()
 
@@ -421,16 +540,16 @@ class UnifiedCASParser:
                 # After email line, look for name
                 if found_email_line and not name:
                     # Skip header lines
-                    if any(x in line_lower for x in ["consolidated", "statement", "portfolio", "mutual fund", "investor"]):
+                    if any(x in line_lower for x in _HEADER_WORDS):
                         continue
                     # Skip date lines
                     if self.STATEMENT_PERIOD_PATTERN.search(line_clean):
                         continue
                     # Skip lines with too many numbers (likely address)
-                    if re.search(r"\d{3,}", line_clean):
+                    if _DIGIT_RUN.search(line_clean):
                         continue
                     # Skip common address words
-                    if any(x in line_lower for x in skip_words):
+                    if any(x in line_lower for x in _ADDRESS_WORDS):
                         continue
                     # Skip if it has @
                     if "@" in line_clean:
@@ -438,7 +557,7 @@ class UnifiedCASParser:
                     # This might be the name
                     if len(line_clean) > 3 and len(line_clean) < 50:
                         # Check if it looks like a name (mostly letters and spaces)
-                        if re.match(r"^[A-Za-z\s]+$", line_clean):
+                        if _LETTERS_ONLY.match(line_clean):
                             name = line_clean
                             break
 
@@ -449,7 +568,7 @@ class UnifiedCASParser:
             mobile=mobile,
         )
 
-    def _parse_scheme_line(self, line: str, all_lines: List[str] = None, current_idx: int = 0) -> None:
+    def _parse_scheme_line(self, line: str, all_lines: Sequence[str] = None, current_idx: int = 0) -> None:
         """
         Parse scheme name and ISIN from scheme line.
 
@@ -461,27 +580,25 @@ class UnifiedCASParser:
         isin_match = self.ISIN_PATTERN.search(line)
         if isin_match:
             self.context.isin = isin_match.group(1)
-            logger.debug(f"Extracting scheme for ISIN: {self.context.isin}")
+            logger.debug("Extracting scheme for ISIN: %s", self.context.isin)
 
         # Extract scheme name (everything before ISIN)
         scheme_part = ""
         isin_pos = line.find("ISIN")
         if isin_pos > 0:
             raw_scheme = line[:isin_pos].strip()
-            logger.debug(f"Raw scheme text before ISIN: '{raw_scheme}'")
+            logger.debug("Raw scheme text before ISIN: '%s'", raw_scheme)
 
             scheme_part = raw_scheme
             # Remove scheme code prefix if present (e.g., "HINSPT-")
             # The code is typically uppercase letters/numbers, followed by dash
-            code_match = re.match(r"^([A-Z0-9]{2,10})-(.+)$", scheme_part)
+            code_match = _SCHEME_CODE_PREFIX.match(scheme_part)
             if code_match:
                 scheme_part = code_match.group(2).strip()
-                logger.debug(f"Removed scheme code prefix, result: '{scheme_part}'")
+                logger.debug("Removed scheme code prefix, result: '%s'", scheme_part)
 
-            # Clean up trailing dashes and whitespace
-            scheme_part = re.sub(r"\s+", " ", scheme_part)
-            scheme_part = re.sub(r"[\s\-]+$", "", scheme_part)  # Remove trailing dashes/spaces
-            scheme_part = scheme_part.strip()
+            # Collapse whitespace, then clean up trailing dashes/spaces
+            scheme_part = " ".join(scheme_part.split()).rstrip(" -")
 
         # If scheme name not found on this line, look at previous lines
         # But be VERY careful - we must not pick up scheme names from previous sections
@@ -496,46 +613,19 @@ class UnifiedCASParser:
 
                 # STOP conditions - these indicate we've gone past the current scheme section
                 # into a previous scheme's territory
-                stop_patterns = [
-                    r"Closing\s*Unit\s*Balance",     # End of previous scheme
-                    r"Market\s*Value",               # End of previous scheme summary
-                    r"ISIN\s*:\s*INF",               # Another ISIN = different scheme
-                    r"\bINF[A-Z0-9]{9}\b",           # Standalone ISIN
-                ]
-                should_stop = False
-                for pattern in stop_patterns:
-                    if re.search(pattern, prev_line, re.IGNORECASE):
-                        logger.debug(f"Lookback stopped at line (boundary marker): {prev_line[:50]}...")
-                        should_stop = True
-                        break
-
-                if should_stop:
+                if _LOOKBACK_STOP.search(prev_line):
+                    logger.debug("Lookback stopped at line (boundary marker): %.50s...", prev_line)
                     break  # Stop looking back entirely
 
                 # Skip lines that are clearly not scheme names but don't indicate section end
-                skip_patterns = [
-                    r"^\s*Folio\s*No",  # Folio line
-                    r"^\s*PAN\s*:",      # PAN line
-                    r"^\s*KYC\s*:",      # KYC line
-                    r"^\s*Registrar",    # Registrar line
-                    r"^\s*\d{2}-\w{3}-\d{4}",  # Date line (transaction)
-                    r"Mutual\s*Fund$",         # AMC header
-                    r"^\s*Advisor\s*:",        # Advisor line
-                ]
-                is_skip = False
-                for pattern in skip_patterns:
-                    if re.search(pattern, prev_line, re.IGNORECASE):
-                        is_skip = True
-                        break
-
-                if is_skip:
+                if _LOOKBACK_SKIP.search(prev_line):
                     continue
 
                 # Check if this line contains scheme-like text
                 # Remove any ISIN/Registrar references that might be on the line
                 candidate = prev_line
-                candidate = re.sub(r"ISIN\s*:\s*INF[A-Z0-9]{9}", "", candidate)
-                candidate = re.sub(r"Registrar\s*:\s*\w+", "", candidate, flags=re.IGNORECASE)
+                candidate = _ISIN_LABEL.sub("", candidate)
+                candidate = _REGISTRAR_LABEL.sub("", candidate)
                 candidate = candidate.strip()
 
                 # A good scheme name should:
@@ -547,7 +637,7 @@ class UnifiedCASParser:
                     has_keyword = any(kw.lower() in candidate.lower() for kw in scheme_keywords)
 
                     # Also accept if it looks like a scheme name pattern
-                    looks_like_scheme = has_keyword or re.search(r"[A-Z].*[a-z]", candidate)
+                    looks_like_scheme = has_keyword or _MIXED_CASE.search(candidate)
 
                     if looks_like_scheme:
                         # Remove scheme code prefix if present
@@ -556,9 +646,8 @@ class UnifiedCASParser:
                             if len(parts[0]) <= 10 and parts[0].isupper():
                                 candidate = parts[1].strip()
 
-                        scheme_part = re.sub(r"\s+", " ", candidate)
-                        scheme_part = scheme_part.rstrip(" -")
-                        logger.debug(f"Found scheme name on previous line: {scheme_part}")
+                        scheme_part = " ".join(candidate.split()).rstrip(" -")
+                        logger.debug("Found scheme name on previous line: %s", scheme_part)
                         break
 
         if scheme_part:
@@ -583,15 +672,12 @@ class UnifiedCASParser:
             debug_text = "\n".join(debug_lines)
             print(debug_text)
 
-            # Also write to a debug file
-            try:
-                with open("/tmp/cas_parser_debug.log", "a") as f:
-                    f.write(debug_text + "\n")
-            except:
-                pass
+            # Also write to the debug file
+            if self._debug_log:
+                self._debug_log.write(debug_text + "\n")
 
         if scheme_part:
-            logger.debug(f"Found scheme: {self.context.scheme_name} ({self.context.isin})")
+            logger.debug("Found scheme: %s (%s)", self.context.scheme_name, self.context.isin)
         else:
             # Log warning if we have ISIN but no scheme name - this needs investigation
             logger.warning(
@@ -600,23 +686,33 @@ class UnifiedCASParser:
                 f"Context folio: {self.context.folio}"
             )
 
+    @staticmethod
     def _validate_and_fix_transaction_values(
-        self, amount: Decimal, units: Decimal, nav: Decimal
+        amount: Decimal, units: Decimal, nav: Decimal
     ) -> Tuple[Decimal, Decimal, Decimal]:
         """
         Cross-validate amount, units, and NAV using the identity:
             amount = |units| × nav
 
         Detects and fixes a single corrupt value when the other two are consistent.
+        Rows that are clearly consistent are screened out in float first; the
+        Decimal checks (and any correction) only run near or past a bound.
         """
+        f_nav = float(nav)
+        f_expected = abs(float(units)) * f_nav
+        if 0.0 < f_nav < _SCREEN_NAV_MAX and f_expected > _SCREEN_MIN_EXPECTED:
+            f_ratio = abs(float(amount)) / f_expected
+            if _SCREEN_RATIO_LOW < f_ratio < _SCREEN_RATIO_HIGH:
+                return amount, units, nav
+
         abs_units = abs(units)
         abs_amount = abs(amount)
 
         # Step 1: NAV range check — NAV should be positive and reasonable
-        if nav <= 0 or nav > Decimal("100000"):
+        if nav <= 0 or nav > _NAV_MAX:
             if abs_amount > 0 and abs_units > 0:
                 recomputed_nav = abs_amount / abs_units
-                if Decimal("1") <= recomputed_nav <= Decimal("100000"):
+                if _ONE <= recomputed_nav <= _NAV_MAX:
                     logger.warning(
                         f"Correcting NAV from {nav} to {recomputed_nav} "
                         f"(amount={amount}, units={units})"
@@ -633,7 +729,7 @@ class UnifiedCASParser:
             expected = abs_units * nav
             if expected > 0:
                 ratio = abs_amount / expected
-                if ratio >= Decimal("100"):
+                if ratio >= _HUNDRED:
                     # Amount is wildly too large — recompute from units × nav
                     corrected_amount = expected
                     if amount < 0:
@@ -643,7 +739,7 @@ class UnifiedCASParser:
                         f"(units={units}, nav={nav}, ratio={ratio})"
                     )
                     amount = corrected_amount
-                elif ratio <= Decimal("0.01"):
+                elif ratio <= _ONE_PERCENT:
                     # Units are garbled — recompute from amount / nav
                     corrected_units = abs_amount / nav
                     if units < 0:
@@ -676,7 +772,7 @@ class UnifiedCASParser:
         # Check for special entries (STT, Stamp Duty, etc.)
         if "***" in rest:
             # Extract type and amount
-            special_match = re.search(r"\*\*\*\s*(.+?)\s*\*\*\*\s*([\d,.]+)?", rest)
+            special_match = _SPECIAL_ENTRY.search(rest)
             if special_match:
                 description = special_match.group(1).strip()
                 amount_str = special_match.group(2) if special_match.group(2) else "0"
@@ -839,7 +935,7 @@ class UnifiedCASParser:
         return TransactionType.CHARGES
 
 
-def parse_cas_unified(lines: List[str]) -> Tuple[Investor, List[Holding], List[Transaction], List[dict]]:
+def parse_cas_unified(lines: Sequence[str]) -> Tuple[Investor, List[Holding], List[Transaction], List[dict]]:
     """
     Parse CAS data using the unified parser.
 
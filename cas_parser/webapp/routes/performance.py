@@ -5,7 +5,9 @@ from datetime import datetime, timedelta
 from flask import Blueprint, jsonify, request, send_file
 from flask import current_app
 from cas_parser.webapp import data as db
-from cas_parser.webapp.xirr import build_cashflows_for_folio, xirr, _parse_date
+from cas_parser.webapp.xirr import (
+    build_cashflows_batch, build_cashflows_for_folio, xirr, xirr_batch, _parse_date,
+)
 from cas_parser.webapp.routes import DecimalEncoder
 from cas_parser.webapp.auth import admin_required, check_investor_access, get_investor_id_for_folio
 
@@ -389,11 +391,12 @@ def api_get_investor_xirr(investor_id):
     folios = []
     isin_cashflows = {}  # isin -> list of cashflows
 
-    for data in folio_data_list:
-        cashflows = build_cashflows_for_folio(
-            data['transactions'], data['current_value']
-        )
-        xirr_val = xirr(cashflows)
+    folio_cashflows = build_cashflows_batch(
+        (data['transactions'], data['current_value']) for data in folio_data_list
+    )
+    folio_xirrs = xirr_batch(folio_cashflows)
+
+    for data, cashflows, xirr_val in zip(folio_data_list, folio_cashflows, folio_xirrs):
         folio_isin = data.get('isin')
         folios.append({
             'folio_id': data['folio_id'],
@@ -438,10 +441,10 @@ def api_get_investor_xirr(investor_id):
             all_cashflows.extend(asset_cashflows)
 
     # Compute per-ISIN aggregated XIRR
-    isin_xirr = {}
-    for isin, cfs in isin_cashflows.items():
-        xirr_val = xirr(cfs)
-        isin_xirr[isin] = round(xirr_val * 100, 2) if xirr_val is not None else None
+    isin_xirr = {
+        isin: round(xirr_val * 100, 2) if xirr_val is not None else None
+        for isin, xirr_val in zip(isin_cashflows, xirr_batch(isin_cashflows.values()))
+    }
 
     portfolio_xirr = xirr(all_cashflows)
     return jsonify({
@@ -1,17 +1,38 @@
 """
 Pure Python XIRR (Extended Internal Rate of Return) calculator.
 
-Uses Newton-Raphson method with fallbacks for robust convergence.
+Uses Newton-Raphson method with a bracketed Brent fallback for robust
+convergence.
 No external dependencies (no scipy/numpy required).
 """
 
 from datetime import date, datetime
-from typing import List, Optional, Tuple
-
-# Transaction types that represent external cash movements
-OUTFLOW_TYPES = {'purchase', 'sip', 'switch_in'}
-INFLOW_TYPES = {'redemption', 'switch_out', 'dividend_payout'}
-SKIP_TYPES = {'dividend_reinvestment', 'stamp_duty', 'stt'}
+from functools import lru_cache, partial
+from math import exp, expm1, log, log1p
+from typing import Iterable, List, Optional, Tuple
+
+# Transaction types that represent external cash movements (frozen, since
+# _TX_DIRECTION below is derived from them once at import)
+OUTFLOW_TYPES = frozenset({'purchase', 'sip', 'switch_in'})
+INFLOW_TYPES = frozenset({'redemption', 'switch_out', 'dividend_payout'})
+SKIP_TYPES = frozenset({'dividend_reinvestment', 'stamp_duty', 'stt'})
+
+# Cashflow direction per tx_type, so each row costs one dict lookup:
+# -1 = investment (outflow), +1 = redemption/payout (inflow),
+# 0 = 'charges', an inflow only when it is a hidden dividend payout.
+# Skipped and unknown types are absent.
+_TX_DIRECTION = {
+    **dict.fromkeys(OUTFLOW_TYPES, -1),
+    **dict.fromkeys(INFLOW_TYPES, 1),
+    'charges': 0,
+}
+
+# Longest span, in years, that the whole-year polynomial kernel handles
+_MAX_WHOLE_YEARS = 64
+
+# The solver's [-0.999, 10] rate range, as log1p(rate) bounds
+_LOG1P_RATE_MIN = log1p(-0.999)
+_LOG1P_RATE_MAX = log1p(10.0)
 
 
 def xirr(cashflows: List[Tuple[date, float]], tolerance: float = 1e-7,
@@ -31,29 +52,71 @@ def xirr(cashflows: List[Tuple[date, float]], tolerance: float = 1e-7,
     if len(cashflows) < 2:
         return None
 
-    amounts = [cf[1] for cf in cashflows]
+    # Folios and goals often repeat the same cashflows between requests;
+    # rounding to the paisa keeps float noise out of the cache key.
+    flows = tuple((d.toordinal(), round(amount, 2)) for d, amount in cashflows)
+    return _solve_xirr(flows, tolerance, max_iterations)
+
+
+def xirr_batch(cashflow_sets: Iterable[List[Tuple[date, float]]],
+               tolerance: float = 1e-7,
+               max_iterations: int = 300) -> List[Optional[float]]:
+    """
+    Calculate XIRR for several independent cashflow lists (e.g. per folio).
+
+    Sets are solved in order through the shared memo cache, so folios with
+    identical cashflows are solved once.
+
+    Args:
+        cashflow_sets: Iterable of cashflow lists as accepted by xirr().
+        tolerance: Convergence tolerance.
+        max_iterations: Max Newton-Raphson iterations per guess.
+
+    Returns:
+        One annualized return (or None) per input list, in input order.
+    """
+    return [xirr(cfs, tolerance, max_iterations) for cfs in cashflow_sets]
+
+
+@lru_cache(maxsize=2048)
+def _solve_xirr(flows: Tuple[Tuple[int, float], ...], tolerance: float,
+                max_iterations: int) -> Optional[float]:
+    """Solve XIRR for hashable (date ordinal, amount) flows; see xirr()."""
+    # Merge same-date flows: they share a discount factor, so NPV is
+    # unchanged and every Newton step evaluates fewer terms. Dates are
+    # keyed by ordinal so day offsets are plain int subtraction.
+    merged = {}
+    for day, amount in flows:
+        merged[day] = merged.get(day, 0) + amount
+
+    amounts = list(merged.values())
     has_positive = any(a > 0 for a in amounts)
     has_negative = any(a < 0 for a in amounts)
     if not (has_positive and has_negative):
         return None
 
     # Sort by date
-    cashflows = sorted(cashflows, key=lambda x: x[0])
-    d0 = cashflows[0][0]
+    days = sorted(merged)
+    day0 = days[0]
 
-    # Pre-compute year fractions
+    # Pre-compute year fractions, dropping flows that netted to zero
     year_fracs = []
-    for d, amount in cashflows:
-        delta = (d - d0).days / 365.0
-        year_fracs.append((amount, delta))
-
-    def npv(rate):
-        """Net present value at given rate."""
-        return sum(amt / (1.0 + rate) ** yf for amt, yf in year_fracs)
-
-    def dnpv(rate):
-        """Derivative of NPV with respect to rate."""
-        return sum(-yf * amt / (1.0 + rate) ** (yf + 1.0) for amt, yf in year_fracs)
+    for day in days:
+        amount = merged[day]
+        if amount:
+            year_fracs.append((amount, (day - day0) / 365.0))
+
+    if len(year_fracs) == 2:
+        # One investment and one return (e.g. lumpsum + terminal value):
+        # v0 + v1 * (1 + r) ** -t = 0 solves in closed form, no iteration.
+        # The first remaining flow is not at t=0 when the earliest date
+        # netted to zero, so solve over the gap between the two flows.
+        (v0, t0), (v1, t1) = year_fracs
+        growth = log(-v1 / v0) / (t1 - t0)  # = log1p(r)
+        if _LOG1P_RATE_MIN <= growth <= _LOG1P_RATE_MAX:
+            return expm1(growth)
+
+    npv, npv_and_deriv = _make_npv_functions(year_fracs)
 
     # NPV tolerance: relative to total cashflow magnitude
     total_abs = sum(abs(a) for a, _ in year_fracs)
@@ -63,13 +126,18 @@ def xirr(cashflows: List[Tuple[date, float]], tolerance: float = 1e-7,
         """Run Newton-Raphson from initial guess."""
         rate = guess
         for _ in range(max_iterations):
-            val = npv(rate)
-            deriv = dnpv(rate)
+            val, deriv = npv_and_deriv(rate)
             if abs(deriv) < 1e-14:
                 break
             new_rate = rate - val / deriv
-            # Clamp to valid range
-            new_rate = max(-0.999, min(10.0, new_rate))
+            if new_rate <= -1.0:
+                # Overshot out of the domain (1 + r must stay positive):
+                # step halfway towards -1 instead of jumping straight to
+                # the floor, so Newton can still walk down a steep curve.
+                # The floor keeps the discount factors clear of overflow.
+                new_rate = max(-0.999, (rate - 1.0) / 2.0)
+            else:
+                new_rate = min(10.0, new_rate)
             if abs(new_rate - rate) < tolerance:
                 # Verify NPV is actually near zero (not just stuck at clamp boundary)
                 if abs(npv(new_rate)) < npv_tol:
@@ -99,28 +167,155 @@ def xirr(cashflows: List[Tuple[date, float]], tolerance: float = 1e-7,
         if result is not None and -0.999 <= result <= 10.0:
             return result
 
-    # Bisection fallback
-    return _bisection(npv, -0.999, 10.0, tolerance, max_iterations)
+    # Bracketed fallback: find a sign change on a coarse grid, then refine
+    # it with Brent's method. No sign change means no solution in range.
+    bracket = _bracket(npv)
+    if bracket is None:
+        return None
+    return _brent(npv, *bracket, tolerance, max_iterations)
 
 
-def _bisection(f, lo, hi, tolerance, max_iterations):
-    """Bisection method as last-resort fallback."""
-    f_lo = f(lo)
-    f_hi = f(hi)
-    if f_lo * f_hi > 0:
-        return None
+def _npv_and_deriv_whole_years(coeffs, rate):
+    """
+    NPV and its derivative when every flow falls on a whole year.
+
+    coeffs[k] is the net amount k years after the first flow, so
+    NPV = sum(coeffs[k] * x ** k) with x = 1 / (1 + rate), evaluated
+    together with its derivative by Horner's rule.
+    """
+    x = 1.0 / (1.0 + rate)
+    total = 0.0
+    deriv = 0.0
+    for c in reversed(coeffs):
+        deriv = deriv * x + total
+        total = total * x + c
+    # dNPV/drate = dNPV/dx * dx/drate, and dx/drate = -x ** 2
+    return total, -deriv * x * x
+
+
+def _make_npv_functions(year_fracs):
+    """
+    Build NPV evaluators specialised to one set of (amount, years) flows.
 
+    Returns (npv, npv_and_deriv): one-argument functions of rate with the
+    flow constants and the chosen kernel bound in, so the solver loops make
+    a single call per evaluation.
+    """
+    def npv(rate):
+        """Net present value at given rate."""
+        lr = log1p(rate)
+        return sum(amt * exp(-yf * lr) for amt, yf in year_fracs)
+
+    # Flows a whole number of years apart (e.g. the same date in successive
+    # non-leap years) make NPV a polynomial in 1 / (1 + r); Horner's rule
+    # then evaluates it without any exp() calls.
+    span = year_fracs[-1][1]
+    if span < _MAX_WHOLE_YEARS and all(yf.is_integer() for _, yf in year_fracs):
+        coeffs = [0.0] * (int(span) + 1)
+        for amt, yf in year_fracs:
+            coeffs[int(yf)] += amt
+        # partial binds in C, adding no Python frame per evaluation
+        return npv, partial(_npv_and_deriv_whole_years, coeffs)
+    return npv, partial(_npv_and_deriv, _discount_terms(year_fracs))
+
+
+def _discount_terms(year_fracs):
+    """
+    Per-flow constants for _npv_and_deriv(): (amount, -t, -t * amount).
+
+    Built once per solve so the Newton loop does no negations and one
+    multiply less per term.
+    """
+    return [(amt, -yf, -yf * amt) for amt, yf in year_fracs]
+
+
+def _npv_and_deriv(terms, rate):
+    """
+    NPV and its derivative with respect to rate, in a single pass.
+
+    Each term's discount factor (1 + rate) ** -t is computed once and
+    shared by both sums. It is evaluated as exp(-t * log1p(rate)), with
+    the log taken once per call; log1p stays accurate for rates near 0.
+    The derivative's common 1 / (1 + rate) factor is applied once at the end.
+    """
+    lr = log1p(rate)
+    total = 0.0
+    deriv = 0.0
+    for amt, neg_t, neg_t_amt in terms:
+        p = exp(neg_t * lr)
+        total += amt * p
+        deriv += neg_t_amt * p
+    return total, deriv / (1.0 + rate)
+
+
+# Rates probed for a sign change when Newton-Raphson fails, spanning the
+# solver's [-0.999, 10] range more densely near the usual returns.
+_BRACKET_GRID = (-0.999, -0.99, -0.9, -0.5, 0.0, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+def _bracket(f):
+    """
+    Find adjacent grid rates where f changes sign.
+
+    Returns (a, b, f(a), f(b)), or None if f keeps one sign over the grid.
+    """
+    a = _BRACKET_GRID[0]
+    fa = f(a)
+    for b in _BRACKET_GRID[1:]:
+        fb = f(b)
+        if (fa < 0) != (fb < 0) or fb == 0:
+            return a, b, fa, fb
+        a, fa = b, fb
+    return None
+
+
+def _brent(f, a, b, fa, fb, tolerance, max_iterations):
+    """
+    Brent's method on a bracket [a, b] where f(a) and f(b) differ in sign.
+
+    Combines inverse quadratic interpolation and secant steps with
+    bisection, so it converges superlinearly but never leaves the bracket.
+    """
+    c, fc = b, fb
+    d = e = b - a
     for _ in range(max_iterations):
-        mid = (lo + hi) / 2.0
-        f_mid = f(mid)
-        if abs(f_mid) < tolerance or (hi - lo) < tolerance:
-            return mid
-        if f_lo * f_mid < 0:
-            hi = mid
+        if (fb > 0) == (fc > 0):
+            # Keep the root between b and c
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, b, c = b, c, b
+            fa, fb, fc = fb, fc, fb
+        tol = 2.0 * 2.2e-16 * abs(b) + 0.5 * tolerance
+        half = 0.5 * (c - b)
+        if abs(half) <= tol or fb == 0:
+            return b
+        if abs(e) >= tol and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Secant step
+                p = 2.0 * half * s
+                q = 1.0 - s
+            else:
+                # Inverse quadratic interpolation
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * half * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * half * q - abs(tol * q), abs(e * q)):
+                e = d
+                d = p / q
+            else:
+                d = e = half
         else:
-            lo = mid
-            f_lo = f_mid
-    return (lo + hi) / 2.0
+            d = e = half
+        a, fa = b, fb
+        b += d if abs(d) > tol else (tol if half > 0 else -tol)
+        fb = f(b)
+    return b
 
 
 def _validate_amount(tx: dict) -> float:
@@ -134,20 +329,19 @@ def _validate_amount(tx: dict) -> float:
 
     Returns the validated amount (always positive magnitude).
     """
-    amount = abs(tx.get('amount', 0))
-    nav = tx.get('nav')
-    units = tx.get('units')
+    return _validated_magnitude(tx.get('amount', 0), tx.get('units'), tx.get('nav'))
 
-    if nav is not None and nav > 0 and units is not None and abs(units) > 0:
-        expected = abs(units) * nav
-        if expected > 0:
-            ratio = amount / expected
-            if ratio > 100:
-                # Amount is corrupt (e.g. 949M vs expected ~6L), use expected
-                return expected
-            # ratio < 0.01 means units/NAV garbled, keep amount as-is
-            # Otherwise amount and cross-check agree
 
+def _validated_magnitude(amount, units, nav) -> float:
+    """Tier-1 check of _validate_amount() on already-extracted values."""
+    amount = abs(amount)
+    # Falsy units/NAV (None or zero) leave nothing to cross-check against
+    if units and nav and nav > 0:
+        expected = abs(units) * nav
+        # Amount is corrupt (e.g. 949M vs expected ~6L), use expected.
+        # A tiny ratio means units/NAV are garbled, so the amount is kept.
+        if amount > 100 * expected:
+            return expected
     return amount
 
 
@@ -183,47 +377,51 @@ def build_cashflows_for_folio(
         as_of_date = date.today()
 
     cashflows = []
+    append = cashflows.append
+    direction_of = _TX_DIRECTION.get
+    largest = 0  # largest cashflow magnitude, for the Tier 2 check
 
     for tx in transactions:
-        amount = tx.get('amount')
-        if amount is None or amount == 0:
+        get = tx.get
+        amount = get('amount')
+        if not amount:  # None or zero
             continue
 
-        tx_type = (tx.get('tx_type') or '').lower()
-        if tx_type in SKIP_TYPES:
+        # Skipped and unknown types have no direction
+        direction = direction_of((get('tx_type') or '').lower())
+        if direction is None:
+            continue
+        if direction == 0 and not (amount > 0 and abs(get('units') or 0) < 0.001):
+            # Only a 'charges' row with positive amount and zero units is a
+            # hidden dividend payout: IDCW fund distributions sometimes appear
+            # this way and are real cash returned to the investor.
             continue
 
         # Parse date
-        tx_date = _parse_date(tx.get('tx_date'))
+        tx_date = _parse_date(get('tx_date'))
         if tx_date is None:
             continue
 
         # Tier 1: Cross-validate amount against units × NAV
-        validated = _validate_amount(tx)
+        validated = _validated_magnitude(amount, get('units'), get('nav'))
+        if validated > largest:
+            largest = validated
 
-        if tx_type in OUTFLOW_TYPES:
-            # Normal purchase: amount > 0 → outflow (negative cashflow)
-            # Reversal purchase: amount < 0 → inflow (positive cashflow, money returned)
-            if amount < 0:
-                cashflows.append((tx_date, validated))
-            else:
-                cashflows.append((tx_date, -validated))
-        elif tx_type in INFLOW_TYPES:
-            cashflows.append((tx_date, validated))
-        elif tx_type == 'charges' and amount > 0 and abs(tx.get('units') or 0) < 0.001:
-            # Hidden dividend payout: IDCW fund distributions sometimes appear
-            # as 'charges' with positive amount and zero units. These are real
-            # cash returned to the investor (same as dividend_payout).
-            cashflows.append((tx_date, validated))
-        # Other unknown types are skipped
+        # Normal purchase: amount > 0 → outflow (negative cashflow)
+        # Reversal purchase: amount < 0 → inflow (positive cashflow, money returned)
+        if direction < 0 and amount > 0:
+            validated = -validated
+        append((tx_date, validated))
 
     # Tier 2: Remove outlier cashflows relative to current_value
+    # (the list is only rebuilt when some cashflow is actually over the limit)
     if current_value and current_value > 0 and len(cashflows) >= 3:
         threshold = current_value * 500
-        cashflows = [
-            cf for cf in cashflows
-            if abs(cf[1]) <= threshold
-        ]
+        if largest > threshold:
+            cashflows = [
+                cf for cf in cashflows
+                if abs(cf[1]) <= threshold
+            ]
 
     # Terminal value: current holding value as inflow
     if current_value and current_value > 0:
@@ -232,6 +430,30 @@ def build_cashflows_for_folio(
     return cashflows
 
 
+def build_cashflows_batch(
+    folios: Iterable[Tuple[List[dict], float]],
+    as_of_date: date = None,
+) -> List[List[Tuple[date, float]]]:
+    """
+    Build cashflow lists for several folios sharing one terminal date.
+
+    Args:
+        folios: Iterable of (transactions, current_value) pairs, as taken by
+                build_cashflows_for_folio().
+        as_of_date: Date for every terminal value (defaults to today,
+                    resolved once for the whole batch).
+
+    Returns:
+        One cashflow list per folio, in input order, suitable for xirr_batch().
+    """
+    if as_of_date is None:
+        as_of_date = date.today()
+    return [
+        build_cashflows_for_folio(transactions, current_value, as_of_date)
+        for transactions, current_value in folios
+    ]
+
+
 def _parse_date(val) -> Optional[date]:
     """Parse a date from string or date object."""
     if isinstance(val, date) and not isinstance(val, datetime):
@@ -239,9 +461,23 @@ def _parse_date(val) -> Optional[date]:
     if isinstance(val, datetime):
         return val.date()
     if isinstance(val, str):
-        for fmt in ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d-%b-%Y'):
-            try:
-                return datetime.strptime(val, fmt).date()
-            except ValueError:
-                continue
+        return _parse_date_str(val)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(val: str) -> Optional[date]:
+    """Parse a date string; cached because a folio repeats few distinct dates."""
+    # DB dates are ISO 'YYYY-MM-DD': take the C parser before strptime.
+    # The shape check keeps 3.11's wider ISO syntax (e.g. '20230115') out.
+    if len(val) == 10 and val[4] == '-' and val[7] == '-':
+        try:
+            return date.fromisoformat(val)
+        except ValueError:
+            pass
+    for fmt in ('%Y-%m-%d', '%d-%m-%Y', '%d/%m/%Y', '%d-%b-%Y'):
+        try:
+            return datetime.strptime(val, fmt).date()
+        except ValueError:
+            continue
     return None